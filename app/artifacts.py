@@ -0,0 +1,125 @@
+"""Off-loop document rendering and email delivery, with a render cache.
+
+``generate_docx`` (DOCX -> PDF rendering, CPU bound) and
+``send_email_with_attachment`` (blocking network I/O) used to run directly
+inside async code, stalling the event loop for every other request.
+``ArtifactWorkers`` runs rendering in a process pool and email in a thread
+pool. Each side also has a semaphore, so at most as many jobs are in flight
+as there are workers and the rest wait without piling up in the executors.
+
+Rendered files are named by the SHA-256 of the plan they render, so a plan
+that was rendered before (a duplicate request, or a retried job) is served
+from disk. Concurrent renders of the same plan share one render.
+
+Settings come from the environment:
+
+    RENDER_PROCESSES   rendering processes (2)
+    EMAIL_THREADS      concurrent email deliveries (4)
+    ARTIFACTS_DIR      where rendered DOCX files are kept (data/artifacts)
+    RESULTS_DIR        where rendered PDFs are served from (app/static/results)
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Tuple
+
+
+def content_hash(output: Any) -> str:
+    """Stable hash of a plan (JSON with sorted keys; other objects via str)."""
+    encoded = json.dumps(output, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def render_files(render: Callable[..., Any], output: Any, docx_path: str, pdf_path: str) -> Tuple[str, str]:
+    """Render to temporary names, then move into place so readers never see partial files."""
+    token = uuid.uuid4().hex
+    tmp_docx = f"{docx_path[:-5]}-{token}.docx"
+    tmp_pdf = f"{pdf_path[:-4]}-{token}.pdf"
+    render(output, tmp_docx, tmp_pdf)
+    os.replace(tmp_docx, docx_path)
+    os.replace(tmp_pdf, pdf_path)
+    return docx_path, pdf_path
+
+
+class ArtifactWorkers:
+    """Process pool for rendering, thread pool for email, both bounded."""
+
+    def __init__(
+        self,
+        render: Callable[..., Any],
+        render_processes: int | None = None,
+        email_threads: int | None = None,
+        artifacts_dir: str | None = None,
+        results_dir: str | None = None,
+        executor_factory: Callable[[int], Any] = ProcessPoolExecutor,
+    ):
+        """Configure the pools; they are created on first use, unset sizes and dirs come from the environment."""
+        self.render_fn = render
+        self.render_processes = render_processes or int(os.getenv("RENDER_PROCESSES", 2))
+        self.email_threads = email_threads or int(os.getenv("EMAIL_THREADS", 4))
+        self.artifacts_dir = artifacts_dir or os.getenv("ARTIFACTS_DIR", "data/artifacts")
+        self.results_dir = results_dir or os.getenv("RESULTS_DIR", "app/static/results")
+        self.executor_factory = executor_factory
+        self._render_pool = None
+        self._email_pool = None
+        self._render_slots: asyncio.Semaphore | None = None
+        self._email_slots: asyncio.Semaphore | None = None
+        self._rendering: Dict[str, asyncio.Future] = {}
+
+    def _pools(self) -> None:
+        # Created lazily, inside the running event loop
+        if self._render_pool is None:
+            os.makedirs(self.artifacts_dir, exist_ok=True)
+            os.makedirs(self.results_dir, exist_ok=True)
+            self._render_pool = self.executor_factory(self.render_processes)
+            self._email_pool = ThreadPoolExecutor(max_workers=self.email_threads, thread_name_prefix="email")
+            self._render_slots = asyncio.Semaphore(self.render_processes)
+            self._email_slots = asyncio.Semaphore(self.email_threads)
+
+    def paths(self, digest: str) -> Tuple[str, str]:
+        """Return the (docx_path, pdf_path) a plan with content hash ``digest`` is rendered to."""
+        return os.path.join(self.artifacts_dir, f"{digest}.docx"), os.path.join(self.results_dir, f"{digest}.pdf")
+
+    async def render(self, output: Any) -> Tuple[str, str]:
+        """(docx_path, pdf_path) for a plan, rendering it only if not cached."""
+        self._pools()
+        digest = content_hash(output)
+        docx_path, pdf_path = self.paths(digest)
+        if os.path.exists(docx_path) and os.path.exists(pdf_path):
+            return docx_path, pdf_path
+        if digest in self._rendering:
+            return await asyncio.shield(self._rendering[digest])
+
+        loop = asyncio.get_running_loop()
+        future = self._rendering[digest] = loop.create_future()
+        try:
+            async with self._render_slots:
+                paths = await loop.run_in_executor(
+                    self._render_pool, render_files, self.render_fn, output, docx_path, pdf_path
+                )
+            future.set_result(paths)
+            return paths
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else was waiting
+            raise
+        finally:
+            del self._rendering[digest]
+
+    async def send_email(self, send: Callable[..., Any], **kwargs: Any) -> Any:
+        """Run a blocking email call on the email thread pool."""
+        self._pools()
+        async with self._email_slots:
+            return await asyncio.get_running_loop().run_in_executor(self._email_pool, partial(send, **kwargs))
+
+    def shutdown(self) -> None:
+        """Shut both pools down without waiting for running work."""
+        if self._render_pool is not None:
+            self._render_pool.shutdown(wait=False, cancel_futures=True)
+            self._email_pool.shutdown(wait=False, cancel_futures=True)
+            self._render_pool = self._email_pool = None
@@ -0,0 +1,175 @@
+"""Stream answers of the sport graphs as server-sent events.
+
+``/ask/{sport}`` in app/main.py runs the compiled graph (``app_mlb``,
+``app_nba``, ``app_soccer`` or their ``_flat`` variants) with ``astream``
+and forwards, as they happen:
+
+    start      the thread ID of the run
+    progress   a node finished (with the sub-queries once split_query ran)
+    token      an LLM token, tagged with the node that produced it
+    usage      tokens, cost and latency per node and sub-agent (react_agent/usage.py)
+    done       the final answer
+    error      the run failed
+
+The graph runs in its own task. When the client disconnects, the task is
+cancelled, which closes the ``astream`` generator and cancels the LLM and
+tool calls still in flight, so abandoned requests stop spending quota. The
+same happens when the request deadline in the config passes (``ASK_DEADLINE``
+seconds per request in app/main.py, see react_agent/deadline.py).
+
+Concurrent runs are limited per sport (requests above the limit get a 429):
+
+    ASK_CONCURRENCY           runs per sport (4)
+    ASK_CONCURRENCY_<SPORT>   override for one sport, e.g. ASK_CONCURRENCY_NBA=8
+    ASK_DEADLINE              seconds a run may take before it is cancelled (120)
+"""
+
+import asyncio
+import json
+import logging
+import os
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable
+
+from langchain_core.messages import HumanMessage
+from langchain_core.runnables import RunnableConfig
+
+from app.react_agent.deadline import remaining
+from app.react_agent.usage import UsageTracker
+
+logger = logging.getLogger(__name__)
+
+ASK_GRAPHS = {"mlb": "app_mlb", "nba": "app_nba", "soccer": "app_soccer"}
+
+DISCONNECT_POLL_SECONDS = 1.0
+HEARTBEAT_SECONDS = 15.0
+QUEUE_SIZE = 256
+
+
+def sse(event: str, data: Dict[str, Any]) -> str:
+    """Encode one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+class SportLimits:
+    """Per-sport cap on concurrent graph runs (single event loop, no locking)."""
+
+    def __init__(self, sports: Iterable[str], default: int | None = None):
+        """Read each sport's cap from the environment (``default`` if unset)."""
+        default = default or int(os.getenv("ASK_CONCURRENCY", 4))
+        self.limits = {sport: int(os.getenv(f"ASK_CONCURRENCY_{sport.upper()}", default)) for sport in sports}
+        self.active = {sport: 0 for sport in self.limits}
+
+    def try_acquire(self, sport: str) -> bool:
+        """Take a run slot of ``sport``; False if all are in use."""
+        if self.active[sport] >= self.limits[sport]:
+            return False
+        self.active[sport] += 1
+        return True
+
+    def release(self, sport: str) -> None:
+        """Give back a slot taken with ``try_acquire``."""
+        self.active[sport] -= 1
+
+
+def _message_text(message: Any) -> str:
+    content = getattr(message, "content", "")
+    return content if isinstance(content, str) else ""
+
+
+def stream_events(mode: str, chunk: Any) -> Iterable[str]:
+    """SSE messages for one ``astream`` item (stream_mode=["messages", "updates"])."""
+    if mode == "messages":
+        message, metadata = chunk
+        # Only model output; tool results and structured-output chunks carry no text.
+        if getattr(message, "type", "") in ("AIMessageChunk", "ai") and _message_text(message):
+            yield sse("token", {"node": metadata.get("langgraph_node"), "content": _message_text(message)})
+        return
+    for node, update in (chunk or {}).items():
+        progress: Dict[str, Any] = {"node": node}
+        if isinstance(update, dict) and update.get("sub_queries"):
+            progress["sub_queries"] = [sub_query.get("query") for sub_query in update["sub_queries"]]
+        yield sse("progress", progress)
+
+
+def final_answer(chunk: Any, answer: str | None) -> str | None:
+    """Return the last message text of an ``updates`` chunk, else the answer so far."""
+    for update in (chunk or {}).values():
+        if isinstance(update, dict) and update.get("messages"):
+            answer = _message_text(update["messages"][-1]) or answer
+    return answer
+
+
+async def ask_stream(
+    graph: Any,
+    question: str,
+    config: RunnableConfig,
+    is_disconnected: Callable[[], Awaitable[bool]],
+    on_close: Callable[[], None] | None = None,
+    tracker: UsageTracker | None = None,
+) -> AsyncIterator[str]:
+    """Run ``graph`` on ``question`` and yield its progress as SSE text.
+
+    With a ``tracker`` (already among the config's callbacks) the request's
+    usage summary is sent before ``done`` and logged.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+
+    async def run() -> None:
+        stream = graph.astream(
+            {"messages": [HumanMessage(content=question)]}, config, stream_mode=["messages", "updates"]
+        )
+        answer = None
+        try:
+            # Backstop for nodes that do not check the deadline themselves (e.g. prebuilt supervisors)
+            async with asyncio.timeout(remaining(config)):
+                async for mode, chunk in stream:
+                    for message in stream_events(mode, chunk):
+                        await queue.put(message)
+                    if mode == "updates":
+                        answer = final_answer(chunk, answer)
+            if tracker is not None:
+                usage = tracker.summary()
+                logger.info("LLM usage of run %s: %s", config["configurable"].get("thread_id"), json.dumps(usage))
+                await queue.put(sse("usage", usage))
+            await queue.put(sse("done", {"answer": answer}))
+        except TimeoutError as e:
+            await queue.put(sse("error", {"error": str(e) or "Request deadline exceeded."}))
+        except Exception as e:
+            logger.warning("Graph run %s failed: %s", config["configurable"].get("thread_id"), e)
+            await queue.put(sse("error", {"error": str(e)}))
+        finally:
+            await stream.aclose()
+            if not queue.full():
+                queue.put_nowait(None)
+
+    yield sse("start", {"thread_id": config["configurable"].get("thread_id")})
+    task = asyncio.create_task(run())
+    loop = asyncio.get_running_loop()
+    checked = last_sent = loop.time()
+    try:
+        while True:
+            try:
+                message = await asyncio.wait_for(queue.get(), timeout=DISCONNECT_POLL_SECONDS)
+            except TimeoutError:
+                message = ""
+                if task.done() and queue.empty():
+                    return
+            if message is None:
+                return
+            # Checked between messages too, so a steady token stream cannot hide a disconnect.
+            if loop.time() - checked >= DISCONNECT_POLL_SECONDS:
+                checked = loop.time()
+                if await is_disconnected():
+                    logger.info("Client left, cancelling run %s", config["configurable"].get("thread_id"))
+                    return
+            if message:
+                last_sent = loop.time()
+                yield message
+            elif loop.time() - last_sent >= HEARTBEAT_SECONDS:
+                last_sent = loop.time()
+                yield ": keep-alive\n\n"
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        if on_close is not None:
+            on_close()
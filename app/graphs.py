@@ -0,0 +1,135 @@
+"""Process-wide registry of compiled graphs for the web app.
+
+Each sport graph module builds its prompts, models and compiled graph at
+import time, and ``/submit-trip`` used to construct a new planner on every
+request. ``GraphRegistry`` builds every graph at most once per process,
+either lazily on first use or up front in ``warm_up`` (called from the app
+lifespan), and hands the same instance to every request. Compiled LangGraph
+graphs keep no per-run state, so sharing them is safe.
+
+Graphs are registered either as ``"path/to/module.py:attribute"`` specs, the
+format of ``langgraph.json`` (which is where the sport graphs come from), or
+as zero-argument factories. Settings come from the environment:
+
+    GRAPH_WARMUP    comma-separated graphs to build at startup, or "all" (none)
+"""
+
+import asyncio
+import importlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Union
+
+logger = logging.getLogger(__name__)
+
+Spec = Union[str, Callable[[], Any]]
+
+
+def spec_module(spec: str) -> str:
+    """``./app/react_agent/nba/graph.py:app_nba`` -> ``app.react_agent.nba.graph``."""
+    path = spec.split(":", 1)[0]
+    if path.startswith("./"):
+        path = path[2:]
+    if path.endswith(".py"):
+        path = path[:-3]
+    return path.replace("/", ".")
+
+
+def load_spec(spec: str) -> Any:
+    """Import the object a ``path/to/module.py:name`` spec points to."""
+    module = importlib.import_module(spec_module(spec))
+    return getattr(module, spec.split(":", 1)[1])
+
+
+def langgraph_specs(path: str = "langgraph.json") -> Dict[str, str]:
+    """Return the graphs declared in langgraph.json (empty if the file is missing)."""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return dict(json.load(f).get("graphs", {}))
+
+
+class GraphRegistry:
+    """Builds each registered graph once and shares it across requests."""
+
+    def __init__(self, specs: Dict[str, Spec] | None = None):
+        """Create a registry of ``specs`` (name -> langgraph.json spec or factory); nothing is built yet."""
+        self.specs: Dict[str, Spec] = dict(specs or {})
+        self.build_seconds: Dict[str, float] = {}
+        self._graphs: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._warm_up_hooks: List[Callable[[Dict[str, Any]], Any]] = []
+
+    def register(self, name: str, spec: Spec) -> None:
+        """Add or replace a graph; a replaced graph is rebuilt on next use."""
+        self.specs[name] = spec
+        self._graphs.pop(name, None)
+
+    def on_warm_up(self, hook: Callable[[Dict[str, Any]], Any]) -> Callable[[Dict[str, Any]], Any]:
+        """Register ``hook(graphs)``, run after ``warm_up`` built the graphs (may be async)."""
+        self._warm_up_hooks.append(hook)
+        return hook
+
+    def __contains__(self, name: str) -> bool:
+        """Whether a graph called ``name`` is registered."""
+        return name in self.specs
+
+    # ------------------------------------------------------------------
+    # Access
+    # ------------------------------------------------------------------
+    def get(self, name: str) -> Any:
+        """Return the shared instance of a graph, building it on first use."""
+        if name in self._graphs:
+            return self._graphs[name]
+        if name not in self.specs:
+            raise KeyError(f"Unknown graph '{name}'. Use one of: {', '.join(self.specs)}.")
+        # One lock for all builds: graph modules import each other's tools and models.
+        with self._lock:
+            if name not in self._graphs:
+                spec = self.specs[name]
+                started = time.perf_counter()
+                self._graphs[name] = load_spec(spec) if isinstance(spec, str) else spec()
+                self.build_seconds[name] = time.perf_counter() - started
+                logger.info("Built graph %s in %.2fs", name, self.build_seconds[name])
+        return self._graphs[name]
+
+    async def aget(self, name: str) -> Any:
+        """``get`` without blocking the event loop when the graph still has to be built."""
+        if name in self._graphs:
+            return self._graphs[name]
+        return await asyncio.to_thread(self.get, name)
+
+    def loaded(self) -> List[str]:
+        """Return the names of the graphs built so far."""
+        return list(self._graphs)
+
+    # ------------------------------------------------------------------
+    # Warm-up
+    # ------------------------------------------------------------------
+    def warmup_names(self) -> List[str]:
+        """Return the graphs named in ``GRAPH_WARMUP`` (comma-separated, or ``all``)."""
+        names = os.getenv("GRAPH_WARMUP", "").strip()
+        if names == "all":
+            return list(self.specs)
+        return [name.strip() for name in names.split(",") if name.strip()]
+
+    async def warm_up(self, names: Iterable[str] | None = None) -> Dict[str, Any]:
+        """Build the given graphs (default: ``GRAPH_WARMUP``) and run the warm-up hooks.
+
+        A graph that fails to build is logged and left to be built lazily, so a
+        missing API key for one sport does not keep the app from starting.
+        """
+        graphs = {}
+        for name in self.warmup_names() if names is None else names:
+            try:
+                graphs[name] = await self.aget(name)
+            except Exception as e:
+                logger.error("Warm-up of graph %s failed: %s", name, e)
+        for hook in self._warm_up_hooks:
+            result = hook(graphs)
+            if asyncio.iscoroutine(result):
+                await result
+        return graphs
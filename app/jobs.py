@@ -0,0 +1,248 @@
+"""SQLite-backed background job queue with an in-process worker pool.
+
+``/submit-trip`` used to run the whole agent, render the document and send
+the email inside the request. Now the endpoint only enqueues a job and
+returns its ID; ``JobQueue`` workers (asyncio tasks started with the app)
+process jobs one at a time each and record their status, so clients poll
+``/jobs/{job_id}`` instead of holding a request open for minutes.
+
+Jobs live in SQLite, so queued work survives a restart. A worker claims a
+job with a lease that it renews while the job runs. A job whose lease ran out
+(its process died, or its worker lost the database) is claimed again by any
+worker, in this or another process sharing ``JOBS_DB_PATH``. Live jobs of
+other processes are never re-run. A failing job is retried with exponential
+backoff up to ``max_attempts`` times. Handlers can ``save_progress`` between
+steps, so a retry (e.g. of email delivery) resumes after the steps that
+already succeeded instead of re-running them.
+
+Settings come from the environment:
+
+    JOBS_DB_PATH        SQLite file (data/jobs.sqlite)
+    JOB_WORKERS         concurrent jobs per process (2)
+    JOB_MAX_ATTEMPTS    attempts before a job is marked failed (3)
+    JOB_RETRY_DELAY     seconds before the first retry, doubled each time (30)
+    JOB_LEASE           seconds a claimed job stays owned without renewal (60)
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    progress TEXT,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    owner TEXT,
+    lease_until REAL,
+    run_after REAL NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, run_after);
+"""
+
+# Columns added after the first schema; existing databases get them on open.
+MIGRATIONS = {"owner": "TEXT", "lease_until": "REAL"}
+
+# queued -> running -> done | retrying -> running ... | failed
+PUBLIC_FIELDS = ("id", "kind", "status", "attempts", "error", "result", "created_at", "updated_at")
+
+Handler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+
+class JobQueue:
+    """Persistent job queue; ``handlers`` maps a job kind to its coroutine."""
+
+    def __init__(
+        self,
+        handlers: Dict[str, Handler],
+        path: str | None = None,
+        workers: int | None = None,
+        max_attempts: int | None = None,
+        retry_delay: float | None = None,
+        poll_interval: float = 1.0,
+        lease: float | None = None,
+    ):
+        """Open (or create) the queue database; unset settings come from the environment."""
+        self.handlers = handlers
+        self.path = path or os.getenv("JOBS_DB_PATH", "data/jobs.sqlite")
+        self.workers = workers or int(os.getenv("JOB_WORKERS", 2))
+        self.max_attempts = max_attempts or int(os.getenv("JOB_MAX_ATTEMPTS", 3))
+        self.retry_delay = float(os.getenv("JOB_RETRY_DELAY", 30)) if retry_delay is None else retry_delay
+        self.poll_interval = poll_interval
+        self.lease = float(os.getenv("JOB_LEASE", 60)) if lease is None else lease
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.executescript(SCHEMA)
+        columns = {row["name"] for row in self._db.execute("PRAGMA table_info(jobs)")}
+        with self._db:
+            for column, kind in MIGRATIONS.items():
+                if column not in columns:
+                    self._db.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: asyncio.Event | None = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    async def start(self) -> None:
+        """Start the workers (jobs whose lease ran out are picked up by ``_claim``)."""
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker(), name=f"job-worker-{i}") for i in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Cancel the workers; their running jobs are claimed again once the lease runs out."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def submit(self, kind: str, payload: Dict[str, Any]) -> str:
+        """Enqueue a job and return its ID."""
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind '{kind}'.")
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO jobs (id, kind, payload, status, run_after, created_at, updated_at) "
+                "VALUES (?, ?, ?, 'queued', ?, ?, ?)",
+                (job_id, kind, json.dumps(payload), now, now, now),
+            )
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job_id
+
+    def status(self, job_id: str) -> Dict[str, Any] | None:
+        """Public view of a job, or None if it does not exist."""
+        job = self._get(job_id)
+        return None if job is None else {field: job[field] for field in PUBLIC_FIELDS}
+
+    def save_progress(self, job_id: str, progress: Dict[str, Any]) -> None:
+        """Checkpoint a running job; retries see it as ``job["progress"]``."""
+        self._update(job_id, owned=True, progress=json.dumps(progress))
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+    async def _worker(self) -> None:
+        while True:
+            try:
+                job = self._claim()
+                if job is not None:
+                    await self._run(job)
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # e.g. "database is locked": the job (if any) keeps its lease and is
+                # claimed again once it runs out; the worker itself carries on.
+                logger.exception("Job worker error")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def _claim(self) -> Dict[str, Any] | None:
+        now = time.time()
+        with self._lock, self._db:
+            # Jobs whose worker vanished on their last attempt are not run again.
+            self._db.execute(
+                "UPDATE jobs SET status = 'failed', error = 'worker lost', updated_at = ? "
+                "WHERE status = 'running' AND (lease_until IS NULL OR lease_until < ?) AND attempts >= ?",
+                (now, now, self.max_attempts),
+            )
+            row = self._db.execute(
+                "SELECT id FROM jobs WHERE (status IN ('queued', 'retrying') AND run_after <= ?) "
+                "OR (status = 'running' AND (lease_until IS NULL OR lease_until < ?)) "
+                "ORDER BY run_after LIMIT 1",
+                (now, now),
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, owner = ?, lease_until = ?, "
+                "updated_at = ? WHERE id = ?",
+                (self.owner, now + self.lease, now, row["id"]),
+            )
+        return self._get(row["id"])
+
+    async def _keep_lease(self, job_id: str) -> None:
+        while True:
+            await asyncio.sleep(self.lease / 3)
+            try:
+                self._update(job_id, owned=True, lease_until=time.time() + self.lease)
+            except sqlite3.Error as e:
+                logger.warning("Job %s lease renewal failed: %s", job_id, e)
+
+    async def _run(self, job: Dict[str, Any]) -> None:
+        lease = asyncio.create_task(self._keep_lease(job["id"]))
+        try:
+            result = await self.handlers[job["kind"]](job)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if job["attempts"] < self.max_attempts:
+                delay = self.retry_delay * 2 ** (job["attempts"] - 1)
+                logger.warning("Job %s attempt %d failed, retrying in %.0fs: %s", job["id"], job["attempts"], delay, e)
+                self._update(job["id"], owned=True, status="retrying", error=str(e), run_after=time.time() + delay)
+            else:
+                logger.error("Job %s failed after %d attempts: %s", job["id"], job["attempts"], e)
+                self._update(job["id"], owned=True, status="failed", error=str(e))
+            return
+        finally:
+            lease.cancel()
+        try:
+            encoded = json.dumps(result)
+        except (TypeError, ValueError) as e:
+            # The handler's side effects already happened; a retry would repeat them.
+            logger.error("Job %s result is not JSON serializable: %s", job["id"], e)
+            self._update(job["id"], owned=True, status="failed", error=f"Result is not JSON serializable: {e}")
+            return
+        self._update(job["id"], owned=True, status="done", error=None, result=encoded)
+
+    # ------------------------------------------------------------------
+    # Storage helpers
+    # ------------------------------------------------------------------
+    def _get(self, job_id: str) -> Dict[str, Any] | None:
+        with self._lock:
+            row = self._db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        for field in ("payload", "progress", "result"):
+            job[field] = json.loads(job[field]) if job[field] is not None else None
+        return job
+
+    def _update(self, job_id: str, owned: bool = False, **fields: Any) -> None:
+        """Update a job; ``owned`` only while this queue still holds its lease."""
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{field} = ?" for field in fields)
+        query, params = f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id)
+        if owned:
+            query, params = query + " AND owner = ?", (*params, self.owner)
+        with self._lock, self._db:
+            self._db.execute(query, params)
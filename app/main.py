@@ -1,29 +1,44 @@
 # app/main.py
+import asyncio
+import json  # Added for JSON handling
+import logging
+import os
+import smtplib
+import tempfile
+import uuid  # Added for unique filenames
+from contextlib import asynccontextmanager
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from pathlib import Path  # Added for path handling
+
+import requests
+import sendgrid
+from dotenv import load_dotenv
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-import tempfile
 from jinja2 import Template
-from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-import requests
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-import sendgrid
-from sendgrid.helpers.mail import Mail, Email, To, Content
-# from send_email import send_email_with_attachment, create_email_body  # Import the email functions
-from app.send_email import send_email_with_attachment, create_email_body
-from app.react_agent.pretty import generate_docx
-from dotenv import load_dotenv
-import os
-import asyncio
-import uuid  # Added for unique filenames
-from pathlib import Path  # Added for path handling
+from sendgrid.helpers.mail import Content, Email, Mail, To
+
+from app.artifacts import ArtifactWorkers
+from app.ask import ASK_GRAPHS, SportLimits, ask_stream
+from app.graphs import GraphRegistry, langgraph_specs
+from app.jobs import JobQueue
+from app.react_agent import metrics
+from app.react_agent.deadline import with_deadline
 from app.react_agent.graph import PocketTraveller
-import json # Added for JSON handling
+from app.react_agent.live_stream import live_hub, valid_game_id
+from app.react_agent.llm import registry as model_registry
+from app.react_agent.pretty import generate_docx
+from app.react_agent.usage import UsageTracker
 
+# from send_email import send_email_with_attachment, create_email_body  # Import the email functions
+from app.send_email import create_email_body, send_email_with_attachment
+
+logger = logging.getLogger(__name__)
 
 # Load environment variables from the .env file
 load_dotenv()
@@ -36,7 +51,25 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 SENDGRID_API_KEY = os.getenv("SENDGRID_API_KEY")
 GOOGLE_MAPS_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY")
 
-app = FastAPI()
+# Compiled graphs are built once per process and shared across requests (see app/graphs.py)
+graph_registry = GraphRegistry(langgraph_specs())
+graph_registry.register("planner", PocketTraveller)
+
+
+# Warm up the graphs, then start and stop the background trip workers with the app;
+# on shutdown also close the pooled LLM HTTP clients
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the app's startup and shutdown work around its lifetime."""
+    await graph_registry.warm_up()
+    await trip_jobs.start()
+    yield
+    await trip_jobs.stop()
+    trip_artifacts.shutdown()
+    await model_registry.aclose()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -64,55 +97,66 @@ class TripFormData(BaseModel):
     voiceNotes: str
 
 
-    
-        
-# Endpoint to handle form submission and send data to the LLM
-@app.post("/submit-trip")
-async def submit_trip(request: Request, data: TripFormData):
+# Trip requests are processed by background workers (see app/jobs.py)
+async def process_trip(job):
+    """Plan a trip, render its document and email it, resuming after saved steps."""
+    data = TripFormData(**job["payload"])
+    progress = job["progress"] or {}
 
-    try:       
-        # Create a natural sentence introduction
+    # Steps 1-2: plan and render, skipped when a previous attempt got that far
+    if "docx_path" not in progress:
         user_input = (
             f"I am looking to travel from {data.origin} to {data.destination}. "
             f"I plan to travel on the following dates: {', '.join(data.dates)}. "
             f"There will be {data.adults} adult(s) and {data.children} child(ren) traveling with me. "
             f"My email address is {data.email}, and I have left the following extra information: {data.voiceNotes}."
         )
-        
-        planner = PocketTraveller()
+
+        planner = await graph_registry.aget("planner")
         output = await planner.invoke_graph(user_input)
+
+        # Render in the process pool; a plan rendered before is served from the cache
+        docx_path, pdf_path = await trip_artifacts.render(output)
+        progress = {"docx_path": docx_path, "pdf_path": pdf_path}
+        trip_jobs.save_progress(job["id"], progress)
+
+    # Step 3: email; a failure here is retried without re-planning
+    email_body = create_email_body(
+        data.origin,
+        data.destination,
+        data.dates,
+        data.adults,
+        data.children
+    )
+
+    await trip_artifacts.send_email(
+        send_email_with_attachment,
+        to_email=data.email,
+        subject="Your Pocket Travel Plan",
+        body=email_body,
+        file_path=progress["docx_path"]
+    )
+
+    return {"pdf_path": progress["pdf_path"]}
+
+
+trip_jobs = JobQueue({"trip": process_trip})
+trip_artifacts = ArtifactWorkers(generate_docx)
+
+
+    
         
-        # Generate unique filename using UUID
-        unique_id = uuid.uuid4().hex
-        # document_filename = f"travel_plan_{unique_id}"
-        file_path = f"app/static/results/{unique_id}.pdf"
-        
-        # Generate the DOCX in a temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".docx") as tmp:
-            temp_docx_path = tmp.name
-        
-        generate_docx(output, temp_docx_path, file_path)
-
-        email_body = create_email_body(
-            data.origin, 
-            data.destination, 
-            data.dates, 
-            data.adults, 
-            data.children
-        )
-        
-        send_email_with_attachment(
-            to_email=data.email, 
-            subject="Your Pocket Travel Plan", 
-            body=email_body, 
-            file_path=temp_docx_path
+# Endpoint to handle form submission: queue the trip and return its job ID right away
+@app.post("/submit-trip")
+async def submit_trip(request: Request, data: TripFormData):
+    """Queue a trip request and return its job ID."""
+    try:
+        job_id = trip_jobs.submit("trip", data.model_dump())
+        return JSONResponse(
+            status_code=202,
+            content={"message": "Trip details received. An email will be sent shortly.", "job_id": job_id}
         )
-        
-        # Remove the temporary DOCX file so that only the PDF remains
-        os.remove(temp_docx_path)
-        
-        return JSONResponse(content={"message": "Trip details received. An email will be sent shortly."})
-    
+
     except Exception as e:
         print(f"Error in submit_trip: {e}")
         return JSONResponse(
@@ -121,6 +165,92 @@ async def submit_trip(request: Request, data: TripFormData):
         )
 
 
+# Status of a queued trip (queued, running, retrying, done or failed)
+@app.get("/jobs/{job_id}")
+async def job_status(job_id: str):
+    """Return the status of a queued trip."""
+    job = trip_jobs.status(job_id)
+    if job is None:
+        return JSONResponse(status_code=404, content={"error": f"Unknown job '{job_id}'."})
+    return JSONResponse(content=job)
+
+
+# Live game updates as server-sent events (snapshot, then score/event deltas)
+@app.get("/live/{sport}/{game_id}")
+async def live_game(sport: str, game_id: str):
+    """Stream a game's live updates to the client as server-sent events."""
+    if sport not in live_hub.updates:
+        return JSONResponse(
+            status_code=404,
+            content={"error": f"Unknown sport '{sport}'. Use one of: {', '.join(live_hub.updates)}."}
+        )
+    if not valid_game_id(game_id):
+        return JSONResponse(status_code=404, content={"error": f"Unknown game '{game_id}'."})
+    return StreamingResponse(
+        live_hub.stream(sport, game_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# Per-sport cap on concurrent /ask runs (ASK_CONCURRENCY, ASK_CONCURRENCY_<SPORT>)
+ask_limits = SportLimits(ASK_GRAPHS)
+
+
+class AskRequest(BaseModel):
+    """Body of an ``/ask/{sport}`` request."""
+
+    question: str
+    thread_id: str | None = None
+    flat: bool = False  # use the single-agent app_<sport>_flat graph
+
+
+# Ask a sport graph; tokens, progress and the final answer stream back as server-sent events
+@app.post("/ask/{sport}")
+async def ask(sport: str, body: AskRequest, request: Request):
+    """Stream the sport graph's answer to a question as server-sent events."""
+    if sport not in ASK_GRAPHS:
+        return JSONResponse(
+            status_code=404,
+            content={"error": f"Unknown sport '{sport}'. Use one of: {', '.join(ASK_GRAPHS)}."}
+        )
+    if not ask_limits.try_acquire(sport):
+        return JSONResponse(
+            status_code=429,
+            content={"error": f"Too many {sport} questions in progress, try again shortly."},
+            headers={"Retry-After": "5"}
+        )
+
+    try:
+        graph = await graph_registry.aget(ASK_GRAPHS[sport] + ("_flat" if body.flat else ""))
+    except Exception as e:
+        ask_limits.release(sport)
+        logger.exception("Error loading the %s graph", sport)
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
+    tracker = UsageTracker()
+    config = with_deadline(
+        {"configurable": {"thread_id": body.thread_id or uuid.uuid4().hex}, "callbacks": [tracker]},
+        float(os.getenv("ASK_DEADLINE", 120))
+    )
+    return StreamingResponse(
+        ask_stream(
+            graph, body.question, config, request.is_disconnected,
+            on_close=lambda: ask_limits.release(sport), tracker=tracker
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# Prometheus metrics: per-tool latency, result size and errors, upstream HTTP per host, cache hits
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Serve the metrics in the Prometheus text format."""
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
+
+
 # Homepage endpoint
 @app.get("/")
 async def read_index(request: Request):
@@ -4,6 +4,7 @@ Works with a chat model with tool calling support.
 """
 
 from datetime import datetime, timezone
+from functools import cache
 from typing import Dict, List, Literal, cast
 from pydantic import BaseModel, Field
 from typing import Optional
@@ -22,7 +23,8 @@ from langchain_openai import ChatOpenAI as LangchainChatDeepSeek
 from langchain_core.messages import HumanMessage, SystemMessage, ToolMessage
 from langchain_core.prompts import MessagesPlaceholder
 from langchain_core.output_parsers import StrOutputParser
-from langchain.agents import create_react_agent, AgentExecutor
+# Aliased: the MLB section at the bottom imports langgraph's `create_react_agent`.
+from langchain.agents import AgentExecutor, create_react_agent as create_text_react_agent
 from langgraph.prebuilt import ToolNode
 from langchain_groq import ChatGroq
 from typing import Dict, List, Literal, Any
@@ -42,9 +44,10 @@ from langchain import hub
 #------------------------------------------------------------
 from app.react_agent.state import OverallState
 from app.react_agent.prompts import (SUPERVISOR_PROMPT, TEAM_PROMPT, PLAYER_PROMPT, GAME_INFO_PROMPT, GAME_DATA_PROMPT, 
-                                     MAIN_SUPERVISOR_PROMPT, GAME_SUPERVISOR_PROMPT)
+                                     MAIN_SUPERVISOR_PROMPT, GAME_SUPERVISOR_PROMPT, BETTING_ODDS_PROMPT)
 from app.react_agent.tools import (team_tools, player_tools,
-                                   game_data_tools, game_info_tools)
+                                   game_data_tools, game_info_tools, odds_line_scanner, odds_line_movement)
+from app.react_agent.llm import tiered_model
 # llm = LangchainChatDeepSeek(temperature=0, 
 #                               streaming=True, 
 #                               model="gpt-4-turbo",
@@ -52,9 +55,50 @@ from app.react_agent.tools import (team_tools, player_tools,
 #             )
 
 
-llm = LangchainChatDeepSeek(
-                              model="gpt-4-turbo",
-            )
+# The legacy supervisor routes on the router tier, the team/player ReAct agents
+# read stats payloads on the agent tier (see Configuration.*_model).
+router_llm = tiered_model("router")
+agent_llm = tiered_model("agent")
+
+
+# ---------------------------------------------------------------------
+# Compiled runnables for the nodes, built once per process on first use
+# ---------------------------------------------------------------------
+
+# The text ReAct agent needs the question and its scratchpad at the end of the prompt.
+REACT_PROMPT_SUFFIX = "\n\nQuestion: {input}\nThought:{agent_scratchpad}"
+
+
+@cache
+def supervisor_chain() -> Runnable:
+    """`SUPERVISOR_PROMPT | router_llm` with structured `SupervisorOutput`."""
+    prompt = PromptTemplate(
+        template=SUPERVISOR_PROMPT,
+        input_variables=["query"]
+    )
+    return prompt | router_llm.with_structured_output(SupervisorOutput)
+
+
+@cache
+def react_agent_executor(node: str) -> AgentExecutor:
+    """Return the text ReAct agent and executor for "team" or "player"."""
+    agent_prompt, tools, verbose = {
+        "team": (TEAM_PROMPT, team_tools, False),
+        "player": (PLAYER_PROMPT, player_tools, True),
+    }[node]
+    prompt = PromptTemplate.from_template(agent_prompt.source + REACT_PROMPT_SUFFIX)
+    react_agent = create_text_react_agent(
+        tools=tools,
+        llm=agent_llm,
+        prompt=prompt,
+    )
+    return AgentExecutor(
+        agent=react_agent,
+        tools=tools,
+        verbose=verbose,
+        return_intermediate_steps=True,
+        handle_parsing_errors=True
+    )
 
 
 # ---------------------------------------------------------------------
@@ -89,16 +133,7 @@ def supervisor_node(state: OverallState) -> Command[Literal["GameNode", "TeamNod
     if not state.messages:
         return Command(goto="__end__")
 
-    llm_with_structure = llm.with_structured_output(SupervisorOutput)
-
-    # Define the prompt template
-    prompt = PromptTemplate(
-        template=SUPERVISOR_PROMPT,
-        input_variables=["query"]
-    )
-
-    # Create the chain
-    chain = prompt | llm_with_structure
+    chain = supervisor_chain()
 
     # Extract the user's query from state.messages
     query = state.messages[-1].content  # Assuming the last message is the user's query
@@ -138,23 +173,7 @@ def team_node(state: OverallState) -> OverallState:
     4) Append an AIMessage summarizing the outcome.
     """
 
-    # Create the React agent prompt
-    prompt = PromptTemplate.from_template(TEAM_PROMPT)
-    
-    # Create the React agent
-    react_agent = create_react_agent(
-        tools=team_tools,
-        llm=llm,
-        prompt=prompt,  # Using the MLB team prompt
-    )
-    
-    agent_executor = AgentExecutor(
-        agent=react_agent, 
-        tools=team_tools, 
-        verbose=False,
-        return_intermediate_steps=True,
-        handle_parsing_errors=True
-    )
+    agent_executor = react_agent_executor("team")
 
     # Extract user input from the last message
     user_text = state.messages[0].content
@@ -193,23 +212,7 @@ def player_node(state: OverallState) -> OverallState:
     4) Append an AIMessage summarizing the outcome.
     """
 
-    # Create the React agent prompt
-    prompt = PromptTemplate.from_template(PLAYER_PROMPT)
-    
-    # Create the React agent
-    react_agent = create_react_agent(
-        tools=player_tools,
-        llm=llm,
-        prompt=prompt,  # Using the MLB team prompt
-    )
-    
-    agent_executor = AgentExecutor(
-        agent=react_agent, 
-        tools=player_tools, 
-        verbose=True,
-        return_intermediate_steps=True,
-        handle_parsing_errors=True
-    )
+    agent_executor = react_agent_executor("player")
 
     # Extract user input from the last message
     user_text = state.messages[0].content
@@ -281,41 +284,48 @@ from app.react_agent.tools import team_tools, player_tools, game_info_tools, gam
 from app.react_agent.prompts import TEAM_PROMPT, PLAYER_PROMPT, GAME_INFO_PROMPT, GAME_DATA_PROMPT, MAIN_SUPERVISOR_PROMPT, GAME_SUPERVISOR_PROMPT
 from langgraph.graph import StateGraph, START, END
 
-llm = ChatOpenAI(model="gpt-4o")
+lookup_llm = tiered_model("lookup")
 
 team_agent = create_react_agent(
-    model=llm,
-    tools=team_tools,
+    model=agent_llm,
+    tools=team_tools + [TEAM_PROMPT.examples_tool],
     name="team_agent",
     prompt= TEAM_PROMPT
 )
 
 player_agent = create_react_agent(
-    model=llm,
-    tools=player_tools,
+    model=agent_llm,
+    tools=player_tools + [PLAYER_PROMPT.examples_tool],
     name="player_agent",
     prompt=PLAYER_PROMPT
 )
 
 game_info_agent = create_react_agent(
-    model=llm,
-    tools=game_info_tools,
+    model=lookup_llm,
+    tools=game_info_tools + [GAME_INFO_PROMPT.examples_tool],
     name="game_info_agent",
     prompt=GAME_INFO_PROMPT
 )
 
 game_data_agent = create_react_agent(
-    model=llm,
-    tools=game_data_tools,
+    model=agent_llm,
+    tools=game_data_tools + [GAME_DATA_PROMPT.examples_tool],
     name="game_data_agent",
     prompt=GAME_DATA_PROMPT
 )
 
+betting_odds_agent = create_react_agent(
+    model=lookup_llm,
+    tools=[odds_line_scanner, odds_line_movement, BETTING_ODDS_PROMPT.examples_tool],
+    name="betting_odds_agent",
+    prompt=BETTING_ODDS_PROMPT
+)
+
 
 # Create supervisor workflow
 mlb_workflow = create_supervisor(
-    [team_agent, player_agent, game_data_agent, game_info_agent],
-    model=llm,
+    [team_agent, player_agent, game_data_agent, game_info_agent, betting_odds_agent],
+    model=router_llm,
     prompt=MAIN_SUPERVISOR_PROMPT
 )
 
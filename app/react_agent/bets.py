@@ -1,22 +1,125 @@
+"""The Odds API client, odds processing helpers and the cross-bookmaker odds scanner."""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+
+from app.react_agent.deadline import http_timeout
+from app.react_agent.metrics import record_cache
+
 
 class OddsAPI:
-    """Base class to interact with The Odds API"""
+    """Base class to interact with The Odds API.
 
-    def __init__(self, api_key):
+    Requests go through one pooled session. Responses are cached per endpoint
+    kind for ``ttls`` seconds (the sports list for hours, odds for seconds,
+    historical snapshots for a day), identical requests in flight at the
+    same time share one HTTP call, and the quota headers of every response
+    are tracked in ``credits``, so repeated questions don't burn credits.
+    The cache holds at most ``max_entries`` responses (least recently used
+    go first, expired ones on every write), and callers get their own copy
+    of each response.
+    """
+
+    # Cache lifetime in seconds per endpoint kind (None: until evicted, 0: no caching)
+    DEFAULT_TTLS = {"sports": 6 * 3600, "events": 300, "odds": 30, "historical": 24 * 3600}
+
+    def __init__(self, api_key, ttls=None, pool_size=10, timeout=15, max_entries=256):
+        """Create a client with its own session, response cache and credit counters."""
         self.api_key = api_key
         self.base_url = "https://api.the-odds-api.com/v4"
+        self.ttls = {**self.DEFAULT_TTLS, **(ttls or {})}
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.max_entries = max_entries
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size))
+        self.credits = {"remaining": None, "used": None, "last": None, "requests": 0, "cache_hits": 0, "coalesced": 0}
+        self._cache = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _endpoint_kind(endpoint):
+        if endpoint.startswith("historical/"):
+            return "historical"
+        return endpoint.rsplit("/", 1)[-1]  # "sports", "events" or "odds"
 
     def _make_request(self, endpoint, params):
-        params['api_key'] = self.api_key
+        key = (endpoint, tuple(sorted(params.items())))
+        ttl = self.ttls.get(self._endpoint_kind(endpoint), 0)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and (cached[0] is None or cached[0] > time.monotonic()):
+                self._cache.move_to_end(key)
+                self.credits["cache_hits"] += 1
+                record_cache("odds_api", hit=True)
+                return copy.deepcopy(cached[1])
+            future = self._in_flight.get(key)
+            if future is None:
+                future = self._in_flight[key] = Future()
+                owner = True
+            else:
+                self.credits["coalesced"] += 1
+                owner = False
+        # A coalesced request shares another caller's HTTP call, so it counts as a hit.
+        record_cache("odds_api", hit=not owner)
+        if not owner:
+            return copy.deepcopy(future.result())
+
         try:
-            response = requests.get(f"{self.base_url}/{endpoint}", params=params)
+            data = self._fetch(endpoint, params)
+            if data is not None and ttl != 0:
+                self._store(key, None if ttl is None else time.monotonic() + ttl, data)
+            future.set_result(data)
+            return copy.deepcopy(data)
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def _store(self, key, expires, data):
+        now = time.monotonic()
+        with self._lock:
+            for stale in [k for k, (until, _) in self._cache.items() if until is not None and until <= now]:
+                del self._cache[stale]
+            self._cache[key] = (expires, data)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    def _fetch(self, endpoint, params):
+        params = {**params, "api_key": self.api_key}
+        try:
+            response = self.session.get(f"{self.base_url}/{endpoint}", params=params, timeout=http_timeout(self.timeout))
+            self._track_credits(response.headers)
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
             print(f"Error during request: {e}")
             return None
 
+    def _track_credits(self, headers):
+        with self._lock:
+            self.credits["requests"] += 1
+            for field in ("remaining", "used", "last"):
+                value = headers.get(f"x-requests-{field}")
+                if value is not None:
+                    self.credits[field] = float(value)
+
+    def clear_cache(self):
+        """Drop every cached response."""
+        with self._lock:
+            self._cache.clear()
+
     def get_in_season_sports(self):
         """Retrieve a list of in-season sports."""
         return self._make_request("sports", {})
@@ -37,6 +140,29 @@ class OddsAPI:
         }
         return self._make_request(endpoint, params)
 
+    def get_odds_batch(self, sport_keys, regions, markets, odds_format="decimal", date_format="iso"):
+        """Retrieve odds for several sports concurrently, keyed by sport.
+
+        ``markets`` is either one markets string for every sport or a dict of
+        sport key -> markets string.
+        """
+        def fetch(sport_key):
+            sport_markets = markets[sport_key] if isinstance(markets, dict) else markets
+            return self.get_odds(sport_key, regions, sport_markets, odds_format, date_format)
+
+        return self._batch(fetch, sport_keys)
+
+    def get_events_batch(self, sport_keys):
+        """Retrieve events for several sports concurrently, keyed by sport."""
+        return self._batch(self.get_events, sport_keys)
+
+    def _batch(self, fetch, sport_keys):
+        sport_keys = list(dict.fromkeys(sport_keys))
+        if not sport_keys:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.pool_size, len(sport_keys))) as pool:
+            return dict(zip(sport_keys, pool.map(fetch, sport_keys)))
+
     def get_historical_odds(self, sport_key, event_id, date, regions, markets, odds_format="decimal", date_format="iso"):
         """Retrieve historical odds for a specific event."""
         endpoint = f"historical/sports/{sport_key}/events/{event_id}/odds"
@@ -89,6 +215,211 @@ class OddsDataProcessor:
         most_balanced_point = min(differences, key=differences.get)
         return side_1_by_point[most_balanced_point], side_2_by_point[most_balanced_point]
 
+    # ------------------------------------------------------------------
+    # Vectorized variants: the same math over whole arrays of prices, for
+    # full-slate odds (events x bookmakers x points) in one NumPy pass.
+    # ------------------------------------------------------------------
+    @staticmethod
+    def american_to_decimal_array(american_odds):
+        """Convert an array of American odds to decimal odds."""
+        odds = np.asarray(american_odds, dtype=float)
+        with np.errstate(divide="ignore"):
+            return np.where(odds < 0, 1 - 100 / odds, 1 + odds / 100)
+
+    @staticmethod
+    def decimal_to_american_array(decimal_odds):
+        """Convert an array of decimal odds to (rounded) American odds."""
+        odds = np.asarray(decimal_odds, dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            american = np.where(odds < 2, 100 / (1 - odds), 100 * (odds - 1))
+        return np.where(odds == 1, 0, np.round(american)).astype(int)
+
+    @staticmethod
+    def pair_outcomes(events):
+        """Flatten (side_1, side_2) outcome lists of many events into aligned arrays.
+
+        Only points offered on both sides are kept, as in find_most_balanced.
+        Returns (event_index, points, side_1_prices, side_2_prices).
+        """
+        event_index, points, side_1_prices, side_2_prices = [], [], [], []
+        for i, (side_1, side_2) in enumerate(events):
+            side_2_by_point = {o['point']: o['price'] for o in side_2}
+            for o in side_1:
+                if o['point'] in side_2_by_point:
+                    event_index.append(i)
+                    points.append(o['point'])
+                    side_1_prices.append(o['price'])
+                    side_2_prices.append(side_2_by_point[o['point']])
+        return (np.asarray(event_index, dtype=int), np.asarray(points, dtype=float),
+                np.asarray(side_1_prices, dtype=float), np.asarray(side_2_prices, dtype=float))
+
+    @staticmethod
+    def find_most_balanced_array(event_index, side_1_prices, side_2_prices, american_format=True):
+        """For every event at once, the row of its most balanced point.
+
+        Rows are (event, point) pairs as returned by pair_outcomes. The result
+        holds one row index per event, in ascending event order; ties go to the
+        earlier row, like find_most_balanced.
+        """
+        event_index = np.asarray(event_index)
+        side_1 = np.asarray(side_1_prices, dtype=float)
+        side_2 = np.asarray(side_2_prices, dtype=float)
+        if american_format:
+            side_1 = OddsDataProcessor.american_to_decimal_array(side_1)
+            side_2 = OddsDataProcessor.american_to_decimal_array(side_2)
+        differences = np.abs(side_1 - side_2)
+        # Sort by event, then difference (stable, so earlier rows win ties)
+        order = np.lexsort((differences, event_index))
+        sorted_events = event_index[order]
+        first_of_event = np.r_[True, sorted_events[1:] != sorted_events[:-1]] if len(order) else np.zeros(0, dtype=bool)
+        return order[first_of_event]
+
+
+class OddsScanner:
+    """Best lines, implied probabilities, overround and arbitrage for a full get_odds response.
+
+    Every price of every bookmaker becomes one row of flat arrays; all the
+    math then runs as grouped NumPy reductions over the whole slate at once.
+    A "line" is one (event, market, player, point) both sides of a bet are
+    priced on; the two sides of a spread share the home team's point. A line
+    only counts as complete (and can only be an arbitrage) when every outcome
+    of its event's market is priced, e.g. the draw of a soccer 3-way h2h.
+    """
+
+    # Sports whose h2h market has a draw outcome, even when no bookmaker in the response prices it
+    THREE_WAY_SPORT_PREFIXES = ("soccer_",)
+
+    @staticmethod
+    def flatten(events, odds_format="decimal"):
+        """Flatten get_odds events into one row per (line, outcome, bookmaker) price."""
+        lines, outcomes, bookmakers, market_outcomes = {}, {}, {}, {}
+        line_ids, outcome_ids, book_ids, raw_prices = [], [], [], []
+        for i, event in enumerate(events):
+            three_way = str(event.get('sport_key', '')).startswith(OddsScanner.THREE_WAY_SPORT_PREFIXES)
+            for bookmaker in event.get('bookmakers', []):
+                book = bookmakers.setdefault(bookmaker['key'], len(bookmakers))
+                for market in bookmaker.get('markets', []):
+                    names = market_outcomes.setdefault((i, market['key']), set())
+                    if three_way and market['key'] == 'h2h':
+                        names.add('Draw')
+                    for outcome in market.get('outcomes', []):
+                        names.add(outcome['name'])
+                        point = outcome.get('point')
+                        if market['key'] == 'spreads' and point is not None and outcome['name'] != event.get('home_team'):
+                            point = -point
+                        line = lines.setdefault((i, market['key'], outcome.get('description'), point), len(lines))
+                        line_ids.append(line)
+                        outcome_ids.append(outcomes.setdefault((line, outcome['name']), len(outcomes)))
+                        book_ids.append(book)
+                        raw_prices.append(outcome['price'])
+        raw_prices = np.asarray(raw_prices, dtype=float)
+        prices = OddsDataProcessor.american_to_decimal_array(raw_prices) if odds_format == "american" else raw_prices
+        return {
+            # Distinct outcomes of each line's event and market, all of which a complete line prices
+            "expected_sides": np.asarray([len(market_outcomes[key[:2]]) for key in lines], dtype=int),
+            "line": np.asarray(line_ids, dtype=int),
+            "outcome": np.asarray(outcome_ids, dtype=int),
+            "bookmaker": np.asarray(book_ids, dtype=int),
+            "price": prices,
+            "raw_price": raw_prices,
+            "lines": list(lines),
+            "outcomes": list(outcomes),
+            "bookmakers": list(bookmakers),
+        }
+
+    @staticmethod
+    def scan_arrays(rows):
+        """Run the vectorized pass: per-outcome best prices and per-line metrics."""
+        n_lines, n_outcomes, n_books = len(rows["lines"]), len(rows["outcomes"]), len(rows["bookmakers"])
+        if n_outcomes == 0:
+            empty = np.zeros(0)
+            return {"best_row": empty.astype(int), "outcome_line": empty.astype(int), "implied": empty,
+                    "overround": empty, "bookmaker_overround": empty, "complete": empty.astype(bool)}
+        outcome, line, price = rows["outcome"], rows["line"], rows["price"]
+
+        # Best price per outcome: sort by (outcome, -price) and keep each outcome's first row
+        order = np.lexsort((-price, outcome))
+        first = np.r_[True, outcome[order][1:] != outcome[order][:-1]]
+        best_row = order[first]  # indexed by outcome id
+        implied = 1 / price[best_row]
+
+        outcome_line = np.empty(n_outcomes, dtype=int)
+        outcome_line[outcome] = line
+        sides = np.bincount(outcome_line, minlength=n_lines)
+        best_book_sum = np.bincount(outcome_line, weights=implied, minlength=n_lines)
+
+        # Each bookmaker's own margin on the lines it prices on every side
+        cell = line * n_books + rows["bookmaker"]
+        book_sum = np.bincount(cell, weights=1 / price, minlength=n_lines * n_books).reshape(n_lines, n_books)
+        book_sides = np.bincount(cell, minlength=n_lines * n_books).reshape(n_lines, n_books)
+        full = book_sides == sides[:, None]
+        n_full = full.sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            bookmaker_overround = np.where(n_full > 0, (book_sum * full).sum(axis=1) / n_full - 1, np.nan)
+
+        return {
+            "best_row": best_row,
+            "outcome_line": outcome_line,
+            "implied": implied,
+            "overround": best_book_sum - 1,
+            "bookmaker_overround": bookmaker_overround,
+            "complete": (sides >= 2) & (sides >= rows["expected_sides"]),
+        }
+
+    @staticmethod
+    def scan(events, odds_format="decimal", arbitrage_only=False, limit=None):
+        """Scan every event of a get_odds response.
+
+        Returns one entry per line with the best price (and bookmaker) per
+        outcome, its implied probability, the best-line overround (negative
+        means arbitrage), the average bookmaker overround and, for arbitrage
+        lines, the profit and the stake split. Arbitrage lines come first.
+        """
+        rows = OddsScanner.flatten(events, odds_format)
+        result = OddsScanner.scan_arrays(rows)
+
+        outcomes_by_line = [[] for _ in rows["lines"]]
+        for outcome_id, line in enumerate(result["outcome_line"].tolist()):
+            outcomes_by_line[line].append(outcome_id)
+
+        report = []
+        for line, (event_i, market, description, point) in enumerate(rows["lines"]):
+            overround = float(result["overround"][line])
+            arbitrage = bool(result["complete"][line]) and overround < 0
+            if arbitrage_only and not arbitrage:
+                continue
+            event = events[event_i]
+            entry = {
+                "event_id": event.get('id'),
+                "event": f"{event.get('away_team')} @ {event.get('home_team')}",
+                "commence_time": event.get('commence_time'),
+                "market": market,
+                "point": point,
+                "outcomes": [
+                    {
+                        "name": rows["outcomes"][o][1],
+                        "best_price": float(rows["raw_price"][result["best_row"][o]]),
+                        "bookmaker": rows["bookmakers"][rows["bookmaker"][result["best_row"][o]]],
+                        "implied_probability": round(float(result["implied"][o]), 4),
+                    }
+                    for o in outcomes_by_line[line]
+                ],
+                "overround": round(overround, 4),
+                "avg_bookmaker_overround": None if np.isnan(result["bookmaker_overround"][line])
+                else round(float(result["bookmaker_overround"][line]), 4),
+                "arbitrage": arbitrage,
+            }
+            if description is not None:
+                entry["description"] = description
+            if arbitrage:
+                total = overround + 1
+                entry["arbitrage_profit"] = round(1 / total - 1, 4)
+                entry["stakes"] = [round(float(result["implied"][o]) / total, 4) for o in outcomes_by_line[line]]
+            report.append(entry)
+
+        report.sort(key=lambda entry: (not entry["arbitrage"], entry["overround"]))
+        return report[:limit] if limit else report
+
 
 # Example usage
 if __name__ == "__main__":
@@ -107,3 +438,21 @@ if __name__ == "__main__":
     # Retrieve odds for a specific event
     odds = odds_api.get_odds(sport_key, "us", "h2h,totals", "american")
     print(f"Odds for {sport_key}:", odds)
+
+    # Several sports at once; repeated calls within the TTL are served from cache
+    slate = odds_api.get_odds_batch(["basketball_nba", "baseball_mlb", "soccer_epl"], "us", "h2h", "american")
+    print("Credits:", odds_api.credits)
+
+    # Best lines and arbitrage across every bookmaker of the slate
+    print("Arbitrage:", OddsScanner.scan(odds, "american", arbitrage_only=True))
+
+    # Historical line movement: fetch only snapshots not stored yet, then read locally
+    from datetime import UTC, datetime, timedelta
+
+    from app.react_agent.odds_history import OddsHistoryStore, timestamps
+
+    store = OddsHistoryStore()
+    event_id = events[0]["id"]
+    end = datetime.now(UTC)
+    print(store.backfill(odds_api, sport_key, event_id, timestamps(end - timedelta(hours=6), end, timedelta(hours=1))))
+    print(store.line_movement(sport_key, event_id, "h2h"))
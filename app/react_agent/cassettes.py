@@ -0,0 +1,218 @@
+"""Record and replay upstream HTTP traffic (offline benchmarks and tests).
+
+Every upstream client the tools use sends its requests through
+``requests.adapters.HTTPAdapter.send``: plain ``requests.get`` calls, the
+OddsAPI session, ``nba_api`` (stats.nba.com and the live CDN),
+``mlbstatsapi`` and the Tavily search wrapper. ``install`` patches that one
+method, so a single switch covers all of them:
+
+    record   send for real and append every response to the cassette store
+    replay   answer from the store only; a request that was never recorded
+             fails with ``CassetteMiss`` (a ``requests.ConnectionError``, so
+             tools report it like any network error)
+    auto     replay what is recorded, record the rest
+
+A request is identified by method, URL and body, with credentials (query or
+JSON parameters such as ``api_key``) removed, and request headers ignored, so
+cassettes contain no secrets and match across machines. Each request keeps
+the list of responses recorded for it. Replay walks through that list and then
+stays on the last response, so a live feed that changed between recordings
+replays its changes in order.
+
+Replay can inject latency: ``recorded`` sleeps for the originally measured
+time, a number sleeps that many seconds, and ``0`` (the default) does not
+sleep. Settings come from the environment (read by ``install_from_env``,
+which tools.py calls on import):
+
+    HTTP_CASSETTE_MODE      off | record | replay | auto (off)
+    HTTP_CASSETTE_DIR       store directory (data/cassettes)
+    HTTP_REPLAY_LATENCY     recorded | seconds (0)
+"""
+
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+MODES = ("off", "record", "replay", "auto")
+
+# Query and JSON body parameters that carry credentials; never stored or keyed on.
+SECRET_PARAMS = {"api_key", "apikey", "apiKey", "key", "token", "access_token"}
+
+# Response headers worth keeping (the body is stored decoded, so no encoding/length).
+KEPT_HEADERS = ("content-type", "x-requests-remaining", "x-requests-used", "x-requests-last")
+
+
+class CassetteMiss(requests.ConnectionError):
+    """Replay mode got a request that is not in the cassette store."""
+
+
+def scrub_url(url: str) -> str:
+    """Return the URL without credential parameters, with the query sorted."""
+    parts = urlsplit(url)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in SECRET_PARAMS)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ""))
+
+
+def scrub_body(body: Union[bytes, str, None]) -> bytes:
+    """Return the body without credential fields (JSON re-encoded with sorted keys)."""
+    if body is None:
+        return b""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return body
+    if isinstance(payload, dict):
+        payload = {k: v for k, v in payload.items() if k not in SECRET_PARAMS}
+    return json.dumps(payload, sort_keys=True).encode("utf-8")
+
+
+def request_key(request: requests.PreparedRequest) -> Tuple[str, str, str]:
+    """Return the (method, scrubbed URL, body hash) identifying a request in the store."""
+    body = hashlib.sha256(scrub_body(request.body)).hexdigest()[:16]
+    return request.method or "GET", scrub_url(request.url), body
+
+
+class CassetteStore:
+    """Recorded responses as one JSON file per request under ``path/<host>/``."""
+
+    def __init__(self, path: str | None = None):
+        """Use ``path``, default ``HTTP_CASSETTE_DIR``, as the store directory."""
+        self.path = path or os.getenv("HTTP_CASSETTE_DIR", "data/cassettes")
+        self._lock = threading.Lock()
+        self._positions: Dict[Tuple[str, str, str], int] = defaultdict(int)
+
+    def file(self, key: Tuple[str, str, str]) -> str:
+        """Return the path of the cassette file of ``key``."""
+        digest = hashlib.sha256("\n".join(key).encode("utf-8")).hexdigest()[:24]
+        return os.path.join(self.path, urlsplit(key[1]).netloc or "_", f"{digest}.json")
+
+    def _load(self, key: Tuple[str, str, str]) -> List[Dict[str, Any]]:
+        try:
+            with open(self.file(key)) as f:
+                return json.load(f)["responses"]
+        except FileNotFoundError:
+            return []
+
+    def has(self, key: Tuple[str, str, str]) -> bool:
+        """Whether any response is recorded for ``key``."""
+        return os.path.exists(self.file(key))
+
+    def append(self, key: Tuple[str, str, str], response: requests.Response, elapsed: float) -> None:
+        """Record ``response`` as the next response of ``key``."""
+        entry = {
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() in KEPT_HEADERS},
+            "body": base64.b64encode(response.content or b"").decode("ascii"),
+            "elapsed": round(elapsed, 4),
+            "recorded_at": time.time(),
+        }
+        with self._lock:
+            responses = self._load(key) + [entry]
+            path = self.file(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, "w") as f:
+                json.dump({"method": key[0], "url": key[1], "body_sha256": key[2], "responses": responses}, f, indent=1)
+            os.replace(tmp, path)
+
+    def next(self, key: Tuple[str, str, str]) -> Dict[str, Any] | None:
+        """Return the next recorded response for ``key`` (the last one once exhausted)."""
+        with self._lock:
+            responses = self._load(key)
+            if not responses:
+                return None
+            position = self._positions[key]
+            self._positions[key] = position + 1
+        return responses[min(position, len(responses) - 1)]
+
+    def rewind(self) -> None:
+        """Replay every request from its first recorded response again."""
+        with self._lock:
+            self._positions.clear()
+
+
+def build_response(request: requests.PreparedRequest, entry: Dict[str, Any]) -> requests.Response:
+    """Rebuild a ``requests.Response`` to ``request`` from a recorded entry."""
+    response = requests.Response()
+    response.status_code = entry["status"]
+    response.reason = entry.get("reason")
+    response.headers = CaseInsensitiveDict(entry.get("headers") or {})
+    response._content = base64.b64decode(entry["body"])
+    response.url = request.url
+    response.request = request
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers) or "utf-8"
+    return response
+
+
+class Cassettes:
+    """The active mode, store and replay latency; ``send`` replaces ``HTTPAdapter.send``."""
+
+    def __init__(self, mode: str = "off", store: CassetteStore | None = None, latency: Union[str, float] = 0.0):
+        """Validate ``mode``; ``latency`` is seconds per replayed response or ``"recorded"``."""
+        if mode not in MODES:
+            raise ValueError(f"Unknown cassette mode '{mode}'. Use one of: {', '.join(MODES)}.")
+        self.mode = mode
+        self.store = store or CassetteStore()
+        self.latency = latency
+
+    def delay(self, entry: Dict[str, Any]) -> float:
+        """Return the seconds to wait before serving a replayed ``entry``."""
+        return float(entry.get("elapsed", 0.0)) if self.latency == "recorded" else float(self.latency)
+
+    def send(self, send: Any, adapter: HTTPAdapter, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        """Replay, record or pass ``request`` through to the original ``send``, per the mode."""
+        if self.mode == "off":
+            return send(adapter, request, **kwargs)
+        key = request_key(request)
+        if self.mode == "replay" or (self.mode == "auto" and self.store.has(key)):
+            entry = self.store.next(key)
+            if entry is None:
+                raise CassetteMiss(f"No recorded response for {key[0]} {key[1]}", request=request)
+            delay = self.delay(entry)
+            if delay > 0:
+                time.sleep(delay)
+            return build_response(request, entry)
+        started = time.perf_counter()
+        response = send(adapter, request, **kwargs)
+        if not kwargs.get("stream"):
+            self.store.append(key, response, time.perf_counter() - started)
+        return response
+
+
+cassettes = Cassettes()
+
+
+def install(mode: str, path: str | None = None, latency: Union[str, float] = 0.0) -> Cassettes:
+    """Switch the process-wide cassette mode (``off`` restores live traffic)."""
+    global cassettes
+    cassettes = Cassettes(mode, CassetteStore(path), latency)
+    send = HTTPAdapter.send
+    if not getattr(send, "__cassettes__", False):
+        def cassette_send(adapter: HTTPAdapter, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+            return cassettes.send(send, adapter, request, **kwargs)
+
+        cassette_send.__cassettes__ = True
+        HTTPAdapter.send = cassette_send
+    return cassettes
+
+
+def install_from_env() -> Cassettes | None:
+    """Install the mode from ``HTTP_CASSETTE_*``; does nothing when it is off."""
+    mode = os.getenv("HTTP_CASSETTE_MODE", "off")
+    if mode == "off":
+        return None
+    latency = os.getenv("HTTP_REPLAY_LATENCY", "0")
+    return install(mode, os.getenv("HTTP_CASSETTE_DIR"), latency if latency == "recorded" else float(latency))
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field, fields
-from typing import Annotated, Optional
+from typing import Annotated, Literal, Optional
 
 from langchain_core.runnables import RunnableConfig, ensure_config
 
@@ -30,6 +30,55 @@ class Configuration:
         },
     )
 
+    router_model: str = field(
+        default="openai/gpt-4o-mini",
+        metadata={
+            "description": "Model for routing hops: the query splitter and every supervisor. "
+            "Should be in the form: provider/model-name."
+        },
+    )
+
+    lookup_model: str = field(
+        default="openai/gpt-4o-mini",
+        metadata={
+            "description": "Model for agents that only look up IDs, schedules or web results. "
+            "Should be in the form: provider/model-name."
+        },
+    )
+
+    agent_model: str = field(
+        default="openai/gpt-4o",
+        metadata={
+            "description": "Model for agents that read and interpret stats payloads. "
+            "Should be in the form: provider/model-name."
+        },
+    )
+
+    synthesis_model: str = field(
+        default="openai/gpt-4o",
+        metadata={
+            "description": "Model that writes the final answer from the sub-query results. "
+            "Should be in the form: provider/model-name."
+        },
+    )
+
+    few_shot_k: int = field(
+        default=2,
+        metadata={
+            "description": "Number of worked examples retrieved into each agent and split_node "
+            "prompt for the current question. 0 disables them; a value at least as large as "
+            "a prompt's example list inlines all of its examples."
+        },
+    )
+
+    flat_tool_k: int = field(
+        default=6,
+        metadata={
+            "description": "Number of tools the flat single-agent mode retrieves for each "
+            "question (web search is always added on top)."
+        },
+    )
+
     max_search_results: int = field(
         default=10,
         metadata={
@@ -37,6 +86,47 @@ class Configuration:
         },
     )
 
+    synthesis_mode: Literal["gather", "incremental"] = field(
+        default="gather",
+        metadata={
+            "description": "How sub-query results are combined. 'gather' waits for every "
+            "supervisor before synthesizing; 'incremental' streams partial results as they "
+            "finish and synthesizes from whatever returned within `synthesis_deadline`."
+        },
+    )
+
+    synthesis_deadline: float = field(
+        default=20.0,
+        metadata={
+            "description": "Tail-latency budget in seconds for the incremental mode. Sub-queries "
+            "still running when it expires are reported as late."
+        },
+    )
+
+    late_results: Literal["flag", "append"] = field(
+        default="flag",
+        metadata={
+            "description": "What to do with sub-queries that miss the deadline. 'flag' cancels "
+            "them and tells the synthesizer they are missing; 'append' lets them finish "
+            "(up to `late_result_timeout`) and appends their answers after the synthesis."
+        },
+    )
+
+    late_result_timeout: float = field(
+        default=30.0,
+        metadata={
+            "description": "Extra seconds granted to late sub-queries when `late_results` is 'append'."
+        },
+    )
+
+    deadline: float | None = field(
+        default=None,
+        metadata={
+            "description": "Absolute request deadline as a Unix timestamp. Nodes, supervisors and "
+            "tool HTTP calls stop once it passes (see deadline.py); None means no deadline."
+        },
+    )
+
     @classmethod
     def from_runnable_config(
         cls, config: Optional[RunnableConfig] = None
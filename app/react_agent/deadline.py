@@ -0,0 +1,77 @@
+"""Request deadlines carried in the RunnableConfig.
+
+A request's deadline is an absolute Unix time stored as
+``config["configurable"]["deadline"]`` (see ``with_deadline``). LangChain
+propagates the config through nodes, sub-agents and tools, including sync
+tools that run in executor threads, so any code below a graph run can find
+the deadline with ``ensure_config()`` even when no config is passed to it
+explicitly.
+
+- ``run_within`` bounds an awaitable (an LLM call, a supervisor run) by the
+  remaining budget and raises ``DeadlineExceeded`` when it runs out;
+- ``http_timeout`` turns a tool's usual HTTP timeout into
+  ``min(timeout, remaining)``, so no request outlives the deadline;
+- ``check_deadline`` fails fast before starting more work.
+
+Without a deadline in the config all of these behave as before.
+"""
+
+import asyncio
+import time
+from typing import Awaitable, TypeVar
+
+from langchain_core.runnables import RunnableConfig, ensure_config
+
+T = TypeVar("T")
+
+# Shortest HTTP timeout handed out, so a nearly spent budget still gets a real attempt.
+MIN_HTTP_TIMEOUT = 1.0
+
+
+class DeadlineExceeded(TimeoutError):
+    """The request's deadline passed before the work finished."""
+
+
+def with_deadline(config: RunnableConfig | None, seconds: float | None) -> RunnableConfig:
+    """Return a copy of ``config`` whose deadline is ``seconds`` from now (unchanged if None)."""
+    config = dict(config or {})
+    if seconds is not None:
+        config["configurable"] = {**(config.get("configurable") or {}), "deadline": time.time() + seconds}
+    return config
+
+
+def remaining(config: RunnableConfig | None = None) -> float | None:
+    """Seconds left before the deadline (may be negative), or None without one."""
+    deadline = (ensure_config(config).get("configurable") or {}).get("deadline")
+    return None if deadline is None else deadline - time.time()
+
+
+def check_deadline(config: RunnableConfig | None = None) -> None:
+    """Raise ``DeadlineExceeded`` if the deadline has already passed."""
+    left = remaining(config)
+    if left is not None and left <= 0:
+        raise DeadlineExceeded(f"Request deadline passed {-left:.1f}s ago.")
+
+
+def http_timeout(timeout: float, config: RunnableConfig | None = None) -> float:
+    """``timeout`` capped by the remaining budget; raises once the deadline has passed."""
+    check_deadline(config)
+    left = remaining(config)
+    return timeout if left is None else max(min(timeout, left), MIN_HTTP_TIMEOUT)
+
+
+async def run_within(awaitable: Awaitable[T], config: RunnableConfig | None = None) -> T:
+    """Await ``awaitable``, cancelling it when the deadline passes."""
+    left = remaining(config)
+    if left is None:
+        return await awaitable
+    if left <= 0:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise DeadlineExceeded(f"Request deadline passed {-left:.1f}s ago.")
+    try:
+        return await asyncio.wait_for(awaitable, timeout=left)
+    except DeadlineExceeded:
+        raise
+    except TimeoutError as e:
+        raise DeadlineExceeded(f"Request deadline of {left:.1f}s exceeded.") from e
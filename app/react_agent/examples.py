@@ -0,0 +1,52 @@
+"""Worked-example store for dynamic few-shot prompting.
+
+Prompts used to inline every worked example regardless of the question. An
+``ExampleStore`` indexes a prompt's examples (BM25, weighted towards the
+example's question) so each call can include only the ``k`` most relevant
+ones, set per run via ``Configuration.few_shot_k``.
+"""
+
+import re
+from typing import List, Sequence
+
+from app.react_agent.retrieval import BM25Index
+
+_QUESTION = re.compile(r'(?:Question|User Query):\s*"(.*?)"', re.DOTALL)
+
+
+def example_question(example: str) -> str:
+    """Return the question a worked example answers (empty if it has none)."""
+    match = _QUESTION.search(example)
+    return match.group(1) if match else ""
+
+
+def format_examples(examples: Sequence[str], heading: str = "Example") -> str:
+    """Join retrieved examples, numbered consecutively, e.g. ``**Example 1:**``."""
+    return "\n\n".join(f"**{heading} {i}:**\n{example}" for i, example in enumerate(examples, 1))
+
+
+class ExampleStore:
+    """A fixed list of worked examples searchable by question."""
+
+    def __init__(self, examples: Sequence[str]):
+        """Index ``examples`` for search."""
+        self.examples = list(examples)
+        # The question is indexed twice so that it outweighs the reasoning text.
+        self.index = BM25Index([
+            f"{example_question(example)} {example_question(example)} {example}"
+            for example in self.examples
+        ])
+
+    def __len__(self) -> int:
+        """Return the number of examples."""
+        return len(self.examples)
+
+    def search(self, query: str, k: int) -> List[str]:
+        """Return the ``k`` examples most relevant to ``query``, best first.
+
+        Asking for at least as many examples as the store holds returns all of
+        them in their original order, i.e. the old inline behaviour.
+        """
+        if k >= len(self.examples):
+            return list(self.examples)
+        return [self.examples[i] for i in self.index.top_k(query, k)]
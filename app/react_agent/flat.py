@@ -0,0 +1,122 @@
+"""Flat execution mode: one tool-calling agent per question.
+
+The hierarchical graphs route a question through ``split_node``, a supervisor
+and a sub-agent before the first API call is made. In the flat mode a single
+ReAct agent answers the question directly. To keep its prompt small it only
+sees the handful of tools whose descriptions best match the question (BM25
+over tool names, descriptions and argument docs), plus web search as a
+fallback.
+
+The compiled graphs are exposed as ``app_nba_flat``, ``app_soccer_flat`` and
+``app_mlb_flat`` (see langgraph.json).
+"""
+
+import threading
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, List, Sequence
+
+from langchain_core.messages import HumanMessage
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import BaseTool
+from langgraph.graph import END, START, MessagesState, StateGraph
+from langgraph.prebuilt import create_react_agent
+
+from app.react_agent.configuration import Configuration
+from app.react_agent.llm import tiered_model
+from app.react_agent.prompts import FLAT_AGENT_PROMPT
+from app.react_agent.retrieval import BM25Index
+from app.react_agent.tools import (
+    mlb_all_tools,
+    nba_all_tools,
+    soccer_all_tools,
+    tavily_search_tool,
+)
+from app.react_agent.utils import get_message_text
+
+SPORT_TOOLS: Dict[str, List[BaseTool]] = {
+    "nba": nba_all_tools,
+    "soccer": soccer_all_tools,
+    "mlb": mlb_all_tools,
+}
+
+SPORT_LABELS = {"nba": "NBA", "soccer": "soccer", "mlb": "MLB"}
+
+
+def describe_tool(tool: BaseTool) -> str:
+    """Text indexed for a tool: its name, description and argument descriptions."""
+    arg_docs = " ".join(
+        f"{name} {schema.get('description', '')}" for name, schema in tool.args.items()
+    )
+    return f"{tool.name} {tool.description} {arg_docs}"
+
+
+class ToolRetriever:
+    """Selects the tools whose descriptions best match a question."""
+
+    def __init__(self, tools: Sequence[BaseTool], always: Sequence[BaseTool] = ()):
+        """Index ``tools``; ``always`` are appended to every selection."""
+        self.tools = [tool for tool in tools if tool not in always]
+        self.always = list(always)
+        self.index = BM25Index([describe_tool(tool) for tool in self.tools])
+
+    def select(self, query: str, k: int) -> List[BaseTool]:
+        """Top ``k`` tools for ``query`` followed by the always-included ones."""
+        return [self.tools[i] for i in self.index.top_k(query, k)] + self.always
+
+
+class FlatAgent:
+    """A ReAct agent per distinct toolset, compiled once and reused."""
+
+    def __init__(self, sport: str):
+        """Set up the tool retriever and prompt for ``sport``; agents are compiled on demand."""
+        self.sport = sport
+        self.retriever = ToolRetriever(SPORT_TOOLS[sport], always=[tavily_search_tool])
+        self.prompt = FLAT_AGENT_PROMPT.format(sport=SPORT_LABELS[sport])
+        self.model = tiered_model("agent")
+        self._agents: Dict[FrozenSet[str], Any] = {}
+        self._lock = threading.Lock()
+
+    def agent_for(self, tools: List[BaseTool]) -> Any:
+        """Return the compiled agent bound to exactly ``tools``."""
+        key = frozenset(tool.name for tool in tools)
+        with self._lock:
+            agent = self._agents.get(key)
+            if agent is None:
+                agent = self._agents[key] = create_react_agent(
+                    model=self.model,
+                    tools=tools,
+                    name=f"{self.sport}_flat_agent",
+                    prompt=self.prompt,
+                )
+            return agent
+
+    async def __call__(self, state: MessagesState, config: RunnableConfig) -> Dict[str, Any]:
+        """Answer the latest question with a retrieved toolset."""
+        configuration = Configuration.from_runnable_config(config)
+        query = get_message_text(state["messages"][-1])
+        tools = self.retriever.select(query, configuration.flat_tool_k)
+
+        messages = list(state["messages"][:-1]) + [
+            HumanMessage(content=f"{query} Today is: {datetime.now().isoformat()}")
+        ]
+        result = await self.agent_for(tools).ainvoke({"messages": messages}, config)
+        return {"messages": [result["messages"][-1]]}
+
+
+def build_flat_graph(sport: str) -> Any:
+    """Compile the single-node flat graph for ``sport``."""
+    flat_agent = FlatAgent(sport)
+
+    async def flat_agent_node(state: MessagesState, config: RunnableConfig) -> Dict[str, Any]:
+        return await flat_agent(state, config)
+
+    workflow = StateGraph(MessagesState)
+    workflow.add_node("flat_agent", flat_agent_node)
+    workflow.add_edge(START, "flat_agent")
+    workflow.add_edge("flat_agent", END)
+    return workflow.compile(name=f"{sport}_flat")
+
+
+app_nba_flat = build_flat_graph("nba")
+app_soccer_flat = build_flat_graph("soccer")
+app_mlb_flat = build_flat_graph("mlb")
@@ -37,10 +37,12 @@ from app.react_agent.agents import supervisor_node, team_node, game_node, player
 
 # ---------------------------------------------------------------------
 # Disable all logging globally
-logging.disable(logging.CRITICAL)  # Disable all logging below CRITICAL level
+# (set LOG_LEVEL, e.g. LOG_LEVEL=INFO, to keep logging on)
+if not os.getenv("LOG_LEVEL"):
+    logging.disable(logging.CRITICAL)  # Disable all logging below CRITICAL level
 
-# Redirect all logging output to os.devnull
-logging.basicConfig(level=logging.CRITICAL, handlers=[logging.NullHandler()])
+    # Redirect all logging output to os.devnull
+    logging.basicConfig(level=logging.CRITICAL, handlers=[logging.NullHandler()])
 
 # Suppress warnings as well (optional)
 import warnings
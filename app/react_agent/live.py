@@ -0,0 +1,266 @@
+"""Shared live feeds polled in the background.
+
+Live tools used to hit their upstream endpoint on every call, so a busy game
+night meant every session polling the same scoreboard. Instead, each live feed
+(the NBA scoreboard, the soccer ``/fixtures?live=all`` list, an MLB game's
+live feed) gets one ``LivePoller`` per process. It refreshes the feed on a
+fixed cadence in a daemon thread and keeps the latest snapshot in memory; the
+tools read that snapshot, turning N upstream calls into one per interval.
+
+Pollers start on their first read and stop again once nobody has read them
+for ``idle_timeout`` seconds, so quiet feeds cost nothing. A feed can also
+stop refreshing for good once its data is final (e.g. a finished MLB game);
+its last snapshot is still served until the feed goes idle. An idle poller is
+dropped from the registry together with its snapshot, so the per-game feeds
+of a long-running server do not pile up; a later read starts a fresh one.
+
+``SessionCursors`` remembers, per conversation and feed, how far a session
+has read (the last NBA ``actionNumber``, the last MLB ``timecode``), so live
+tools can return only what is new since the session's previous call instead
+of re-sending the whole play-by-play to the model.
+
+Settings come from the environment:
+
+    LIVE_POLL_INTERVAL       seconds between refreshes (15)
+    LIVE_POLL_IDLE_TIMEOUT   stop polling after this many seconds without reads (300)
+"""
+
+import functools
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable
+
+from langchain_core.runnables import RunnableConfig
+
+from app.react_agent.metrics import record_cache
+
+logger = logging.getLogger(__name__)
+
+
+class LiveFeedError(RuntimeError):
+    """Raised when a feed has no snapshot because every fetch so far failed."""
+
+
+@dataclass(frozen=True)
+class LivePollSettings:
+    """Default cadence for the pollers of a registry."""
+
+    interval: float = 15.0
+    idle_timeout: float = 300.0
+
+    @classmethod
+    def from_env(cls) -> "LivePollSettings":
+        """Read the settings from ``LIVE_POLL_*`` environment variables."""
+        return cls(
+            interval=float(os.getenv("LIVE_POLL_INTERVAL", cls.interval)),
+            idle_timeout=float(os.getenv("LIVE_POLL_IDLE_TIMEOUT", cls.idle_timeout)),
+        )
+
+
+class LivePoller:
+    """Keeps an in-memory snapshot of one upstream feed fresh.
+
+    ``fetch`` is called at most once per ``interval`` no matter how many
+    readers there are; concurrent readers that find no usable snapshot wait
+    for a single shared fetch. If a refresh fails, readers keep getting the
+    last good snapshot. ``until`` (optional) marks a snapshot as final: once
+    it returns True the poller stops fetching and the snapshot is served as-is.
+    ``on_idle`` is called once the refresh thread exits for lack of readers.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fetch: Callable[[], Any],
+        interval: float,
+        idle_timeout: float,
+        until: Callable[[Any], bool] | None = None,
+        on_idle: Callable[["LivePoller"], None] | None = None,
+    ):
+        """Create an idle poller; its refresh thread starts on the first read."""
+        self.name = name
+        self.fetch = fetch
+        self.interval = interval
+        self.idle_timeout = idle_timeout
+        self.until = until
+        self.on_idle = on_idle
+        self.data: Any = None
+        self.fetched_at: float | None = None
+        self.error: Exception | None = None
+        self.final = False
+        self._last_read = 0.0
+        self._fetch_lock = threading.Lock()
+        self._thread_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    @property
+    def age(self) -> float:
+        """Seconds since the last successful fetch (infinite if there was none)."""
+        return float("inf") if self.fetched_at is None else time.monotonic() - self.fetched_at
+
+    @property
+    def running(self) -> bool:
+        """Whether the background refresh thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def refresh(self) -> None:
+        """Fetch the feed now and replace the snapshot (errors keep the old one)."""
+        with self._fetch_lock:
+            self._refresh_locked()
+
+    def _refresh_locked(self) -> None:
+        try:
+            data = self.fetch()
+        except Exception as e:
+            self.error = e
+            logger.warning("Live feed %s refresh failed: %s", self.name, e)
+            return
+        self.data = data
+        self.fetched_at = time.monotonic()
+        self.error = None
+        if self.until is not None and self.until(data):
+            # The thread keeps running without fetching until the feed is idle.
+            self.final = True
+
+    def read(self) -> Any:
+        """Return the current snapshot, fetching synchronously if there is no fresh one."""
+        self._last_read = time.monotonic()
+        hit = True
+        if not self.final:
+            self._ensure_running()
+            if self.age > 2 * self.interval:
+                with self._fetch_lock:
+                    # Another reader may have refreshed while we waited for the lock.
+                    if self.age > 2 * self.interval:
+                        hit = False
+                        self._refresh_locked()
+        record_cache("live_feed", hit)
+        if self.fetched_at is None:
+            raise LiveFeedError(f"{self.name}: {self.error}")
+        return self.data
+
+    def _ensure_running(self) -> None:
+        with self._thread_lock:
+            if self.running:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name=f"live-{self.name}", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        idle = False
+        while not self._stop.wait(self.interval):
+            if time.monotonic() - self._last_read > self.idle_timeout:
+                logger.debug("Live feed %s idle, stopping", self.name)
+                idle = True
+                break
+            if not self.final:
+                self.refresh()
+        with self._thread_lock:
+            if self._thread is threading.current_thread():
+                self._thread = None
+        if idle and self.on_idle is not None:
+            self.on_idle(self)
+
+    def stop(self) -> None:
+        """Stop refreshing; the next read restarts the poller."""
+        self._stop.set()
+
+
+class LiveFeeds:
+    """Process-wide registry of live feed pollers, keyed per feed."""
+
+    def __init__(self, settings: LivePollSettings | None = None):
+        """Create an empty registry (``settings`` default to the environment)."""
+        self.settings = settings or LivePollSettings.from_env()
+        self._lock = threading.Lock()
+        self._pollers: Dict[Hashable, LivePoller] = {}
+
+    def poller(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Any],
+        interval: float | None = None,
+        until: Callable[[Any], bool] | None = None,
+    ) -> LivePoller:
+        """Return the poller for ``key``, creating it with ``fetch`` on first use."""
+        with self._lock:
+            poller = self._pollers.get(key)
+            if poller is None:
+                poller = self._pollers[key] = LivePoller(
+                    name="/".join(str(part) for part in key) if isinstance(key, tuple) else str(key),
+                    fetch=fetch,
+                    interval=interval or self.settings.interval,
+                    idle_timeout=self.settings.idle_timeout,
+                    until=until,
+                    on_idle=functools.partial(self._discard, key),
+                )
+            return poller
+
+    def _discard(self, key: Hashable, poller: LivePoller) -> None:
+        with self._lock:
+            # A reader may already have replaced an idle poller with a new one.
+            if self._pollers.get(key) is poller:
+                del self._pollers[key]
+
+    def __len__(self) -> int:
+        """Return the number of registered pollers."""
+        with self._lock:
+            return len(self._pollers)
+
+    def read(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Any],
+        interval: float | None = None,
+        until: Callable[[Any], bool] | None = None,
+    ) -> Any:
+        """Snapshot of the feed ``key`` (see ``LivePoller.read``)."""
+        return self.poller(key, fetch, interval, until).read()
+
+    def stop_all(self) -> None:
+        """Stop every poller (e.g. on application shutdown)."""
+        with self._lock:
+            for poller in self._pollers.values():
+                poller.stop()
+
+
+def session_id(config: RunnableConfig | None) -> str | None:
+    """Return the conversation a tool call belongs to (the LangGraph ``thread_id``)."""
+    return ((config or {}).get("configurable") or {}).get("thread_id")
+
+
+class SessionCursors:
+    """Last position read per (session, feed), bounded to the most recent sessions."""
+
+    def __init__(self, max_entries: int = 10_000):
+        """Keep cursors for at most ``max_entries`` (session, feed) pairs."""
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._cursors: OrderedDict[tuple, Any] = OrderedDict()
+
+    def get(self, session: str | None, feed: Hashable) -> Any:
+        """Return the session's cursor for ``feed``, or None if it has not read it yet."""
+        if session is None:
+            return None
+        with self._lock:
+            return self._cursors.get((session, feed))
+
+    def set(self, session: str | None, feed: Hashable, cursor: Any) -> None:
+        """Record how far the session has read; a no-op outside a session."""
+        if session is None:
+            return
+        with self._lock:
+            self._cursors[(session, feed)] = cursor
+            self._cursors.move_to_end((session, feed))
+            while len(self._cursors) > self.max_entries:
+                self._cursors.popitem(last=False)
+
+
+live_feeds = LiveFeeds()
+session_cursors = SessionCursors()
@@ -0,0 +1,192 @@
+"""Live soccer match state merged per fixture.
+
+The live soccer tools each used to search the team, find its live fixture
+and then fetch stats or events on their own, so asking for both cost six
+API-Football calls. ``LiveMatches`` keeps one merged state per fixture ID
+(teams, score, minute, status, events, statistics) instead:
+
+- score, minute, status and, when the feed carries them, events come from
+  the single shared ``/fixtures?live=all`` poll (see live.py) and are merged
+  into the fixture's state each time that snapshot changes;
+- per-fixture statistics (and events, when ``live=all`` omits them) come
+  from ``/fixtures/statistics`` / ``/fixtures/events`` through per-fixture
+  pollers, fetched only for fixtures someone asks about;
+- a fixture that drops out of the live feed moves to the ``finished`` phase
+  and is kept for ``retention`` seconds, so "what was the final score?"
+  right after the whistle still works.
+
+Team name lookups are cached as well, since team IDs never change. Only
+found IDs are cached: a miss, possibly caused by a transient API error, is
+looked up again on the next call.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+import requests
+
+from app.react_agent.deadline import http_timeout
+from app.react_agent.live import LiveFeeds, live_feeds
+
+API_HOST = "api-football-v1.p.rapidapi.com"
+BASE_URL = f"https://{API_HOST}/v3"
+LIVE_FIXTURES = ("soccer", "fixtures", "live")
+FINISHED_STATUSES = ("FT", "AET", "PEN")
+
+# Fields of a match state that are returned to callers (the rest is bookkeeping)
+MATCH_FIELDS = ("fixture_id", "phase", "league", "teams", "status", "status_short", "minute", "score")
+
+TEAM_ID_CACHE_SIZE = 1024
+_team_ids: "OrderedDict[Tuple[str, str], int]" = OrderedDict()
+_team_ids_lock = threading.Lock()
+
+
+def api_get(api_key: str, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """GET an API-Football endpoint and return its JSON body."""
+    resp = requests.get(
+        f"{BASE_URL}/{path}",
+        headers={
+            "x-rapidapi-host": API_HOST,  # RapidAPI host
+            "x-rapidapi-key": api_key     # RapidAPI key
+        },
+        params=params,
+        timeout=http_timeout(15)
+    )
+    resp.raise_for_status()
+    return resp.json()
+
+
+def fetch_live_fixtures(api_key: str) -> List[Dict[str, Any]]:
+    """All fixtures in progress right now (/fixtures?live=all), across leagues."""
+    return api_get(api_key, "fixtures", {"live": "all"}).get("response", [])
+
+
+def find_team_id(api_key: str, team_name: str) -> int | None:
+    """Team ID of the best /teams?search match for team_name, or None (not cached)."""
+    key = (api_key, team_name)
+    with _team_ids_lock:
+        if key in _team_ids:
+            _team_ids.move_to_end(key)
+            return _team_ids[key]
+    teams = api_get(api_key, "teams", {"search": team_name}).get("response", [])
+    if not teams:
+        return None
+    team_id = teams[0]["team"]["id"]
+    with _team_ids_lock:
+        _team_ids[key] = team_id
+        while len(_team_ids) > TEAM_ID_CACHE_SIZE:
+            _team_ids.popitem(last=False)
+    return team_id
+
+
+def merge_fixture(previous: Dict[str, Any] | None, fixture: Dict[str, Any], now: float) -> Dict[str, Any]:
+    """Fold one live=all fixture into the previous state of that match."""
+    status = fixture["fixture"].get("status", {})
+    league = fixture.get("league", {})
+    match = dict(previous or {"events": None})
+    match.update({
+        "fixture_id": fixture["fixture"]["id"],
+        "phase": "finished" if status.get("short") in FINISHED_STATUSES else "live",
+        "league": {"name": league.get("name"), "country": league.get("country"), "round": league.get("round")},
+        "teams": {
+            side: {"id": fixture["teams"][side]["id"], "name": fixture["teams"][side]["name"]}
+            for side in ("home", "away")
+        },
+        "status": status.get("long"),
+        "status_short": status.get("short"),
+        "minute": status.get("elapsed"),
+        "score": {"home": fixture.get("goals", {}).get("home"), "away": fixture.get("goals", {}).get("away")},
+        "updated_at": now,
+    })
+    if fixture.get("events") is not None:
+        match["events"] = fixture["events"]
+    return match
+
+
+class LiveMatches:
+    """Merged live state for every fixture in the live feed, keyed by fixture ID."""
+
+    def __init__(self, api_key: str | None = None, retention: float = 1800.0, feeds: LiveFeeds = live_feeds):
+        """Track fixtures of ``feeds``; finished ones are kept for ``retention`` seconds."""
+        self._api_key = api_key
+        self.feeds = feeds
+        self.retention = retention
+        self._lock = threading.Lock()
+        self._matches: Dict[int, Dict[str, Any]] = {}
+        self._synced_at: float | None = None
+
+    @property
+    def api_key(self) -> str | None:
+        """API-Football key (read lazily: .env is loaded after this module is imported)."""
+        return self._api_key or os.getenv("RAPID_API_KEY_FOOTBALL")
+
+    def sync(self) -> None:
+        """Merge the shared live=all snapshot if it changed since the last sync."""
+        poller = self.feeds.poller(LIVE_FIXTURES, lambda: fetch_live_fixtures(self.api_key))
+        fixtures = poller.read()
+        with self._lock:
+            if poller.fetched_at == self._synced_at:
+                return
+            self._synced_at = poller.fetched_at
+            now = time.monotonic()
+            live = set()
+            for fixture in fixtures:
+                fixture_id = fixture["fixture"]["id"]
+                live.add(fixture_id)
+                self._matches[fixture_id] = merge_fixture(self._matches.get(fixture_id), fixture, now)
+            for fixture_id, match in list(self._matches.items()):
+                if fixture_id in live:
+                    continue
+                if match["phase"] == "live":
+                    match["phase"] = "finished"
+                elif now - match["updated_at"] > self.retention:
+                    del self._matches[fixture_id]
+
+    def statistics(self, fixture_id: int) -> List[Dict[str, Any]]:
+        """Return the fixture's team statistics from its shared feed."""
+        return self.feeds.read(
+            ("soccer", "statistics", fixture_id),
+            lambda: api_get(self.api_key, "fixtures/statistics", {"fixture": fixture_id}).get("response", [])
+        )
+
+    def events(self, fixture_id: int) -> List[Dict[str, Any]]:
+        """Return the fixture's timeline events from its shared feed."""
+        return self.feeds.read(
+            ("soccer", "events", fixture_id),
+            lambda: api_get(self.api_key, "fixtures/events", {"fixture": fixture_id}).get("response", [])
+        )
+
+    def view(self, match: Dict[str, Any], statistics: bool = False, events: bool = False) -> Dict[str, Any]:
+        """Return the public part of a match state, with the requested details filled in."""
+        result = {field: match[field] for field in MATCH_FIELDS}
+        if events:
+            result["events"] = match["events"] if match["events"] is not None else self.events(match["fixture_id"])
+        if statistics:
+            result["statistics"] = self.statistics(match["fixture_id"])
+        return result
+
+    def match(self, fixture_id: int, statistics: bool = False, events: bool = False) -> Dict[str, Any] | None:
+        """Return the state of one fixture, or None if it is not (or no longer) tracked."""
+        self.sync()
+        with self._lock:
+            match = self._matches.get(int(fixture_id))
+        return None if match is None else self.view(match, statistics, events)
+
+    def for_team(self, team_id: int, statistics: bool = False, events: bool = False) -> Dict[str, Any] | None:
+        """Return the team's live match, else its recently finished one, else None."""
+        self.sync()
+        with self._lock:
+            matches = [
+                match for match in self._matches.values()
+                if team_id in (match["teams"]["home"]["id"], match["teams"]["away"]["id"])
+            ]
+        if not matches:
+            return None
+        match = max(matches, key=lambda m: (m["phase"] == "live", m["updated_at"]))
+        return self.view(match, statistics, events)
+
+
+live_matches = LiveMatches()
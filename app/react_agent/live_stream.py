@@ -0,0 +1,292 @@
+"""Push live score and event deltas to subscribed clients.
+
+Clients used to ask the agent "what's the score now?" over and over, paying
+for the whole multi-LLM pipeline on every refresh. ``LiveGameHub`` instead
+runs one background fetch loop per watched game and fans its output out to
+every subscriber (``/live/{sport}/{game_id}`` in app/main.py streams it as
+server-sent events).
+
+Each loop reads the shared live feeds of the live tools (see live.py), so a
+watched game adds no upstream calls of its own, and reduces them to a
+compact state (score, clock/minute/inning, status) plus a list of events.
+Subscribers get one ``snapshot`` message with the state and recent events,
+then ``delta`` messages carrying only the changed state fields and the new
+events, and an ``end`` message once the game is over. The loop stops when
+its last subscriber leaves.
+"""
+
+import asyncio
+import json
+import logging
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Set, Tuple
+
+from app.react_agent.live import LiveFeedError, live_feeds
+from app.react_agent.live_soccer import live_matches
+from app.react_agent.tools import (
+    MLBGetLiveGameDataTool,
+    NBAFetchPlayByPlayTool,
+    NBAFetchScoreBoardTool,
+)
+
+logger = logging.getLogger(__name__)
+
+# (state, events, final): events carry a stable "id" used to send each one once.
+GameUpdate = Tuple[Dict[str, Any], List[Dict[str, Any]], bool]
+
+RECENT_EVENTS = 10
+HEARTBEAT_SECONDS = 15.0
+QUEUE_SIZE = 100
+
+
+class GameNotLive(LookupError):
+    """The game is not (or no longer) in the sport's live feed."""
+
+
+def valid_game_id(game_id: str) -> bool:
+    """Whether ``game_id`` looks like a game ID of the live feeds (all are numeric)."""
+    return game_id.isdigit()
+
+
+def _numeric_id(game_id: str) -> int:
+    if not valid_game_id(game_id):
+        raise GameNotLive(f"'{game_id}' is not a valid game ID.")
+    return int(game_id)
+
+
+def _side(team: str | None, score: Any) -> Dict[str, Any]:
+    return {"team": team, "score": score}
+
+
+# -------------------------------------------------------------------
+# Per-sport reducers: live tool output -> compact state and events
+# -------------------------------------------------------------------
+def nba_update(game_id: str) -> GameUpdate:
+    """Read an NBA game from the shared scoreboard and its play-by-play."""
+    board = NBAFetchScoreBoardTool().run()
+    if "error" in board:
+        raise LiveFeedError(board["error"])
+    game = next((g for g in board.get("scoreboard", {}).get("games", []) if g.get("gameId") == game_id), None)
+    if game is None:
+        raise GameNotLive(f"NBA game {game_id} is not on today's scoreboard.")
+    home, away = game.get("homeTeam", {}), game.get("awayTeam", {})
+    state = {
+        "status": game.get("gameStatusText"),
+        "period": game.get("period"),
+        "clock": game.get("gameClock"),
+        "home": _side(home.get("teamTricode"), home.get("score")),
+        "away": _side(away.get("teamTricode"), away.get("score")),
+    }
+    pbp = NBAFetchPlayByPlayTool().run(game_id)
+    events = [
+        {
+            "id": action["actionNumber"],
+            "period": action.get("period"),
+            "clock": action.get("clock"),
+            "team": action.get("teamTricode"),
+            "description": action.get("description"),
+            "score": f"{action.get('scoreAway')}-{action.get('scoreHome')}",
+        }
+        for action in pbp.get("game", {}).get("actions", [])
+    ]
+    return state, events, game.get("gameStatus") == 3
+
+
+def mlb_update(game_id: str) -> GameUpdate:
+    """Read an MLB game from its live feed; completed plays are its events."""
+    feed = MLBGetLiveGameDataTool().run_get_live_game_data(_numeric_id(game_id))
+    if "error" in feed:
+        raise LiveFeedError(feed["error"])
+    status = feed.get("gameData", {}).get("status", {})
+    teams = feed.get("gameData", {}).get("teams", {})
+    linescore = feed.get("liveData", {}).get("linescore", {})
+    runs = linescore.get("teams", {})
+    state = {
+        "status": status.get("detailedState"),
+        "inning": linescore.get("currentInning"),
+        "inning_half": linescore.get("inningHalf"),
+        "outs": linescore.get("outs"),
+        "home": _side(teams.get("home", {}).get("abbreviation"), runs.get("home", {}).get("runs")),
+        "away": _side(teams.get("away", {}).get("abbreviation"), runs.get("away", {}).get("runs")),
+    }
+    events = [
+        {
+            "id": play["about"]["atBatIndex"],
+            "inning": play["about"].get("inning"),
+            "inning_half": play["about"].get("halfInning"),
+            "description": play.get("result", {}).get("description"),
+            "score": f"{play.get('result', {}).get('awayScore')}-{play.get('result', {}).get('homeScore')}",
+        }
+        for play in feed.get("liveData", {}).get("plays", {}).get("allPlays", [])
+        if play.get("about", {}).get("isComplete")
+    ]
+    return state, events, status.get("abstractGameState") == "Final"
+
+
+def soccer_update(game_id: str) -> GameUpdate:
+    """Read a soccer fixture from the shared live fixtures list."""
+    match = live_matches.match(_numeric_id(game_id), events=True)
+    if match is None:
+        raise GameNotLive(f"Fixture {game_id} is not live.")
+    state = {
+        "status": match["status_short"],
+        "minute": match["minute"],
+        "home": _side(match["teams"]["home"]["name"], match["score"]["home"]),
+        "away": _side(match["teams"]["away"]["name"], match["score"]["away"]),
+    }
+    events = [
+        {
+            "id": i,
+            "minute": event.get("time", {}).get("elapsed"),
+            "team": event.get("team", {}).get("name"),
+            "type": event.get("type"),
+            "detail": event.get("detail"),
+            "player": event.get("player", {}).get("name"),
+        }
+        for i, event in enumerate(match["events"] or [])
+    ]
+    return state, events, match["phase"] == "finished"
+
+
+LIVE_UPDATES: Dict[str, Callable[[str], GameUpdate]] = {
+    "nba": nba_update,
+    "mlb": mlb_update,
+    "soccer": soccer_update,
+}
+
+
+# -------------------------------------------------------------------
+# One fetch loop per game, fanned out to subscriber queues
+# -------------------------------------------------------------------
+class GameChannel:
+    """The fetch loop and subscribers of one watched game."""
+
+    def __init__(self, key: Tuple[str, str], update: Callable[[str], GameUpdate], interval: float):
+        """Create an idle channel that polls ``update`` every ``interval`` seconds once started."""
+        self.key = key
+        self.update = update
+        self.interval = interval
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.state: Dict[str, Any] | None = None
+        self.seen: Set[Any] = set()
+        self.recent: Deque[Dict[str, Any]] = deque(maxlen=RECENT_EVENTS)
+        self.task: asyncio.Task | None = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the current state and recent events as a ``snapshot`` message."""
+        return {"type": "snapshot", "state": self.state, "events": list(self.recent)}
+
+    def publish(self, message: Dict[str, Any] | None) -> None:
+        """Queue ``message`` for every subscriber (None closes their streams)."""
+        for queue in self.subscribers:
+            if queue.full():
+                # A slow client skips ahead to the current state instead of blocking the loop;
+                # an ``end`` or ``error`` (or the close marker) still follows that state.
+                while not queue.empty():
+                    queue.get_nowait()
+                if self.state is not None:
+                    queue.put_nowait(self.snapshot())
+                    if message is not None and message["type"] in ("snapshot", "delta"):
+                        continue
+            queue.put_nowait(message)
+
+    def apply(self, state: Dict[str, Any], events: List[Dict[str, Any]]) -> Dict[str, Any] | None:
+        """Fold one update into the channel and return the message to publish, if any."""
+        new_events = [event for event in events if event["id"] not in self.seen]
+        self.seen.update(event["id"] for event in new_events)
+        self.recent.extend(new_events)
+        previous, self.state = self.state, state
+        if previous is None:
+            return self.snapshot()
+        changed = {field: value for field, value in state.items() if previous.get(field) != value}
+        if not changed and not new_events:
+            return None
+        return {"type": "delta", "state": changed, "events": new_events}
+
+    async def run(self) -> None:
+        """Poll the game while it has subscribers, until it ends."""
+        game_id = self.key[1]
+        try:
+            while self.subscribers:
+                try:
+                    state, events, final = await asyncio.to_thread(self.update, game_id)
+                except GameNotLive as e:
+                    self.publish({"type": "end", "reason": str(e)})
+                    return
+                except Exception as e:
+                    logger.warning("Live update for %s failed: %s", "/".join(self.key), e)
+                    self.publish({"type": "error", "error": str(e)})
+                else:
+                    message = self.apply(state, events)
+                    if message is not None:
+                        self.publish(message)
+                    if final:
+                        self.publish({"type": "end", "reason": "final"})
+                        return
+                await asyncio.sleep(self.interval)
+        finally:
+            self.publish(None)
+
+
+class LiveGameHub:
+    """Registry of watched games; ``stream`` is what the HTTP endpoint serves."""
+
+    def __init__(self, updates: Dict[str, Callable[[str], GameUpdate]], interval: float | None = None):
+        """Create a hub for the sports in ``updates`` (``interval`` defaults to the live poll interval)."""
+        self.updates = updates
+        self.interval = interval or live_feeds.settings.interval
+        self.channels: Dict[Tuple[str, str], GameChannel] = {}
+
+    def subscribe(self, sport: str, game_id: str) -> Tuple[GameChannel, asyncio.Queue]:
+        """Add a subscriber queue to the game's channel, starting the channel if needed."""
+        key = (sport, game_id)
+        channel = self.channels.get(key)
+        if channel is None or (channel.task is not None and channel.task.done()):
+            channel = self.channels[key] = GameChannel(key, self.updates[sport], self.interval)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        if channel.state is not None:
+            queue.put_nowait(channel.snapshot())
+        channel.subscribers.add(queue)
+        if channel.task is None:
+            channel.task = asyncio.create_task(channel.run())
+            channel.task.add_done_callback(lambda _: self._close(channel))
+        return channel, queue
+
+    def unsubscribe(self, channel: GameChannel, queue: asyncio.Queue) -> None:
+        """Remove a subscriber; the last one to leave stops the channel."""
+        channel.subscribers.discard(queue)
+        if not channel.subscribers and channel.task is not None:
+            channel.task.cancel()
+
+    def _close(self, channel: GameChannel) -> None:
+        if self.channels.get(channel.key) is channel:
+            del self.channels[channel.key]
+
+    async def messages(self, sport: str, game_id: str) -> AsyncIterator[Dict[str, Any] | None]:
+        """Messages for one subscriber; None marks a heartbeat with nothing new."""
+        channel, queue = self.subscribe(sport, game_id)
+        try:
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_SECONDS)
+                except TimeoutError:
+                    yield None
+                    continue
+                if message is None:
+                    return
+                yield message
+                if message["type"] == "end":
+                    return
+        finally:
+            self.unsubscribe(channel, queue)
+
+    async def stream(self, sport: str, game_id: str) -> AsyncIterator[str]:
+        """Yield the subscriber's messages encoded as server-sent events."""
+        async for message in self.messages(sport, game_id):
+            if message is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield f"event: {message['type']}\ndata: {json.dumps(message)}\n\n"
+
+
+live_hub = LiveGameHub(LIVE_UPDATES)
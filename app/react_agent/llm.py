@@ -0,0 +1,265 @@
+"""Shared chat model registry.
+
+Every graph, supervisor and agent gets its chat model from here instead of
+constructing ``ChatOpenAI`` itself. Models are cached per (model, temperature),
+so repeated calls return the same client, and all OpenAI models share one
+pooled HTTP client per process. The pool size doubles as the process-wide cap
+on concurrent LLM requests: once every connection is busy, further requests
+queue in the pool instead of opening new sockets.
+
+Which model a node uses is decided per call: ``tiered_model(tier)`` returns a
+stand-in that resolves to the model named by ``Configuration.<tier>_model``
+in the run's config (see configuration.py for the tiers and their defaults).
+Agents and supervisors compiled at import time therefore still follow
+per-request model choices.
+
+Settings come from the environment so deployments can tune them without code
+changes:
+
+    LLM_DEFAULT_MODEL     provider/model used when no name is given (openai/gpt-4o)
+    LLM_TIMEOUT           per-request timeout in seconds (60)
+    LLM_MAX_RETRIES       retries on transient API errors (2)
+    LLM_MAX_CONCURRENCY   max simultaneous HTTP connections to a provider (16)
+    LLM_SCRIPT            replay a recorded script instead of calling providers
+                          (see scripted_llm.py; unset)
+"""
+
+import asyncio
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterator, List, Tuple
+
+import httpx
+from langchain_core.language_models import BaseChatModel, LanguageModelInput
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import Runnable, RunnableConfig
+from pydantic import PrivateAttr
+
+from app.react_agent.configuration import Configuration
+from app.react_agent.scripted_llm import Script, ScriptedChatModel, script_latency
+from app.react_agent.utils import load_chat_model
+
+
+@dataclass(frozen=True)
+class ModelSettings:
+    """Connection settings shared by every model in a registry."""
+
+    default_model: str = "openai/gpt-4o"
+    timeout: float = 60.0
+    max_retries: int = 2
+    max_concurrency: int = 16
+    script: str | None = None
+
+    @classmethod
+    def from_env(cls) -> "ModelSettings":
+        """Read the settings from ``LLM_*`` environment variables."""
+        return cls(
+            default_model=os.getenv("LLM_DEFAULT_MODEL", cls.default_model),
+            timeout=float(os.getenv("LLM_TIMEOUT", cls.timeout)),
+            max_retries=int(os.getenv("LLM_MAX_RETRIES", cls.max_retries)),
+            max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", cls.max_concurrency)),
+            script=os.getenv("LLM_SCRIPT") or None,
+        )
+
+
+class ModelRegistry:
+    """Builds chat models once and hands out the shared instances."""
+
+    def __init__(self, settings: ModelSettings | None = None):
+        """Use ``settings``, or read them from the environment."""
+        self.settings = settings or ModelSettings.from_env()
+        self._lock = threading.Lock()
+        self._models: Dict[Tuple[str, float | None], BaseChatModel] = {}
+        self._http_clients: Tuple[httpx.Client, httpx.AsyncClient] | None = None
+        self._script: Script | None = None
+        # Bumped whenever the cached models are dropped, so holders of resolved models rebuild them.
+        self.generation = 0
+
+    def get(self, name: str | None = None, temperature: float | None = None) -> BaseChatModel:
+        """Return the shared model for ``provider/model`` (default model if omitted)."""
+        key = (name or self.settings.default_model, temperature)
+        with self._lock:
+            model = self._models.get(key)
+            if model is None:
+                model = self._models[key] = self._build(*key)
+            return model
+
+    def _build(self, name: str, temperature: float | None) -> BaseChatModel:
+        if self.settings.script:
+            if self._script is None:
+                self._script = Script.load(self.settings.script)
+            return ScriptedChatModel(script=self._script, model_name=name, latency=script_latency())
+        kwargs: Dict[str, Any] = {
+            "timeout": self.settings.timeout,
+            "max_retries": self.settings.max_retries,
+        }
+        if temperature is not None:
+            kwargs["temperature"] = temperature
+        if name.split("/", maxsplit=1)[0] == "openai":
+            kwargs["http_client"], kwargs["http_async_client"] = self._openai_http_clients()
+            # Report token usage on streamed responses too (see usage.py)
+            kwargs["stream_usage"] = True
+        return load_chat_model(name, **kwargs)
+
+    def _openai_http_clients(self) -> Tuple[httpx.Client, httpx.AsyncClient]:
+        """Return the pooled sync/async HTTP clients shared by all OpenAI models."""
+        if self._http_clients is None:
+            limits = httpx.Limits(
+                max_connections=self.settings.max_concurrency,
+                max_keepalive_connections=self.settings.max_concurrency,
+            )
+            # No pool timeout: requests over the concurrency cap wait for a free
+            # connection, the per-request timeout still applies once they start.
+            timeout = httpx.Timeout(self.settings.timeout, pool=None)
+            self._http_clients = (
+                httpx.Client(limits=limits, timeout=timeout),
+                httpx.AsyncClient(limits=limits, timeout=timeout),
+            )
+        return self._http_clients
+
+    def _detach(self) -> Tuple[httpx.Client, httpx.AsyncClient] | None:
+        with self._lock:
+            self._models.clear()
+            self._script = None
+            self.generation += 1
+            clients, self._http_clients = self._http_clients, None
+            return clients
+
+    def clear(self) -> None:
+        """Drop cached models and close the shared HTTP clients.
+
+        Inside a running event loop the async client is closed in a background
+        task; use ``aclose`` there to wait for it.
+        """
+        clients = self._detach()
+        if clients is None:
+            return
+        clients[0].close()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            asyncio.run(clients[1].aclose())
+        else:
+            loop.create_task(clients[1].aclose())
+
+    async def aclose(self) -> None:
+        """Drop cached models and close the shared HTTP clients (e.g. on application shutdown)."""
+        clients = self._detach()
+        if clients is not None:
+            clients[0].close()
+            await clients[1].aclose()
+
+
+registry = ModelRegistry()
+
+
+def get_chat_model(name: str | None = None, temperature: float | None = None) -> BaseChatModel:
+    """Return the process-wide shared chat model for ``provider/model``."""
+    return registry.get(name, temperature)
+
+
+class TieredChatModel(BaseChatModel):
+    """Chat model stand-in that picks the concrete model from the run's config.
+
+    ``bind_tools`` and ``with_structured_output`` are recorded and replayed on the
+    resolved model, so the stand-in can be handed to ``create_react_agent`` and
+    ``create_supervisor`` like a regular chat model. It is a ``BaseChatModel``
+    whose ``bind_tools`` takes ``parallel_tool_calls``, so ``create_supervisor``
+    still binds its handoff tools with ``parallel_tool_calls=False``.
+    """
+
+    tier: str
+    temperature: float | None = None
+    operations: Tuple[Tuple[str, Tuple[Any, ...], Dict[str, Any]], ...] = ()
+    _resolved: Dict[str, Runnable] = PrivateAttr(default_factory=dict)
+    _generation: int = PrivateAttr(default=0)
+
+    def __init__(
+        self,
+        tier: str,
+        temperature: float | None = None,
+        operations: Tuple[Tuple[str, Tuple[Any, ...], Dict[str, Any]], ...] = (),
+    ):
+        """Stand in for the ``tier`` model; ``operations`` are replayed on it when resolved."""
+        super().__init__(tier=tier, temperature=temperature, operations=operations)
+
+    @property
+    def _llm_type(self) -> str:
+        return f"tiered-{self.tier}"
+
+    def _with_operation(self, name: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> "TieredChatModel":
+        # Binding tools twice (create_supervisor, then create_react_agent) must not
+        # stack: the later binding wins, as it would on a real chat model. Options
+        # the later call leaves out (parallel_tool_calls) carry over.
+        previous = [op for op in self.operations if op[0] == name]
+        if previous:
+            kwargs = {**previous[-1][2], **kwargs}
+        operations = tuple(op for op in self.operations if op[0] != name)
+        return TieredChatModel(self.tier, self.temperature, operations + ((name, args, kwargs),))
+
+    def bind_tools(
+        self,
+        tools: Any,
+        *,
+        tool_choice: Any | None = None,
+        parallel_tool_calls: bool | None = None,
+        **kwargs: Any,
+    ) -> "TieredChatModel":
+        """Bind tools to whichever model the tier resolves to."""
+        if tool_choice is not None:
+            kwargs["tool_choice"] = tool_choice
+        if parallel_tool_calls is not None:
+            kwargs["parallel_tool_calls"] = parallel_tool_calls
+        return self._with_operation("bind_tools", (tools,), kwargs)
+
+    def with_structured_output(self, schema: Any, **kwargs: Any) -> "TieredChatModel":
+        """Request structured output from whichever model the tier resolves to."""
+        return self._with_operation("with_structured_output", (schema,), kwargs)
+
+    def model_for(self, config: RunnableConfig | None = None) -> str:
+        """Return the ``provider/model`` this tier resolves to under ``config``."""
+        return getattr(Configuration.from_runnable_config(config), f"{self.tier}_model")
+
+    def resolve(self, config: RunnableConfig | None = None) -> Runnable:
+        """Return the shared model for this tier with the recorded operations applied."""
+        name = self.model_for(config)
+        if self._generation != registry.generation:
+            # The registry dropped its models (and closed their HTTP clients) since they were resolved.
+            self._resolved.clear()
+            self._generation = registry.generation
+        runnable = self._resolved.get(name)
+        if runnable is None:
+            runnable = get_chat_model(name, self.temperature)
+            for operation, args, kwargs in self.operations:
+                runnable = getattr(runnable, operation)(*args, **kwargs)
+            self._resolved[name] = runnable
+        return runnable
+
+    # The resolved model runs the call (and its callbacks); these only delegate.
+    def _generate(self, messages: List[BaseMessage], stop: List[str] | None = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        message = self.resolve().invoke(messages, stop=stop, **kwargs)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def invoke(self, input: LanguageModelInput, config: RunnableConfig | None = None, **kwargs: Any) -> BaseMessage:
+        """Invoke the model the tier resolves to under ``config``."""
+        return self.resolve(config).invoke(input, config, **kwargs)
+
+    async def ainvoke(self, input: LanguageModelInput, config: RunnableConfig | None = None, **kwargs: Any) -> BaseMessage:
+        """Invoke the model the tier resolves to under ``config`` asynchronously."""
+        return await self.resolve(config).ainvoke(input, config, **kwargs)
+
+    def stream(self, input: LanguageModelInput, config: RunnableConfig | None = None, **kwargs: Any) -> Iterator[BaseMessage]:
+        """Stream from the model the tier resolves to under ``config``."""
+        yield from self.resolve(config).stream(input, config, **kwargs)
+
+    async def astream(self, input: LanguageModelInput, config: RunnableConfig | None = None, **kwargs: Any) -> AsyncIterator[BaseMessage]:
+        """Stream from the model the tier resolves to under ``config`` asynchronously."""
+        async for chunk in self.resolve(config).astream(input, config, **kwargs):
+            yield chunk
+
+
+def tiered_model(tier: str, temperature: float | None = None) -> TieredChatModel:
+    """Return a model for ``tier`` ("router", "lookup", "agent" or "synthesis")."""
+    return TieredChatModel(tier, temperature)
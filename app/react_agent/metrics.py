@@ -0,0 +1,235 @@
+"""Prometheus metrics for tools and the upstream APIs they call.
+
+``instrument_tool`` wraps a StructuredTool's function and coroutine (or the
+``_run``/``_arun`` of other tool classes) and records, per tool, the call latency, the size of the JSON handed back to the
+model and whether the call failed (an exception, or the ``{"error": ...}``
+dict the tools return instead of raising).
+
+While a tool runs, its name is kept in a context variable, so lower layers
+attribute their own measurements to it without being passed the tool:
+
+- ``instrument_requests`` wraps ``requests.Session.send``, which every HTTP
+  client here goes through (``requests.get``, the OddsAPI session, nba_api,
+  mlbstatsapi), to record latency, status, response bytes and urllib3
+  retries per upstream host;
+- ``record_cache`` counts hits and misses of the in-process caches (live feed
+  pollers, the OddsAPI response cache).
+
+Work outside a tool call (e.g. background pollers) is labelled ``tool="-"``.
+``/metrics`` in app/main.py serves ``render()`` in the Prometheus text format.
+"""
+
+import functools
+import json
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from langchain_core.tools import BaseTool, StructuredTool
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+)
+
+registry = CollectorRegistry()
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+TOOL_LATENCY = Histogram(
+    "tool_latency_seconds", "Wall-clock time of a tool call.", ["tool", "status"],
+    buckets=LATENCY_BUCKETS, registry=registry,
+)
+TOOL_RESULT_BYTES = Histogram(
+    "tool_result_bytes", "Size of a tool's JSON result as handed to the model.", ["tool"],
+    buckets=BYTES_BUCKETS, registry=registry,
+)
+TOOL_CALLS = Counter("tool_calls", "Tool calls by outcome (ok or error).", ["tool", "status"], registry=registry)
+
+UPSTREAM_LATENCY = Histogram(
+    "upstream_request_seconds", "Latency of HTTP requests to upstream APIs.", ["tool", "host"],
+    buckets=LATENCY_BUCKETS, registry=registry,
+)
+UPSTREAM_REQUESTS = Counter(
+    "upstream_requests", "HTTP requests to upstream APIs by status code (or exception name).",
+    ["tool", "host", "status"], registry=registry,
+)
+UPSTREAM_BYTES = Counter(
+    "upstream_response_bytes", "Response body bytes received from upstream APIs.", ["tool", "host"],
+    registry=registry,
+)
+UPSTREAM_RETRIES = Counter(
+    "upstream_retries", "Retried HTTP attempts to upstream APIs.", ["tool", "host"], registry=registry,
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests", "In-process cache lookups by result (hit or miss).", ["tool", "cache", "result"],
+    registry=registry,
+)
+
+current_tool: ContextVar[str] = ContextVar("current_tool", default="-")
+
+
+# -------------------------------------------------------------------
+# Tools
+# -------------------------------------------------------------------
+def result_status(result: Any) -> str:
+    """``error`` for the ``{"error": ...}`` results tools return on failure."""
+    if isinstance(result, dict) and "error" in result:
+        return "error"
+    if isinstance(result, list) and result and all(isinstance(item, dict) and "error" in item for item in result):
+        return "error"
+    return "ok"
+
+
+def result_bytes(result: Any) -> int:
+    """Size of a tool result as the model sees it (JSON for non-strings)."""
+    if isinstance(result, (str, bytes)):
+        return len(result)
+    return len(json.dumps(result, default=str))
+
+
+def _observe(name: str, started: float, result: Any = None, error: bool = False) -> None:
+    status = "error" if error else result_status(result)
+    TOOL_LATENCY.labels(name, status).observe(time.perf_counter() - started)
+    TOOL_CALLS.labels(name, status).inc()
+    if not error:
+        TOOL_RESULT_BYTES.labels(name).observe(result_bytes(result))
+
+
+def _timed(name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+    # functools.wraps keeps the signature and annotations StructuredTool inspects
+    # (e.g. for RunnableConfig injection).
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        token = current_tool.set(name)
+        started = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            _observe(name, started, error=True)
+            raise
+        finally:
+            current_tool.reset(token)
+        _observe(name, started, result)
+        return result
+
+    return wrapper
+
+
+def _timed_async(name: str, coroutine: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(coroutine)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        token = current_tool.set(name)
+        started = time.perf_counter()
+        try:
+            result = await coroutine(*args, **kwargs)
+        except Exception:
+            _observe(name, started, error=True)
+            raise
+        finally:
+            current_tool.reset(token)
+        _observe(name, started, result)
+        return result
+
+    return wrapper
+
+
+def _wrap(tool: BaseTool, attr: str, wrap: Callable[[str, Callable[..., Any]], Callable[..., Any]]) -> None:
+    target = getattr(tool, attr)
+    if target is None or getattr(target, "__instrumented__", False):
+        return
+    wrapped = wrap(tool.name, target)
+    wrapped.__instrumented__ = True
+    # object.__setattr__: BaseTool subclasses are pydantic models without a "_run" field.
+    object.__setattr__(tool, attr, wrapped)
+
+
+def instrument_tool(tool: BaseTool) -> BaseTool:
+    """Instrument ``tool`` in place (so every agent holding it is covered); idempotent."""
+    if isinstance(tool, StructuredTool):
+        if getattr(tool, "func", None) is not None:
+            _wrap(tool, "func", _timed)
+        if getattr(tool, "coroutine", None) is not None:
+            _wrap(tool, "coroutine", _timed_async)
+        return tool
+    # Tool classes such as TavilySearchResults implement _run/_arun themselves. The
+    # default BaseTool._arun runs _run in a thread, so only an own _arun is wrapped.
+    _wrap(tool, "_run", _timed)
+    if type(tool)._arun is not BaseTool._arun:
+        _wrap(tool, "_arun", _timed_async)
+    return tool
+
+
+def instrument_tools(objects: Iterable[Any]) -> int:
+    """Instrument every tool among ``objects`` (e.g. a module's ``globals().values()``)."""
+    tools = [obj for obj in objects if isinstance(obj, BaseTool)]
+    for tool in tools:
+        instrument_tool(tool)
+    return len(tools)
+
+
+# -------------------------------------------------------------------
+# Upstream HTTP and caches
+# -------------------------------------------------------------------
+def _host(url: str) -> str:
+    return urlsplit(url).hostname or "-"
+
+
+def _retries(response: requests.Response) -> int:
+    retries = getattr(getattr(response, "raw", None), "retries", None)
+    return len(getattr(retries, "history", ()) or ())
+
+
+def instrument_requests() -> None:
+    """Record every ``requests`` call per tool and upstream host (idempotent)."""
+    send = requests.Session.send
+    if getattr(send, "__instrumented__", False):
+        return
+
+    @functools.wraps(send)
+    def instrumented_send(session: requests.Session, request: requests.PreparedRequest, **kwargs: Any) -> Any:
+        labels: Tuple[str, str] = (current_tool.get(), _host(request.url))
+        started = time.perf_counter()
+        try:
+            response = send(session, request, **kwargs)
+        except Exception as e:
+            UPSTREAM_LATENCY.labels(*labels).observe(time.perf_counter() - started)
+            UPSTREAM_REQUESTS.labels(*labels, type(e).__name__).inc()
+            raise
+        UPSTREAM_LATENCY.labels(*labels).observe(time.perf_counter() - started)
+        UPSTREAM_REQUESTS.labels(*labels, str(response.status_code)).inc()
+        # Streamed responses have not been read yet; their size is unknown here.
+        if not kwargs.get("stream"):
+            UPSTREAM_BYTES.labels(*labels).inc(len(response.content or b""))
+        retries = _retries(response)
+        if retries:
+            UPSTREAM_RETRIES.labels(*labels).inc(retries)
+        return response
+
+    instrumented_send.__instrumented__ = True
+    requests.Session.send = instrumented_send
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Count a hit or miss of ``cache`` for the tool currently running."""
+    CACHE_REQUESTS.labels(current_tool.get(), cache, "hit" if hit else "miss").inc()
+
+
+def render() -> Tuple[bytes, str]:
+    """Return the metrics in the Prometheus text format, with their content type."""
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def snapshot() -> Dict[str, float]:
+    """Flat ``name{labels}`` -> value view of the samples (handy in tests and logs)."""
+    values = {}
+    for metric in registry.collect():
+        for sample in metric.samples:
+            labels = ",".join(f"{key}={value}" for key, value in sorted(sample.labels.items()))
+            values[f"{sample.name}{{{labels}}}"] = sample.value
+    return values
@@ -55,45 +55,57 @@ from langgraph.prebuilt import ToolNode
 from langchain_openai import ChatOpenAI
 from langgraph_supervisor import create_supervisor
 from langgraph.prebuilt import create_react_agent
-from app.react_agent.tools import team_tools, player_tools, game_info_tools, game_data_tools
-from app.react_agent.prompts import TEAM_PROMPT, PLAYER_PROMPT, GAME_INFO_PROMPT, GAME_DATA_PROMPT, MAIN_SUPERVISOR_PROMPT, GAME_SUPERVISOR_PROMPT
+from app.react_agent.tools import team_tools, player_tools, game_info_tools, game_data_tools, odds_line_scanner, odds_line_movement
+from app.react_agent.prompts import TEAM_PROMPT, PLAYER_PROMPT, GAME_INFO_PROMPT, GAME_DATA_PROMPT, MAIN_SUPERVISOR_PROMPT, GAME_SUPERVISOR_PROMPT, BETTING_ODDS_PROMPT
 from langgraph.graph import StateGraph, START, END
+from app.react_agent.llm import tiered_model
 
-llm = ChatOpenAI(model="gpt-4o")
+# Routing hops and ID/web lookups run on the cheaper tiers, agents that read
+# stats payloads on the large one (see Configuration.*_model).
+router_llm = tiered_model("router")
+lookup_llm = tiered_model("lookup")
+agent_llm = tiered_model("agent")
 
 team_agent = create_react_agent(
-    model=llm,
-    tools=team_tools,
+    model=agent_llm,
+    tools=team_tools + [TEAM_PROMPT.examples_tool],
     name="team_agent",
     prompt= TEAM_PROMPT
 )
 
 player_agent = create_react_agent(
-    model=llm,
-    tools=player_tools,
+    model=agent_llm,
+    tools=player_tools + [PLAYER_PROMPT.examples_tool],
     name="player_agent",
     prompt=PLAYER_PROMPT
 )
 
 game_info_agent = create_react_agent(
-    model=llm,
-    tools=game_info_tools,
+    model=lookup_llm,
+    tools=game_info_tools + [GAME_INFO_PROMPT.examples_tool],
     name="game_info_agent",
     prompt=GAME_INFO_PROMPT
 )
 
 game_data_agent = create_react_agent(
-    model=llm,
-    tools=game_data_tools,
+    model=agent_llm,
+    tools=game_data_tools + [GAME_DATA_PROMPT.examples_tool],
     name="game_data_agent",
     prompt=GAME_DATA_PROMPT
 )
 
+betting_odds_agent = create_react_agent(
+    model=lookup_llm,
+    tools=[odds_line_scanner, odds_line_movement, BETTING_ODDS_PROMPT.examples_tool],
+    name="betting_odds_agent",
+    prompt=BETTING_ODDS_PROMPT
+)
+
 
 # Create supervisor workflow
 mlb_workflow = create_supervisor(
-    [team_agent, player_agent, game_data_agent, game_info_agent],
-    model=llm,
+    [team_agent, player_agent, game_data_agent, game_info_agent, betting_odds_agent],
+    model=router_llm,
     prompt=MAIN_SUPERVISOR_PROMPT
 )
 
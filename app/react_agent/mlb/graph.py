@@ -36,23 +36,26 @@ logging.getLogger('traitlets').setLevel(logging.WARNING)
 # from agents import agent_node, retrieve_node, create_tool_node_with_fallback, 
 from app.react_agent.mlb.agents import team_agent, player_agent, game_data_agent, game_info_agent
 from app.react_agent.prompts import MAIN_SUPERVISOR_PROMPT
+from app.react_agent.llm import tiered_model
 # ---------------------------------------------------------------------
 # Disable all logging globally
-logging.disable(logging.CRITICAL)  # Disable all logging below CRITICAL level
+# (set LOG_LEVEL, e.g. LOG_LEVEL=INFO, to keep logging on)
+if not os.getenv("LOG_LEVEL"):
+    logging.disable(logging.CRITICAL)  # Disable all logging below CRITICAL level
 
-# Redirect all logging output to os.devnull
-logging.basicConfig(level=logging.CRITICAL, handlers=[logging.NullHandler()])
+    # Redirect all logging output to os.devnull
+    logging.basicConfig(level=logging.CRITICAL, handlers=[logging.NullHandler()])
 # Suppress warnings as well (optional)
 import warnings
 warnings.filterwarnings("ignore")
 
 
 
-llm = ChatOpenAI(model="gpt-4o")
+router_llm = tiered_model("router")
 # Create supervisor workflow
 mlb_workflow = create_supervisor(
     [team_agent, player_agent, game_data_agent, game_info_agent],
-    model=llm,
+    model=router_llm,
     prompt=MAIN_SUPERVISOR_PROMPT
 )
 
@@ -64,44 +64,56 @@ from app.react_agent.prompts import (LIVE_GAME_PROMPT, GAME_SCHEDULING_PROMPT, T
 from app.react_agent.prompts import *
 from app.react_agent.tools import *
 from langgraph.graph import StateGraph, START, END
+from app.react_agent.llm import tiered_model
 
-llm = ChatOpenAI(model="gpt-4o")
+# Routing hops and ID/web lookups run on the cheaper tiers, agents that read
+# stats payloads on the large one (see Configuration.*_model).
+router_llm = tiered_model("router")
+lookup_llm = tiered_model("lookup")
+agent_llm = tiered_model("agent")
 
 
 # -------------------------------- GAMES--------------------------------
 live_game_agent = create_react_agent(
-    model=llm,
-    tools=[nba_live_scoreboard, nba_live_boxscore , nba_live_play_by_play],
+    model=agent_llm,
+    tools=[nba_live_scoreboard, nba_live_boxscore , nba_live_play_by_play, LIVE_GAME_PROMPT.examples_tool],
     name="live_game_agent",
     prompt= LIVE_GAME_PROMPT
 )
 
 game_scheduling_agent = create_react_agent(
-    model=llm,
-    tools=[nba_list_todays_games, nba_live_scoreboard, tavily_search_tool],
+    model=lookup_llm,
+    tools=[nba_list_todays_games, nba_live_scoreboard, tavily_search_tool, GAME_SCHEDULING_PROMPT.examples_tool],
     name="game_scheduling_agent",
     prompt=GAME_SCHEDULING_PROMPT
 )
 
 team_game_logs_agent = create_react_agent(
-    model=llm,
-    tools=[nba_team_game_logs, nba_team_game_logs_by_name, nba_fetch_game_results], # add nba_fetch_game_results
+    model=agent_llm,
+    tools=[nba_team_game_logs, nba_team_game_logs_by_name, nba_fetch_game_results, TEAM_GAME_LOGS_PROMPT.examples_tool], # add nba_fetch_game_results
     name="team_game_logs_agent",
     prompt=TEAM_GAME_LOGS_PROMPT
 )
 
 game_online_agent = create_react_agent(
-    model=llm,
-    tools=[tavily_search_tool],
+    model=lookup_llm,
+    tools=[tavily_search_tool, GAME_ONLINE_PROMPT.examples_tool],
     name="game_online_agent",
     prompt=GAME_ONLINE_PROMPT
 )
 
+betting_odds_agent = create_react_agent(
+    model=lookup_llm,
+    tools=[odds_line_scanner, odds_line_movement, BETTING_ODDS_PROMPT.examples_tool],
+    name="betting_odds_agent",
+    prompt=BETTING_ODDS_PROMPT
+)
+
 # Create supervisor for games
 game_supervisor = create_supervisor(
-    [live_game_agent, game_scheduling_agent, team_game_logs_agent, game_online_agent],
+    [live_game_agent, game_scheduling_agent, team_game_logs_agent, game_online_agent, betting_odds_agent],
     supervisor_name = "game_supervisor",
-    model=llm,
+    model=router_llm,
     prompt=GAME_SUPERVISOR_PROMPT
 ).compile(name = "game_supervisor")
 
@@ -109,22 +121,22 @@ game_supervisor = create_supervisor(
 # -------------------------------- PLAYERS--------------------------------
 
 player_info_agent = create_react_agent(
-    model=llm,
-    tools=[nba_search_players, nba_common_player_info, nba_list_active_players],
+    model=lookup_llm,
+    tools=[nba_search_players, nba_common_player_info, nba_list_active_players, PLAYER_INFO_PROMPT.examples_tool],
     name="player_info_agent",
     prompt= PLAYER_INFO_PROMPT
 )
 
 player_stats_agent = create_react_agent(
-    model=llm,
-    tools=[nba_search_players, nba_player_career_stats, nba_player_game_logs],
+    model=agent_llm,
+    tools=[nba_search_players, nba_player_career_stats, nba_player_game_logs, PLAYER_STATS_PROMPT.examples_tool],
     name="player_stats_agent",
     prompt=PLAYER_STATS_PROMPT
 )
 
 player_online_agent = create_react_agent(
-    model=llm,
-    tools=[tavily_search_tool],
+    model=lookup_llm,
+    tools=[tavily_search_tool, PLAYER_ONLINE_PROMPT.examples_tool],
     name="player_online_agent",
     prompt=PLAYER_ONLINE_PROMPT
 )
@@ -133,7 +145,7 @@ player_online_agent = create_react_agent(
 player_supervisor = create_supervisor(
     [player_info_agent, player_stats_agent, player_online_agent],
     supervisor_name = "player_supervisor",
-    model=llm,
+    model=router_llm,
     prompt=PLAYER_SUPERVISOR_PROMPT
 ).compile(name = "player_supervisor")
 
@@ -142,22 +154,22 @@ player_supervisor = create_supervisor(
 
 
 team_game_logs_agent = create_react_agent(
-    model=llm,
-    tools=[nba_team_game_logs, nba_team_game_logs_by_name, nba_fetch_game_results], # add nba_fetch_game_results
+    model=agent_llm,
+    tools=[nba_team_game_logs, nba_team_game_logs_by_name, nba_fetch_game_results, TEAM_GAME_LOGS_PROMPT.examples_tool], # add nba_fetch_game_results
     name="team_game_logs_agent",
     prompt=TEAM_GAME_LOGS_PROMPT
 )
 
 team_stats_agent = create_react_agent(
-    model=llm,
-    tools=[nba_team_standings, nba_team_stats_by_name, nba_all_teams_stats],
+    model=agent_llm,
+    tools=[nba_team_standings, nba_team_stats_by_name, nba_all_teams_stats, TEAM_STATS_PROMPT.examples_tool],
     name="team_stats_agent",
     prompt=TEAM_STATS_PROMPT
 )
 
 team_online_agent = create_react_agent(
-    model=llm,
-    tools=[tavily_search_tool],
+    model=lookup_llm,
+    tools=[tavily_search_tool, TEAM_ONLINE_PROMPT.examples_tool],
     name="team_online_agent",
     prompt=TEAM_ONLINE_PROMPT
 )
@@ -166,7 +178,7 @@ team_online_agent = create_react_agent(
 teams_supervisor = create_supervisor(
     [team_game_logs_agent, team_online_agent, team_stats_agent],
     supervisor_name = "teams_supervisor",
-    model=llm,
+    model=router_llm,
     prompt=TEAM_SUPERVISOR_PROMPT
 ).compile(name = "teams_supervisor")
 
@@ -177,7 +189,7 @@ main_supervisor = create_supervisor(
     [game_supervisor, player_supervisor, teams_supervisor],
     supervisor_name = "main_supervisor",
     # output_mode = "last_message",
-    model=llm,
+    model=router_llm,
     prompt=NBA_SUPERVISOR_PROMPT
 ).compile(name = "main_supervisor")
 
@@ -17,7 +17,7 @@ from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, START, END
 from langgraph.prebuilt import ToolNode
 
-from configuration import Configuration
+from app.react_agent.configuration import Configuration
 from app.react_agent.state import OverallState
 from langgraph.prebuilt import tools_condition
 from langgraph.prebuilt import ToolNode
@@ -38,10 +38,12 @@ from app.react_agent.agents import supervisor_node, team_node, game_node, player
 
 # ---------------------------------------------------------------------
 # Disable all logging globally
-logging.disable(logging.CRITICAL)  # Disable all logging below CRITICAL level
+# (set LOG_LEVEL, e.g. LOG_LEVEL=INFO, to keep logging on)
+if not os.getenv("LOG_LEVEL"):
+    logging.disable(logging.CRITICAL)  # Disable all logging below CRITICAL level
 
-# Redirect all logging output to os.devnull
-logging.basicConfig(level=logging.CRITICAL, handlers=[logging.NullHandler()])
+    # Redirect all logging output to os.devnull
+    logging.basicConfig(level=logging.CRITICAL, handlers=[logging.NullHandler()])
 
 # Suppress warnings as well (optional)
 import warnings
@@ -60,12 +62,16 @@ from langchain_openai import ChatOpenAI
 from langgraph.graph import END, StateGraph
 import operator
 import asyncio
+from app.react_agent.examples import ExampleStore, format_examples
+from app.react_agent.llm import tiered_model
+from app.react_agent.runner import parallel_runner, incremental_runner, synthesize
+from app.react_agent.deadline import run_within
 
 
 # --- AgentState Definition ---
 class AgentState(TypedDict):
     messages: Annotated[Sequence[BaseMessage], operator.add]
-    sub_queries: Optional[List[Dict[str, str]]] = None  # List of dicts: {query, supervisor}
+    sub_queries: List[Dict[str, Any]] | None = None  # List of dicts: {id, query, supervisor, depends_on}
     current_query: Optional[str] = None
     # agent_index: Not needed - we're using supervisor names directly
 
@@ -75,26 +81,43 @@ class AgentState(TypedDict):
 #  TEAM_SUPERVISOR_PROMPT, and NBA_SUPERVISOR_PROMPT from a previous response here.)
 #  For brevity, I am not putting it again.
 
-# --- Helper Functions ---
+# --- split_node examples: retrieved per query (Configuration.few_shot_k) ---
+SPLIT_EXAMPLES = [
+    """User Query: "What's the score of the Lakers game?"
+Output: `{"sub_queries": [{"id": 0, "query": "What's the score of the Lakers game right now?", "supervisor": "game_supervisor", "depends_on": []}]}`""",
+    """User Query: "What's LeBron James' height and current team?"
+Output: `{"sub_queries": [{"id": 0, "query": "What is LeBron James' height?", "supervisor": "player_supervisor", "depends_on": []}, {"id": 1, "query": "What is LeBron James' current team?", "supervisor": "player_supervisor", "depends_on": []}]}`""",
+    """User Query: "Is LeBron James playing tonight? If so, what are his career playoff averages?"
+Output: `{"sub_queries": [{"id": 0, "query": "Is LeBron James playing in tonight's game?", "supervisor": "game_supervisor", "depends_on": []}, {"id": 1, "query": "What are LeBron James' career playoff averages?", "supervisor": "player_supervisor", "depends_on": []}]}`""",
+    """User Query: "Compare the average points per game for LeBron James and Stephen Curry over the last three seasons, and tell me which team had the best record in their conference last season."
+Output: `{"sub_queries": [{"id": 0, "query": "What were LeBron James' average points per game for the last three seasons?", "supervisor": "player_supervisor", "depends_on": []}, {"id": 1, "query": "What were Stephen Curry's average points per game for the last three seasons?", "supervisor": "player_supervisor", "depends_on": []}, {"id": 2, "query": "Which NBA team had the best record in their conference last season?", "supervisor": "teams_supervisor", "depends_on": []}]}`""",
+    """User Query: "Analyze the impact of Draymond Green's defensive presence on the Golden State Warriors' win percentage over the past three seasons.  Also, what is his average blocks per game?"
+Output:  `{"sub_queries": [{"id": 0, "query": "What was the Golden State Warriors' win percentage over the past three seasons?", "supervisor": "teams_supervisor", "depends_on": []}, {"id": 1, "query": "What is Draymond Green's average blocks per game over the past three seasons?", "supervisor": "player_supervisor", "depends_on": []}, {"id": 2, "query": "How does Draymond Green's presence/absence correlate with the Warriors' win percentage over the past three seasons?", "supervisor": "teams_supervisor", "depends_on": []}]}`""",
+    """User Query: "Compare the assist-to-turnover ratio of Chris Paul, Rajon Rondo, and Russell Westbrook over their entire careers, and analyze how their passing styles have evolved."
+Output: `{"sub_queries": [{"id": 0, "query": "What is Chris Paul's career assist-to-turnover ratio?", "supervisor": "player_supervisor", "depends_on": []}, {"id": 1, "query": "What is Rajon Rondo's career assist-to-turnover ratio?", "supervisor": "player_supervisor", "depends_on": []}, {"id": 2, "query": "What is Russell Westbrook's career assist-to-turnover ratio?", "supervisor": "player_supervisor", "depends_on": []}, {"id": 3, "query": "How has Chris Paul's passing style evolved over his career?", "supervisor": "player_supervisor", "depends_on": []}, {"id": 4, "query": "How has Rajon Rondo's passing style evolved over his career?", "supervisor": "player_supervisor", "depends_on": []}, {"id": 5, "query": "How has Russell Westbrook's passing style evolved over his career?", "supervisor": "player_supervisor", "depends_on": []}]}`""",
+    """User Query: "Analyze the effectiveness of different defensive schemes (e.g., switching, hedging, dropping) against pick-and-roll plays involving Stephen Curry and Draymond Green.  Which scheme leads to the lowest points per possession for the opposing team, and how does this vary based on the personnel on the court?"
+Output: `{"sub_queries": [{"id": 0, "query": "What are the different defensive schemes used against pick-and-roll plays involving Stephen Curry and Draymond Green?", "supervisor": "game_supervisor", "depends_on": []}, {"id": 1, "query": "What is the effectiveness (points per possession allowed) of switching defenses against Curry/Green pick-and-rolls?", "supervisor": "game_supervisor", "depends_on": []}, {"id": 2, "query": "What is the effectiveness of hedging defenses against Curry/Green pick-and-rolls?", "supervisor": "game_supervisor", "depends_on": []}, {"id": 3, "query": "What is the effectiveness of dropping defenses against Curry/Green pick-and-rolls?", "supervisor": "game_supervisor", "depends_on": []}, {"id": 4, "query": "How does the effectiveness of different defensive schemes against Curry/Green pick-and-rolls vary based on opposing personnel?", "supervisor": "game_supervisor", "depends_on": []}]}`""",
+]
+split_examples = ExampleStore(SPLIT_EXAMPLES)
 
-async def split_node(state: AgentState) -> Dict[str, List[Dict[str, str]]]:
-    """Splits the user's query into sub-queries and assigns supervisors."""
+# --- split_node schema, prompt and chain (built once per process) ---
 
-    class SubQuery(BaseModel):
-        query: str = Field(..., description="The sub-query text.")
-        supervisor: str = Field(..., description="The name of the assigned supervisor agent ('game_supervisor', 'player_supervisor', or 'teams_supervisor').")
+class SubQuery(BaseModel):
+    """One sub-query of the user's query and the supervisor that answers it."""
 
-    class ParsedOutput(BaseModel):
-        sub_queries: List[SubQuery] = Field(..., description="A list of sub-query dictionaries.  Each dictionary MUST contain a 'query' key (the sub-query) and a 'supervisor' key (the name of the assigned supervisor). The number of sub-queries should be between 1 and 7, inclusive, based on the complexity of the original query.  Simple queries should have fewer sub-queries.")
+    query: str = Field(..., description="The sub-query text.")
+    id: int = Field(..., description="The 0-based position of this sub-query in the list.")
+    supervisor: str = Field(..., description="The name of the assigned supervisor agent ('game_supervisor', 'player_supervisor', or 'teams_supervisor').")
+    depends_on: List[int] = Field(default_factory=list, description="The ids of earlier sub-queries whose answers this sub-query needs. Empty if it can run independently.")
 
+class ParsedOutput(BaseModel):
+    """The structured output of the split chain."""
 
-    llm = ChatOpenAI(model="gpt-4o", temperature=0)
-    llm_with_structure = llm.with_structured_output(ParsedOutput)
+    sub_queries: List[SubQuery] = Field(..., description="A list of sub-query dictionaries.  Each dictionary MUST contain a 'query' key (the sub-query) and a 'supervisor' key (the name of the assigned supervisor). The number of sub-queries should be between 1 and 7, inclusive, based on the complexity of the original query.  Simple queries should have fewer sub-queries.")
 
-    prompt = PromptTemplate(
-        template="""You are an advanced query decomposition and routing assistant for an NBA information system. Your task is to analyze a user's query and break it down into a set of smaller, focused sub-queries, assigning each to the most appropriate supervisor agent.
 
-        **Analyze the user's query:** `{query}`.
+SPLIT_PROMPT = PromptTemplate(
+    template="""You are an advanced query decomposition and routing assistant for an NBA information system. Your task is to analyze a user's query and break it down into a set of smaller, focused sub-queries, assigning each to the most appropriate supervisor agent.
 
         **Determine the optimal number of sub-queries:** Break down the query into *1 to 7* sub-queries, depending on the complexity and scope of the original question.
             *   A simple question requiring information from only one area might only need *one* sub-query.
@@ -124,113 +147,68 @@ async def split_node(state: AgentState) -> Dict[str, List[Dict[str, str]]]:
 
         Return a JSON object with a single key, 'sub_queries'. The value is a list of dictionaries. Each dictionary MUST have the following keys:
 
+        *   `id`: The 0-based position of the sub-query in the list (integer).
         *   `query`: The sub-query text (string).
         *   `supervisor`: The name of the supervisor agent that should handle this sub-query (string). Must be one of: "game_supervisor", "player_supervisor", or "teams_supervisor".
+        *   `depends_on`: The ids of *earlier* sub-queries whose answers are needed to fill in this one (list of integers). Use `[]` when the sub-query can run on its own. When a sub-query uses a placeholder such as "[opponent in the Lakers' next game]", list the sub-query that produces it; the answers are passed along before it runs.
 
         **Key Principles:**
 
         *   **Directness:**  Sub-queries should be as direct and to-the-point as possible.
         *   **Specificity:** Each sub-query must be clearly answerable by *one* of the supervisors.
-        *   **Independence:** Sub-queries should be as independent of each other as possible.
+        *   **Independence:** Sub-queries should be as independent of each other as possible. Only add a `depends_on` entry when a sub-query genuinely cannot be answered without another one's result, since dependent sub-queries wait for their inputs.
         *   **Simplicity:**  Favor fewer sub-queries when possible.  Avoid unnecessary decomposition.
 
         **EXAMPLES:**
 
-        **Example 1 (Simple - Single Supervisor):**
-        User Query: "What's the score of the Lakers game?"
-        Output: `{{"sub_queries": [{{"query": "What's the score of the Lakers game right now?", "supervisor": "game_supervisor"}}]}}`
-
-        **Example 2 (Intermediate - Two Supervisors):**
-        User Query: "What's LeBron James' height and current team?"
-        Output: `{{"sub_queries": [{{"query": "What is LeBron James' height?", "supervisor": "player_supervisor"}}, {{"query": "What is LeBron James' current team?", "supervisor": "player_supervisor"}}]}}`
-
-        **Example 3 (Advanced - Mixed Supervisors - Live and Historical Data):**
-        User Query: "Is LeBron James playing tonight? If so, what are his career playoff averages?"
-        Output: `{{"sub_queries": [{{"query": "Is LeBron James playing in tonight's game?", "supervisor": "game_supervisor"}}, {{"query": "What are LeBron James' career playoff averages?", "supervisor": "player_supervisor"}}]}}`
-        
-        **Example 4 (Advanced - Multiple Supervisors, but still concise):**
-        User Query: "Compare the average points per game for LeBron James and Stephen Curry over the last three seasons, and tell me which team had the best record in their conference last season."
-        Output: `{{"sub_queries": [{{"query": "What were LeBron James' average points per game for the last three seasons?", "supervisor": "player_supervisor"}}, {{"query": "What were Stephen Curry's average points per game for the last three seasons?", "supervisor": "player_supervisor"}}, {{"query": "Which NBA team had the best record in their conference last season?", "supervisor": "teams_supervisor"}}]}}`
-
-        **Example 5 (Advanced - Mixed Supervisors with Analysis):**
-        User Query: "Analyze the impact of Draymond Green's defensive presence on the Golden State Warriors' win percentage over the past three seasons.  Also, what is his average blocks per game?"
-        Output:  `{{"sub_queries": [{{"query": "What was the Golden State Warriors' win percentage over the past three seasons?", "supervisor": "teams_supervisor"}}, {{"query": "What is Draymond Green's average blocks per game over the past three seasons?", "supervisor": "player_supervisor"}}, {{"query": "How does Draymond Green's presence/absence correlate with the Warriors' win percentage over the past three seasons?", "supervisor": "teams_supervisor"}}]}}`
-
-        **Example 6 (Advanced - Statistical Trends and Comparisons):**
-        User Query: "Compare the assist-to-turnover ratio of Chris Paul, Rajon Rondo, and Russell Westbrook over their entire careers, and analyze how their passing styles have evolved."
-        Output: `{{"sub_queries": [{{"query": "What is Chris Paul's career assist-to-turnover ratio?", "supervisor": "player_supervisor"}}, {{"query": "What is Rajon Rondo's career assist-to-turnover ratio?", "supervisor": "player_supervisor"}}, {{"query": "What is Russell Westbrook's career assist-to-turnover ratio?", "supervisor": "player_supervisor"}}, {{"query": "How has Chris Paul's passing style evolved over his career?", "supervisor": "player_supervisor"}}, {{"query": "How has Rajon Rondo's passing style evolved over his career?", "supervisor": "player_supervisor"}}, {{"query": "How has Russell Westbrook's passing style evolved over his career?", "supervisor": "player_supervisor"}}]}}`
-
-        **Example 7 (Advanced - Game Strategy and Outcomes):**
-        User Query: "Analyze the effectiveness of different defensive schemes (e.g., switching, hedging, dropping) against pick-and-roll plays involving Stephen Curry and Draymond Green.  Which scheme leads to the lowest points per possession for the opposing team, and how does this vary based on the personnel on the court?"
-        Output: `{{"sub_queries": [{{"query": "What are the different defensive schemes used against pick-and-roll plays involving Stephen Curry and Draymond Green?", "supervisor": "game_supervisor"}}, {{"query": "What is the effectiveness (points per possession allowed) of switching defenses against Curry/Green pick-and-rolls?", "supervisor": "game_supervisor"}}, {{"query": "What is the effectiveness of hedging defenses against Curry/Green pick-and-rolls?", "supervisor": "game_supervisor"}}, {{"query": "What is the effectiveness of dropping defenses against Curry/Green pick-and-rolls?", "supervisor": "game_supervisor"}}, {{"query": "How does the effectiveness of different defensive schemes against Curry/Green pick-and-rolls vary based on opposing personnel?", "supervisor": "game_supervisor"}}]}}`
-        
-        """,
-        input_variables=["query"]
-    )
-
-    chain = prompt | llm_with_structure
-    query = state["messages"][-1].content
-    structured_output = await chain.ainvoke({"query": query})
-    return {"sub_queries": [sub_query.dict() for sub_query in structured_output.sub_queries]}  # Convert to dict
-
-
+        {examples}
 
-async def run_supervisor(state: AgentState, supervisor_dict: Dict[str, Any]) -> AgentState:
-    """Runs the appropriate supervisor based on the assigned supervisor name."""
-    sub_query_info = state['current_query']
-    sub_query = sub_query_info['query']
-    supervisor_name = sub_query_info['supervisor']
-    current_date = datetime.now().isoformat()
-
-    # --- CRITICAL CHANGE:  Look up the supervisor by NAME ---
-    supervisor = supervisor_dict[supervisor_name]
+        **Analyze the user's query:** `{query}`.
+        """,
+    input_variables=["query", "examples"],
+)
 
-    supervisor_input = {
-        "messages": state["messages"][:1] + [HumanMessage(content=f"{sub_query} Today is: {current_date}")],
-    }
-    response = await supervisor.ainvoke(supervisor_input)
-    return {"messages": [response['messages'][-1]]}
+# The router tier still resolves per request from the run's config.
+split_chain = SPLIT_PROMPT | tiered_model("router", temperature=0).with_structured_output(ParsedOutput)
 
 
-async def parallel_runner(state: AgentState, supervisor_dict: Dict[str, Any]) -> Dict[str, List[BaseMessage]]:
-    """Runs the appropriate supervisors in parallel for each sub-query."""
-    tasks = []
-    for sub_query_info in state["sub_queries"]:
-        # Pass the entire dictionary containing query AND supervisor
-        updated_state = {**state, "current_query": sub_query_info}
-        task = asyncio.create_task(run_supervisor(updated_state, supervisor_dict))
-        tasks.append(task)
+# --- Helper Functions ---
 
-    results = await asyncio.gather(*tasks)
-    all_messages = []
-    for result in results:
-        all_messages.extend(result["messages"])
-    return {"messages": all_messages}
+async def split_node(state: AgentState, config: RunnableConfig) -> Dict[str, List[Dict[str, Any]]]:
+    """Split the user's query into a dependency graph of sub-queries and assign supervisors."""
+    configuration = Configuration.from_runnable_config(config)
+    query = state["messages"][-1].content
+    examples = format_examples(split_examples.search(query, configuration.few_shot_k))
+    structured_output = await run_within(split_chain.ainvoke({"query": query, "examples": examples}, config), config)
+    return {"sub_queries": [sub_query.dict() for sub_query in structured_output.sub_queries]}  # Convert to dict
 
 
 
-async def combine_results(state: AgentState) -> Dict[str, List[BaseMessage]]:
+async def combine_results(state: AgentState, config: RunnableConfig) -> Dict[str, List[BaseMessage]]:
     """Combines results and presents to LLM for final answer."""
     final_results = [msg.content for msg in state["messages"][1:]]
-    combined_results_str = "\n\n".join(final_results)
+    final_answer = await synthesize(state["messages"][0].content, final_results, "NBA", config)
 
-    final_llm = ChatOpenAI(model="gpt-4o", temperature=0)
-    final_prompt = PromptTemplate(
-        template="""You are an expert NBA assistant.
+    new_messages = [state["messages"][0], HumanMessage(content=final_answer)]
+    return {"messages": new_messages}
 
-        Original query: {original_query}
 
-        Sub-query results: {combined_results}
+async def parallel_supervisors(state: AgentState, config: RunnableConfig) -> Dict[str, List[BaseMessage]]:
+    """Run every sub-query through its supervisor on the graph's own event loop."""
+    return await parallel_runner(state, supervisor_dict, config)
 
-        Provide a comprehensive answer.
-        """,
-        input_variables=["original_query", "combined_results"]
-    )
-    final_chain = final_prompt | final_llm
-    final_answer = await final_chain.ainvoke({"original_query": state["messages"][0].content, "combined_results": combined_results_str})
 
-    new_messages = [state["messages"][0], HumanMessage(content=final_answer.content)]
-    return {"messages": new_messages}
+async def incremental_synthesis(state: AgentState, config: RunnableConfig) -> Dict[str, List[BaseMessage]]:
+    """Streams sub-query results and synthesizes within the configured deadline."""
+    return await incremental_runner(state, supervisor_dict, "NBA", config)
+
+
+def route_synthesis(state: AgentState, config: RunnableConfig) -> str:
+    """Pick the fan-out node according to `Configuration.synthesis_mode`."""
+    configuration = Configuration.from_runnable_config(config)
+    if configuration.synthesis_mode == "incremental":
+        return "incremental_synthesis"
+    return "parallel_supervisors"
 
 
 
@@ -241,13 +219,15 @@ supervisor_dict = {
 }
 workflow = StateGraph(AgentState)
 workflow.add_node("split_query", split_node)
-workflow.add_node("parallel_supervisors", lambda state, supervisors=supervisor_dict: asyncio.run(parallel_runner(state, supervisors))) # Changed to dict
+workflow.add_node("parallel_supervisors", parallel_supervisors)
 workflow.add_node("combine_results", combine_results)
+workflow.add_node("incremental_synthesis", incremental_synthesis)
 
 workflow.add_edge(START, "split_query")
-workflow.add_edge("split_query", "parallel_supervisors")
+workflow.add_conditional_edges("split_query", route_synthesis, ["parallel_supervisors", "incremental_synthesis"])
 workflow.add_edge("parallel_supervisors", "combine_results")
 workflow.add_edge("combine_results", END)
+workflow.add_edge("incremental_synthesis", END)
 
 app_nba = workflow.compile()
 
@@ -0,0 +1,180 @@
+"""Local, append-only time series of historical odds snapshots.
+
+``OddsAPI.get_historical_odds`` returns one event snapshot per call and every
+call costs credits. ``OddsHistoryStore`` keeps those snapshots in SQLite, one
+row per price keyed by (sport, event, bookmaker, market, outcome, point,
+timestamp), plus a log of which (event, regions, markets, date) requests have
+already been fetched. ``backfill`` therefore only calls the API for dates it
+has never asked for, and ``line_movement`` answers from disk without touching
+the network. The ``odds_line_movement`` tool backfills the event it is asked
+about over a recent window (see ``recent_timestamps``) before reading, so the
+store fills up with the events users actually ask about.
+
+Rows are only ever inserted (``INSERT OR IGNORE``), never updated. The path
+defaults to ``data/odds_history.sqlite`` (``ODDS_HISTORY_PATH``).
+"""
+
+import os
+import sqlite3
+import threading
+from datetime import UTC, datetime, timedelta
+from typing import Any, Dict, Iterable, List
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS odds (
+    sport TEXT NOT NULL,
+    event_id TEXT NOT NULL,
+    bookmaker TEXT NOT NULL,
+    market TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    point REAL,
+    price REAL NOT NULL,
+    timestamp TEXT NOT NULL,
+    last_update TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS odds_key
+    ON odds (sport, event_id, market, bookmaker, outcome, ifnull(point, ''), timestamp);
+CREATE TABLE IF NOT EXISTS fetches (
+    sport TEXT NOT NULL,
+    event_id TEXT NOT NULL,
+    regions TEXT NOT NULL,
+    markets TEXT NOT NULL,
+    requested TEXT NOT NULL,
+    timestamp TEXT,
+    PRIMARY KEY (sport, event_id, regions, markets, requested)
+);
+"""
+
+
+def iso(moment: datetime) -> str:
+    """Format ``moment`` in The Odds API date format, e.g. ``2024-03-01T18:00:00Z``."""
+    return moment.astimezone(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def timestamps(start: datetime, end: datetime, step: timedelta) -> List[str]:
+    """Evenly spaced request dates from start to end (inclusive)."""
+    result = []
+    moment = start
+    while moment <= end:
+        result.append(iso(moment))
+        moment += step
+    return result
+
+
+def recent_timestamps(end: datetime, window: timedelta, step: timedelta) -> List[str]:
+    """Request dates every ``step`` over the ``window`` before ``end``.
+
+    The dates are aligned to multiples of ``step``, so windows ending at
+    different moments share their dates and ``backfill`` does not fetch them again.
+    """
+    seconds = step.total_seconds()
+    aligned = datetime.fromtimestamp(end.timestamp() // seconds * seconds, UTC)
+    return timestamps(aligned - window, aligned, step)
+
+
+class OddsHistoryStore:
+    """SQLite-backed store of historical odds snapshots."""
+
+    def __init__(self, path: str | None = None):
+        """Open (or create) the store at ``path``, default ``ODDS_HISTORY_PATH``."""
+        self.path = path or os.getenv("ODDS_HISTORY_PATH", "data/odds_history.sqlite")
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._db.close()
+
+    # ------------------------------------------------------------------
+    # Writes (append only)
+    # ------------------------------------------------------------------
+    def append(self, sport: str, snapshot: Dict[str, Any]) -> int:
+        """Insert every price of a get_historical_odds response; returns rows added."""
+        event = snapshot.get("data") or {}
+        timestamp = snapshot.get("timestamp")
+        rows = [
+            (sport, event["id"], bookmaker["key"], market["key"], outcome["name"], outcome.get("point"),
+             outcome["price"], timestamp, market.get("last_update") or bookmaker.get("last_update"))
+            for bookmaker in event.get("bookmakers", [])
+            for market in bookmaker.get("markets", [])
+            for outcome in market.get("outcomes", [])
+        ]
+        with self._lock, self._db:
+            before = self._db.total_changes
+            self._db.executemany("INSERT OR IGNORE INTO odds VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            return self._db.total_changes - before
+
+    def _record_fetch(self, sport: str, event_id: str, regions: str, markets: str,
+                      requested: str, timestamp: str | None) -> None:
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR IGNORE INTO fetches VALUES (?, ?, ?, ?, ?, ?)",
+                (sport, event_id, regions, markets, requested, timestamp),
+            )
+
+    def missing(self, sport: str, event_id: str, regions: str, markets: str, requested: Iterable[str]) -> List[str]:
+        """Return the request dates not fetched yet for this event, regions and markets."""
+        with self._lock:
+            done = {
+                row["requested"] for row in self._db.execute(
+                    "SELECT requested FROM fetches WHERE sport = ? AND event_id = ? AND regions = ? AND markets = ?",
+                    (sport, event_id, regions, markets),
+                )
+            }
+        return [date for date in requested if date not in done]
+
+    def backfill(self, odds_api: Any, sport: str, event_id: str, requested: Iterable[str],
+                 regions: str = "us", markets: str = "h2h") -> Dict[str, int]:
+        """Fetch and store only the snapshots not already in the store.
+
+        Failed requests are not recorded, so a later backfill retries them.
+        """
+        todo = self.missing(sport, event_id, regions, markets, requested)
+        fetched = rows = 0
+        for date in todo:
+            snapshot = odds_api.get_historical_odds(sport, event_id, date, regions, markets)
+            if snapshot is None:
+                continue
+            rows += self.append(sport, snapshot)
+            self._record_fetch(sport, event_id, regions, markets, date, snapshot.get("timestamp"))
+            fetched += 1
+        return {"requested": len(todo), "fetched": fetched, "rows": rows}
+
+    # ------------------------------------------------------------------
+    # Reads (no network)
+    # ------------------------------------------------------------------
+    def line_movement(self, sport: str, event_id: str, market: str, bookmaker: str | None = None,
+                      outcome: str | None = None) -> Dict[str, List[Dict[str, Any]]]:
+        """Price series per "bookmaker|outcome|point", oldest first."""
+        query = "SELECT bookmaker, outcome, point, price, timestamp FROM odds WHERE sport = ? AND event_id = ? AND market = ?"
+        params: List[Any] = [sport, event_id, market]
+        if bookmaker:
+            query += " AND bookmaker = ?"
+            params.append(bookmaker)
+        if outcome:
+            query += " AND outcome = ?"
+            params.append(outcome)
+        query += " ORDER BY bookmaker, outcome, point, timestamp"
+
+        series: Dict[str, List[Dict[str, Any]]] = {}
+        with self._lock:
+            for row in self._db.execute(query, params):
+                key = f"{row['bookmaker']}|{row['outcome']}" + ("" if row["point"] is None else f"|{row['point']:g}")
+                series.setdefault(key, []).append({"timestamp": row["timestamp"], "price": row["price"]})
+        return series
+
+    def events(self, sport: str) -> List[Dict[str, Any]]:
+        """Return the stored events of a sport with their snapshot count and time range."""
+        with self._lock:
+            return [
+                dict(row) for row in self._db.execute(
+                    "SELECT event_id, COUNT(DISTINCT timestamp) AS snapshots, MIN(timestamp) AS first, "
+                    "MAX(timestamp) AS last FROM odds WHERE sport = ? GROUP BY event_id ORDER BY last DESC",
+                    (sport,),
+                )
+            ]
@@ -0,0 +1,160 @@
+"""Prefix-cache-friendly layout for the ReAct agent prompts.
+
+The agent prompts in prompts.py are long system messages: instructions, a tool
+manual and a block of worked examples. Sent as-is, every hop resends the whole
+block, and the conversation was folded into a single human message
+(``("human", "{messages}")``) that changes on every turn, so providers could
+only ever reuse the system prefix.
+
+``AgentPrompt`` lays the same content out for prompt caching:
+
+1. the static instructions (without the examples) as the system message, byte
+   for byte identical on every call;
+2. the conversation as native messages, which only ever grow at the end, so
+   each ReAct turn extends the cached prefix of the previous one;
+3. anything that varies per call last: the ``Configuration.few_shot_k``
+   worked examples most similar to the current question (see examples.py)
+   are attached right after that question, so they stay fixed, and cached,
+   for the rest of the agent's ReAct loop.
+
+The full example list is no longer inlined. Beyond the retrieved ones,
+examples stay available on demand via the agent's ``show_examples`` tool
+(``AgentPrompt.examples_tool``).
+"""
+
+import re
+from typing import Any, Dict, List, Sequence, Tuple
+
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import StructuredTool
+from pydantic import BaseModel, Field
+
+from app.react_agent.configuration import Configuration
+from app.react_agent.examples import ExampleStore, format_examples
+from app.react_agent.metrics import instrument_tool
+from app.react_agent.utils import get_message_text
+
+_EXAMPLES_HEADER = re.compile(r"^EXAMPLE WORKFLOWS:?\s*$", re.MULTILINE)
+_SECTION_RULE = re.compile(r"^-{10,}\s*$", re.MULTILINE)
+_EXAMPLE_START = re.compile(r"^(?:\*\*)?Example \d+", re.MULTILINE)
+
+# The tool list used to be templated into the system message. Tool names and
+# descriptions already reach the model through the bound tool schemas, so the
+# placeholders are replaced by fixed text that never changes between calls.
+_TOOL_PLACEHOLDERS = (
+    ("{tools}", "(The tools bound to this conversation, with their descriptions.)"),
+    ("[{tool_names}]", "the tools bound to this conversation"),
+)
+
+EXAMPLES_POINTER = (
+    "EXAMPLE WORKFLOWS:\n"
+    "Worked examples similar to the current question may be attached right after it. "
+    "Call `show_examples` with a short description of the question to see more of them "
+    "when you are unsure how to proceed.\n"
+)
+
+
+def split_examples(text: str) -> Tuple[str, List[str]]:
+    """Split a system prompt into its instructions and its worked examples.
+
+    The ``EXAMPLE WORKFLOWS:`` section (up to the next ``-----`` rule) is replaced
+    by a short pointer to the ``show_examples`` tool. Prompts without such a
+    section are returned unchanged with no examples.
+    """
+    header = _EXAMPLES_HEADER.search(text)
+    if header is None:
+        return text, []
+    rule = _SECTION_RULE.search(text, header.end())
+    end = rule.start() if rule else len(text)
+    section = text[header.end():end]
+
+    starts = [match.start() for match in _EXAMPLE_START.finditer(section)]
+    examples = [
+        section[start:stop].strip()
+        for start, stop in zip(starts, starts[1:] + [len(section)])
+    ]
+    return text[:header.start()] + EXAMPLES_POINTER + "\n" + text[end:], examples
+
+
+def static_instructions(text: str) -> str:
+    """Replace the templated tool placeholders with fixed text."""
+    for placeholder, replacement in _TOOL_PLACEHOLDERS:
+        text = text.replace(placeholder, replacement)
+    return text
+
+
+class ShowExamplesInput(BaseModel):
+    """Arguments of the ``show_examples`` tool."""
+
+    question: str = Field(..., description="The question you are working on, or a short description of it.")
+    k: int = Field(default=2, description="How many examples to return (1-4).")
+
+
+class AgentPrompt:
+    """A ReAct agent prompt laid out static-first for provider prompt caching.
+
+    Instances are passed as ``prompt=`` to ``create_react_agent``; calling one
+    with the agent state returns the messages sent to the model.
+    """
+
+    def __init__(self, name: str, source: str):
+        """Split ``source`` (a full system prompt) into static instructions and examples."""
+        self.name = name
+        self.source = source
+        instructions, self.examples = split_examples(source)
+        self.instructions = static_instructions(instructions)
+        self.system_message = SystemMessage(content=self.instructions)
+        self.store = ExampleStore(self.examples)
+        self.examples_tool = instrument_tool(StructuredTool(
+            name="show_examples",
+            func=self.show_examples,
+            description=(
+                "Returns worked examples (Thought/Action/Observation traces) similar to "
+                "the given question. Use it when unsure which tool to call or in what order."
+            ),
+            args_schema=ShowExamplesInput,
+        ))
+
+    @classmethod
+    def from_template(cls, name: str, template: ChatPromptTemplate) -> "AgentPrompt":
+        """Build from one of the ``revised_*_prompt`` templates (its system message)."""
+        return cls(name, template.messages[0].content)
+
+    def find_examples(self, question: str, k: int = 2) -> List[str]:
+        """Return the ``k`` worked examples most similar to ``question``."""
+        return self.store.search(question, k)
+
+    def show_examples(self, question: str, k: int = 2) -> Dict[str, Any]:
+        """Tool entry point: similar worked examples, or a note when none match."""
+        examples = self.find_examples(question, max(1, min(k, 4)))
+        if not examples:
+            return {"examples": [], "note": "No similar worked example; follow the instructions above."}
+        return {"examples": examples}
+
+    def messages(self, history: Sequence[BaseMessage], few_shot_k: int = 0) -> List[BaseMessage]:
+        """Build the static system message, the conversation, and ``few_shot_k`` examples.
+
+        The examples follow the latest human message (the question the agent is
+        working on) as a separate reference message.
+        """
+        messages = [self.system_message, *history]
+        if few_shot_k <= 0 or not self.examples:
+            return messages
+        question_at = max((i for i, m in enumerate(messages) if isinstance(m, HumanMessage)), default=None)
+        if question_at is None:
+            return messages
+        examples = self.find_examples(get_message_text(messages[question_at]), few_shot_k)
+        if examples:
+            reference = HumanMessage(content=(
+                "Reference only, not part of the question: worked examples of similar questions.\n\n"
+                + format_examples(examples)
+            ))
+            messages.insert(question_at + 1, reference)
+        return messages
+
+    def __call__(self, state: Dict[str, Any], config: RunnableConfig | None = None) -> List[BaseMessage]:
+        """Return the messages for the agent state, with ``Configuration.few_shot_k`` examples."""
+        configuration = Configuration.from_runnable_config(config)
+        return self.messages(state["messages"], configuration.few_shot_k)
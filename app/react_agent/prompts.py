@@ -2,6 +2,7 @@ from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.runnables import RunnableConfig
 
+from app.react_agent.prompt_layout import AgentPrompt
 from app.react_agent.tools import (team_tools, player_tools,
                                    game_data_tools, game_info_tools)
 from app.react_agent.tools import *  # noqa
@@ -244,11 +245,8 @@ Now, let’s begin!
     ("human", "{messages}")
 ])
 
-# Partial the prompt with tools and tool names
-TEAM_PROMPT = revised_team_prompt.partial(
-    tools="\n".join([f"- {tool.name}: {tool.description}" for tool in team_tools]),
-    tool_names=", ".join([tool.name for tool in team_tools])
-)
+# Static-first layout; examples via the show_examples tool (see prompt_layout.py)
+TEAM_PROMPT = AgentPrompt.from_template("team", revised_team_prompt)
 
 
 
@@ -393,11 +391,8 @@ Now, let’s begin!
     ("human", "{messages}")
 ])
 
-# Partial the prompt with tools and tool names
-PLAYER_PROMPT = revised_player_prompt.partial(
-    tools="\n".join([f"- {tool.name}: {tool.description}" for tool in player_tools]),
-    tool_names=", ".join([tool.name for tool in player_tools])
-)
+# Static-first layout; examples via the show_examples tool (see prompt_layout.py)
+PLAYER_PROMPT = AgentPrompt.from_template("player", revised_player_prompt)
 
 
 
@@ -542,11 +537,8 @@ Now, let’s begin!
     ("human", "{messages}")
 ])
 
-# Partial the prompt with tools and tool names
-GAME_INFO_PROMPT = revised_game_info_prompt.partial(
-    tools="\n".join([f"- {tool.name}: {tool.description}" for tool in game_info_tools]),
-    tool_names=", ".join([tool.name for tool in game_info_tools])
-)
+# Static-first layout; examples via the show_examples tool (see prompt_layout.py)
+GAME_INFO_PROMPT = AgentPrompt.from_template("game_info", revised_game_info_prompt)
 
 
 
@@ -653,6 +645,7 @@ MLB GAME DATA TOOLS AND EXPLANATIONS
    - Usage: Use this tool to retrieve real-time game information.
    - Example: Action Input might be: game_pk: 716463
    - Output: Live game data, including scores and player stats.
+   - Follow-ups: pass `only_new: true` to get only the plays and score changes since your previous call for the same game.
    - Why it's important: Provides real-time updates for ongoing games.
 --------------------------------------------------------------------------------
 
@@ -693,19 +686,17 @@ Now, let’s begin!
     # The actual user query goes here:
     ("human", "{messages}")
 ])
-# Partial the prompt with tools and tool names
-GAME_DATA_PROMPT = revised_game_data_prompt.partial(
-    tools="\n".join([f"- {tool.name}: {tool.description}" for tool in game_data_tools]),
-    tool_names=", ".join([tool.name for tool in game_data_tools])
-)
+# Static-first layout; examples via the show_examples tool (see prompt_layout.py)
+GAME_DATA_PROMPT = AgentPrompt.from_template("game_data", revised_game_data_prompt)
 
 # --------------------------------------------- MAIN SUPERVISOR PROMPTS ---------------------------------------------
 MAIN_SUPERVISOR_PROMPT = """
-You are the main supervisor for the MLB assistant system. Your role is to route user queries to the most appropriate agent based on the nature of the question. You have access to three specialized agents:
+You are the main supervisor for the MLB assistant system. Your role is to route user queries to the most appropriate agent based on the nature of the question. You have access to five specialized agents:
 1. **team_agent**: Handles queries related to MLB teams, their rosters, and general team information.
 2. **player_agent**: Handles queries related to MLB players, their statistics, and background information.
 3. **game_info_agent**: Handles queries related to general game information, such as schedules, venues, and start times.
 4. **game_data_agent**: Handles queries related to live game data, scores, and in-game updates.
+5. **betting_odds_agent**: Handles queries related to betting odds for MLB games, comparing prices across bookmakers.
 
 ### ROUTING GUIDELINES:
 - **Team Queries**: Route to **team_agent** if the question is about:
@@ -731,6 +722,11 @@ You are the main supervisor for the MLB assistant system. Your role is to route
   - Real-time game state or play-by-play details.
   - Example: "What is the score of the Yankees game right now?" or "Show me the live stats for the Dodgers game."
 
+- **Betting Odds Queries**: Route to **betting_odds_agent** if the question is about:
+  - Betting odds, moneylines, run lines or totals for MLB games.
+  - The best price across bookmakers, bookmaker margins, arbitrage opportunities or line movement.
+  - Example: "Who has the best moneyline on the Yankees tonight?" or "Are there any arbitrage bets in MLB today?"
+
 ### FINAL INSTRUCTIONS:
 - Always prioritize accuracy and relevance when routing queries.
 - If the query is ambiguous or unclear, ask the user for clarification.
@@ -821,6 +817,7 @@ NBA LIVE GAME TOOLS AND EXPLANATIONS
    - Usage: Use this *after* obtaining a `game_id` from `nba_live_scoreboard`. Use this to get a chronological record of events in a specific live game.
    - Example: Action Input might be: `game_id: "0022300123"` (replace with a valid `game_id`).
    - Output: A dictionary containing the play-by-play feed for the specified game.
+   - Follow-ups: pass `only_new: true` to get only the actions added since your previous call for the same game.
    - Why it's important:  Provides a detailed, real-time account of game events, but only if you have the `game_id`.
 
 --------------------------------------------------------------------------------
@@ -888,11 +885,8 @@ Now, let’s begin!
     ("human", "{messages}")
 ])
 
-# Partial the prompt with tools and tool names
-LIVE_GAME_PROMPT = revised_live_game_prompt.partial(
-    tools="\n".join([f"- {tool.name}: {tool.description}" for tool in [nba_live_scoreboard, nba_live_boxscore, nba_live_play_by_play]]),
-    tool_names=", ".join([tool.name for tool in [nba_live_scoreboard, nba_live_boxscore, nba_live_play_by_play]])
-)
+# Static-first layout; examples via the show_examples tool (see prompt_layout.py)
+LIVE_GAME_PROMPT = AgentPrompt.from_template("live_game", revised_live_game_prompt)
 
 
 revised_game_scheduling_prompt = ChatPromptTemplate.from_messages([
@@ -1050,11 +1044,8 @@ Now, let’s begin!
     ("human", "{messages}")
 ])
 
-# Partial the prompt with tools and tool names
-GAME_SCHEDULING_PROMPT = revised_game_scheduling_prompt.partial(
-    tools="\n".join([f"- {tool.name}: {tool.description}" for tool in [nba_list_todays_games, nba_live_scoreboard, tavily_search_tool]]),
-    tool_names=", ".join([tool.name for tool in [nba_list_todays_games, nba_live_scoreboard, tavily_search_tool]])
-)
+# Static-first layout; examples via the show_examples tool (see prompt_layout.py)
+GAME_SCHEDULING_PROMPT = AgentPrompt.from_template("game_scheduling", revised_game_scheduling_prompt)
 
 
 revised_team_game_prompt = ChatPromptTemplate.from_messages([
@@ -1244,11 +1235,8 @@ Now, let’s begin!
     ("human", "{messages}")
 ])
 
-# Partial the prompt with tools and tool names
-TEAM_GAME_LOGS_PROMPT = revised_team_game_prompt.partial(
-    tools="\n".join([f"- {tool.name}: {tool.description}" for tool in [nba_team_game_logs, nba_team_game_logs_by_name, nba_fetch_game_results]]),
-    tool_names=", ".join([tool.name for tool in [nba_team_game_logs, nba_team_game_logs_by_name, nba_fetch_game_results]])
-)
+# Static-first layout; examples via the show_examples tool (see prompt_layout.py)
+TEAM_GAME_LOGS_PROMPT = AgentPrompt.from_template("team_game_logs", revised_team_game_prompt)
 
 
 revised_game_online_prompt = ChatPromptTemplate.from_messages([
@@ -1374,20 +1362,18 @@ Now, let’s begin!
     ("human", "{messages}")
 ])
 
-# Partial the prompt with tools and tool names
-GAME_ONLINE_PROMPT = revised_game_online_prompt.partial(
-    tools="\n".join([f"- {tool.name}: {tool.description}" for tool in [tavily_search_tool]]),
-    tool_names=", ".join([tool.name for tool in [tavily_search_tool]])
-)
+# Static-first layout; examples via the show_examples tool (see prompt_layout.py)
+GAME_ONLINE_PROMPT = AgentPrompt.from_template("game_online", revised_game_online_prompt)
 
 
 GAME_SUPERVISOR_PROMPT = """
-You are the main supervisor for the NBA assistant system on questions regarding NBA games, schedules, stats etc. Your role is to route user queries to the most appropriate agent based on the nature of the question.  You have access to four specialized agents:
+You are the main supervisor for the NBA assistant system on questions regarding NBA games, schedules, stats etc. Your role is to route user queries to the most appropriate agent based on the nature of the question.  You have access to five specialized agents:
 
 1.  **live_game_agent**: Handles queries related to *live* or "latest" NBA games, including scores, box scores, and play-by-play information.  This agent is the best choice for questions about games currently in progress.
 2.  **game_scheduling_agent**: Handles queries related to NBA game schedules, including past, present, and future games. This agent can find games on specific dates, or help determine dates like "today" or "yesterday."
 3.  **team_game_logs_agent**: Handles queries related to a specific team's game logs for a given season. This agent can retrieve game results (wins/losses) and other game-specific information for a team.
 4.  **game_online_agent**: Handles general NBA game-related queries by searching the web.  This is a good fallback if the other agents are not suitable.
+5.  **betting_odds_agent**: Handles queries related to betting odds for NBA games, comparing prices across bookmakers: best lines, implied probabilities, bookmaker margins and arbitrage opportunities.
 
 ### ROUTING GUIDELINES:
 - **Live Game Queries**: Route to **live_game_agent** if the question is about:
@@ -1414,6 +1400,11 @@ You are the main supervisor for the NBA assistant system on questions regarding
     -   Is about information not available from the data in other agents.
     -   Example: "Who won the NBA championship in 2020?" or "What are the biggest comebacks in NBA history?"
 
+- **Betting Odds Queries**: Route to **betting_odds_agent** if the question is about:
+    -   Betting odds, moneylines, spreads or totals for NBA games.
+    -   The best price across bookmakers, bookmaker margins, arbitrage opportunities or line movement.
+    -   Example: "Where can I get the best odds on the Celtics tonight?" or "Are there any arbitrage bets in the NBA today?"
+
 ### FINAL INSTRUCTIONS:
 - Always prioritize accuracy and relevance when routing queries.
 - If the query is ambiguous or unclear, ask the user for clarification *before* routing. For example, if a user asks "What's the score of the game?", ask "Which game are you asking about?".
@@ -1423,6 +1414,7 @@ You are the main supervisor for the NBA assistant system on questions regarding
     - `game_scheduling_agent` is for finding games and dates.
     - `team_game_logs_agent` is for team-specific historical game data.
     - `game_online_agent` is for general web searches.
+    - `betting_odds_agent` is for betting odds across bookmakers.
 - Provide a brief explanation of your routing decision if necessary.
 - **If the initially chosen agent cannot adequately answer the query, you are permitted and encouraged to re-route the query to a different agent. Do not give up immediately; try alternative agents before stating that the information cannot be found.**
 - **You MUST provide a definitive answer to the user's question. Do NOT refer the user to external websites like ESPN or NBA.com. Use all available agents and tools within your supervision, including re-routing and the `game_online_agent` for web searches, to find the answer. Only if all internal resources are exhausted should you state that the information cannot be found.**
@@ -1574,11 +1566,8 @@ Now, let’s begin!
     ("human", "{messages}")
 ])
 
-# Partial the prompt with tools and tool names
-PLAYER_INFO_PROMPT = revised_player_info_prompt.partial(
-    tools="\n".join([f"- {tool.name}: {tool.description}" for tool in [nba_search_players, nba_common_player_info, nba_list_active_players]]),
-    tool_names=", ".join([tool.name for tool in [nba_search_players, nba_common_player_info, nba_list_active_players]])
-)
+# Static-first layout; examples via the show_examples tool (see prompt_layout.py)
+PLAYER_INFO_PROMPT = AgentPrompt.from_template("player_info", revised_player_info_prompt)
 
 
 
@@ -1733,11 +1722,8 @@ Now, let’s begin!
     ("human", "{messages}")
 ])
 
-# Partial the prompt with tools and tool names
-PLAYER_STATS_PROMPT = revised_player_stats_prompt.partial(
-    tools="\n".join([f"- {tool.name}: {tool.description}" for tool in [nba_search_players, nba_player_career_stats, nba_player_game_logs]]),
-    tool_names=", ".join([tool.name for tool in [nba_search_players, nba_player_career_stats, nba_player_game_logs]])
-)
+# Static-first layout; examples via the show_examples tool (see prompt_layout.py)
+PLAYER_STATS_PROMPT = AgentPrompt.from_template("player_stats", revised_player_stats_prompt)
 
 
 
@@ -1860,11 +1846,8 @@ Now, let’s begin!
     ("human", "{messages}")
 ])
 
-# Partial the prompt with tools and tool names
-PLAYER_ONLINE_PROMPT = revised_player_online_prompt.partial(
-    tools="\n".join([f"- {tool.name}: {tool.description}" for tool in [tavily_search_tool]]),
-    tool_names=", ".join([tool.name for tool in [tavily_search_tool]])
-)
+# Static-first layout; examples via the show_examples tool (see prompt_layout.py)
+PLAYER_ONLINE_PROMPT = AgentPrompt.from_template("player_online", revised_player_online_prompt)
 
 
 PLAYER_SUPERVISOR_PROMPT = """
@@ -2036,11 +2019,8 @@ Now, let’s begin!
     ("human", "{messages}")
 ])
 
-# Partial the prompt with tools and tool names
-TEAM_SEARCH_PROMPT = revised_team_search_prompt.partial(
-    tools="\n".join([f"- {tool.name}: {tool.description}" for tool in [nba_search_teams, tavily_search_tool]]),
-    tool_names=", ".join([tool.name for tool in [nba_search_teams, tavily_search_tool]])
-)
+# Static-first layout; examples via the show_examples tool (see prompt_layout.py)
+TEAM_SEARCH_PROMPT = AgentPrompt.from_template("team_search", revised_team_search_prompt)
 
 
 
@@ -2210,11 +2190,8 @@ Now, let’s begin!
     ("human", "{messages}")
 ])
 
-# Partial the prompt with tools and tool names
-TEAM_GAME_LOGS_PROMPT = revised_team_game_logs_prompt.partial(
-    tools="\n".join([f"- {tool.name}: {tool.description}" for tool in [nba_team_game_logs, nba_team_game_logs_by_name, nba_search_teams]]),
-    tool_names=", ".join([tool.name for tool in [nba_team_game_logs, nba_team_game_logs_by_name, nba_search_teams]])
-)
+# Static-first layout; examples via the show_examples tool (see prompt_layout.py)
+TEAM_GAME_LOGS_PROMPT = AgentPrompt.from_template("team_game_logs", revised_team_game_logs_prompt)
 
 
 revised_team_stats_prompt = ChatPromptTemplate.from_messages([
@@ -2364,11 +2341,8 @@ Now, let’s begin!
     ("human", "{messages}")
 ])
 
-# Partial the prompt with tools and tool names
-TEAM_STATS_PROMPT = revised_team_stats_prompt.partial(
-    tools="\n".join([f"- {tool.name}: {tool.description}" for tool in [nba_team_standings, nba_team_stats_by_name, nba_all_teams_stats]]),
-    tool_names=", ".join([tool.name for tool in [nba_team_standings, nba_team_stats_by_name, nba_all_teams_stats]])
-)
+# Static-first layout; examples via the show_examples tool (see prompt_layout.py)
+TEAM_STATS_PROMPT = AgentPrompt.from_template("team_stats", revised_team_stats_prompt)
 
 
 revised_team_online_prompt = ChatPromptTemplate.from_messages([
@@ -2494,11 +2468,8 @@ Now, let’s begin!
     ("human", "{messages}")
 ])
 
-# Partial the prompt with tools and tool names
-TEAM_ONLINE_PROMPT  = revised_team_online_prompt.partial(
-    tools="\n".join([f"- {tool.name}: {tool.description}" for tool in [tavily_search_tool]]),
-    tool_names=", ".join([tool.name for tool in [tavily_search_tool]])
-)
+# Static-first layout; examples via the show_examples tool (see prompt_layout.py)
+TEAM_ONLINE_PROMPT = AgentPrompt.from_template("team_online", revised_team_online_prompt)
 
 
 TEAM_SUPERVISOR_PROMPT = """
@@ -2544,7 +2515,7 @@ Now, let’s begin!
 NBA_SUPERVISOR_PROMPT = """
 You are the top-level supervisor for the entire NBA assistant system. Your role is to route user queries to the most appropriate *supervisor* agent based on the general category of the question. You have access to three specialized supervisor agents:
 
-1.  **game_supervisor**: Handles queries related to NBA games, including live games, game schedules, and team game logs. This supervisor manages agents that provide real-time scores, box scores, play-by-play, schedules, and historical game results for specific teams.
+1.  **game_supervisor**: Handles queries related to NBA games, including live games, game schedules, and team game logs. This supervisor manages agents that provide real-time scores, box scores, play-by-play, schedules, historical game results for specific teams, and betting odds across bookmakers.
 
 2.  **player_supervisor**: Handles queries related to NBA players, including biographical information, career statistics, and general player information (obtained via web search). This supervisor manages agents that provide player details, stats, and online information.
 
@@ -2556,6 +2527,7 @@ You are the top-level supervisor for the entire NBA assistant system. Your role
     -   Game schedules (past, present, or future).
     -   Results of specific games (historical data, not live).
     - Team game logs.
+    -   Betting odds for games.
     -   Example: "What's the score of the Lakers game right now?" or "When do the Knicks play next?" or "What was the Warriors' record last season?"
 
 - **Player-Related Queries**: Route to **player_supervisor** if the question is about:
@@ -2573,7 +2545,7 @@ You are the top-level supervisor for the entire NBA assistant system. Your role
 - Always prioritize accuracy and relevance when routing queries.
 - If the query is ambiguous or unclear, ask the user for clarification *before* routing. For example, if a user asks for "information", ask them to clarify.
 - Consider using the strengths of each supervisor:
-    - `game_supervisor` is for all game-related inquiries (live, schedules, and historical team game logs).
+    - `game_supervisor` is for all game-related inquiries (live, schedules, historical team game logs, and betting odds).
     - `player_supervisor` is for all player-related inquiries (biographical, stats, and general web info).
     - `teams_supervisor` is for all general team-related inquiries and team game logs.
 - **If the initially chosen supervisor agent cannot adequately answer the query, you are permitted and encouraged to re-route the query to a different supervisor agent. Do not give up immediately; try alternative supervisor agents before stating that the information cannot be found.**
@@ -2737,11 +2709,8 @@ Now, let’s begin!
     ("human", "{messages}")
 ])
 
-# Partial the prompt with tools and tool names
-LEAGUE_INFO_PROMPT = revised_league_info_prompt.partial(
-    tools="\n".join([f"- {tool.name}: {tool.description}" for tool in [get_league_info, get_all_leagues_id, get_league_id_by_name]]),
-    tool_names=", ".join([tool.name for tool in [get_league_info, get_all_leagues_id, get_league_id_by_name]])
-)
+# Static-first layout; examples via the show_examples tool (see prompt_layout.py)
+LEAGUE_INFO_PROMPT = AgentPrompt.from_template("league_info", revised_league_info_prompt)
 
 
 revised_league_schedule_standings_prompt = ChatPromptTemplate.from_messages([
@@ -2910,11 +2879,8 @@ Now, let’s begin!
     ("human", "{messages}")
 ])
 
-# Partial the prompt with tools and tool names
-LEAGUE_SCHEDULE_STANDINGS_PROMPT = revised_league_schedule_standings_prompt.partial(
-    tools="\n".join([f"- {tool.name}: {tool.description}" for tool in [get_league_id_by_name, get_all_leagues_id, get_standings, get_league_schedule_by_date]]),
-    tool_names=", ".join([tool.name for tool in [get_league_id_by_name, get_all_leagues_id, get_standings, get_league_schedule_by_date]])
-)
+# Static-first layout; examples via the show_examples tool (see prompt_layout.py)
+LEAGUE_SCHEDULE_STANDINGS_PROMPT = AgentPrompt.from_template("league_schedule_standings", revised_league_schedule_standings_prompt)
 
 
 revised_tavily_search_prompt = ChatPromptTemplate.from_messages([
@@ -3055,11 +3021,8 @@ Now, let’s begin!
     ("human", "{messages}")
 ])
 
-# Partial the prompt with tools and tool names
-TAVILY_SEARCH_PROMPT = revised_tavily_search_prompt.partial(
-    tools="\n".join([f"- {tool.name}: {tool.description}" for tool in [tavily_search_tool]]),
-    tool_names=", ".join([tool.name for tool in [tavily_search_tool]])
-)
+# Static-first layout; examples via the show_examples tool (see prompt_layout.py)
+TAVILY_SEARCH_PROMPT = AgentPrompt.from_template("tavily_search", revised_tavily_search_prompt)
 
 
 LEAGUE_SUPERVISOR_PROMPT = """
@@ -3182,6 +3145,13 @@ LIVE MATCH INFORMATION TOOLS AND EXPLANATIONS
     - Output: Returns a timeline of events (e.g., goals, substitutions, cards).
     - Why it's important: Provides a chronological record of key events during a match.
 
+4) get_live_match_details
+    - Description: Retrieves the full live match state in one call: teams, score, minute, status, live statistics and timeline events.
+    - Usage: Use this instead of calling the three tools above one after another when the question needs several of them (e.g., score and stats and goals).
+    - Example: Action Input: [Input for the get_live_match_details tool]
+    - Output: Returns the merged live match state, or a message indicating no live match.
+    - Why it's important: Answers multi-part live questions with a single tool call.
+
 --------------------------------------------------------------------------------
 USER QUERY FORMAT:
 You will receive a user query. Use the step-by-step method (ReAct) to decide if you need to call any of the live match tools. Always reason about the best approach.
@@ -3259,11 +3229,8 @@ Now, let’s begin!
     ("human", "{messages}")
 ])
 
-# Partial the prompt with tools and tool names
-LIVE_MATCH_PROMPT = revised_live_match_prompt.partial(
-    tools="\n".join([f"- {tool.name}: {tool.description}" for tool in [get_live_match_for_team, get_live_stats_for_team, get_live_match_timeline]]),
-    tool_names=", ".join([tool.name for tool in [get_live_match_for_team, get_live_stats_for_team, get_live_match_timeline]])
-)
+# Static-first layout; examples via the show_examples tool (see prompt_layout.py)
+LIVE_MATCH_PROMPT = AgentPrompt.from_template("live_match", revised_live_match_prompt)
 
 
 
@@ -3410,11 +3377,8 @@ Now, let’s begin!
     ("human", "{messages}")
 ])
 
-# Partial the prompt with tools and tool names
-TEAM_FIXTURES_PROMPT = revised_team_fixtures_prompt.partial(
-    tools="\n".join([f"- {tool.name}: {tool.description}" for tool in [get_team_fixtures, get_team_fixtures_by_date_range, get_team_info]]),
-    tool_names=", ".join([tool.name for tool in [get_team_fixtures, get_team_fixtures_by_date_range, get_team_info]])
-)
+# Static-first layout; examples via the show_examples tool (see prompt_layout.py)
+TEAM_FIXTURES_PROMPT = AgentPrompt.from_template("team_fixtures", revised_team_fixtures_prompt)
 
 
 TEAM_SOCCER_SUPERVISOR_PROMPT = """
@@ -3623,11 +3587,8 @@ Now, let’s begin!
     ("human", "{messages}")
 ])
 
-# Partial the prompt with tools and tool names
-PLAYER_ID_STATS_PROMPT = revised_player_id_stats_prompt.partial(
-    tools="\n".join([f"- {tool.name}: {tool.description}" for tool in [get_player_id, get_player_statistics, get_player_profile]]),
-    tool_names=", ".join([tool.name for tool in [get_player_id, get_player_statistics, get_player_profile]])
-)
+# Static-first layout; examples via the show_examples tool (see prompt_layout.py)
+PLAYER_ID_STATS_PROMPT = AgentPrompt.from_template("player_id_stats", revised_player_id_stats_prompt)
 
 
 revised_player_soccer_stats_prompt_2 = ChatPromptTemplate.from_messages([
@@ -3788,11 +3749,8 @@ Now, let’s begin!
     ("human", "{messages}")
 ])
 
-# Partial the prompt with tools and tool names
-PLAYER_SOCCER_STATS_PROMPT_2 = revised_player_soccer_stats_prompt_2.partial(
-    tools="\n".join([f"- {tool.name}: {tool.description}" for tool in [get_player_id, get_league_id_by_name, get_player_statistics_2]]),
-    tool_names=", ".join([tool.name for tool in [get_player_id, get_league_id_by_name, get_player_statistics_2]])
-)
+# Static-first layout; examples via the show_examples tool (see prompt_layout.py)
+PLAYER_SOCCER_STATS_PROMPT_2 = AgentPrompt.from_template("player_soccer_stats", revised_player_soccer_stats_prompt_2)
 
 
 
@@ -4023,15 +3981,12 @@ Now, let’s begin!
     ("human", "{messages}")
 ])
 
-# Partial the prompt with tools and tool names
-FIXTURE_SCHEDULE_PROMPT = revised_fixture_schedule_prompt.partial(
-    tools="\n".join([f"- {tool.name}: {tool.description}" for tool in [get_league_schedule_by_date, get_multiple_fixtures_stats, tavily_search_tool]]),
-    tool_names=", ".join([tool.name for tool in [get_league_schedule_by_date, get_multiple_fixtures_stats, tavily_search_tool]])
-)
+# Static-first layout; examples via the show_examples tool (see prompt_layout.py)
+FIXTURE_SCHEDULE_PROMPT = AgentPrompt.from_template("fixture_schedule", revised_fixture_schedule_prompt)
 
 
 FIXTURE_SUPERVISOR_PROMPT = """
-You are the main supervisor for the soccer fixture and live match information system. Your role is to intelligently route user queries to the most appropriate agent, and to *persistently* seek a complete answer by combining information from multiple agents if necessary. You have access to four specialized agents:
+You are the main supervisor for the soccer fixture and live match information system. Your role is to intelligently route user queries to the most appropriate agent, and to *persistently* seek a complete answer by combining information from multiple agents if necessary. You have access to five specialized agents:
 
 1.  **live_match_agent**: Handles queries related to *live* soccer matches. This agent can check if a team is currently playing, retrieve live in-game statistics, and provide a real-time timeline of match events (goals, substitutions, cards, etc.). This agent *only* provides information for matches that are *currently in progress*.
 
@@ -4041,6 +3996,8 @@ You are the main supervisor for the soccer fixture and live match information sy
 
 4.  **tavily_search_agent**: Handles general soccer-related queries by searching the web. This agent is best used for questions requiring up-to-date information (like news and very recent results), information not covered by the other agents (opinions, analysis), or as a complement to the other agents to provide additional context and ensure a comprehensive answer.
 
+5.  **betting_odds_agent**: Handles queries related to betting odds for soccer matches. This agent compares prices across bookmakers for a competition (e.g. the Premier League or the Champions League): best lines, implied probabilities, bookmaker margins and arbitrage opportunities.
+
 ROUTING GUIDELINES:
 
 - **Initial Routing**: Analyze the user's query to determine the *primary* type of information requested.
@@ -4064,8 +4021,12 @@ ROUTING GUIDELINES:
         -   Example: "What's the latest news on the Champions League?"
         -   Example: "What are analysts saying about the recent Premier League results?"
 
+    -   **Betting Odds**: If the question asks about betting odds, the best price across bookmakers, bookmaker margins, arbitrage opportunities or line movement, route to `betting_odds_agent`.
+        -   Example: "Who offers the best odds on Arsenal this weekend?"
+        -   Example: "Are there any arbitrage bets in the Champions League?"
+
 - **Iterative Routing and Persistence**: This is the *core* of your role.
-    -   **Mandatory Initial Routing**: You *MUST* initially route *every* user query to one of the four agents.
+    -   **Mandatory Initial Routing**: You *MUST* initially route *every* user query to one of the five agents.
     -   **Mandatory Re-routing**: If the first agent cannot *fully and completely* answer the question, you *MUST* re-route to a different agent. Do *NOT* give up.
     -   **Sequential Routing**: You are *expected* to route to multiple agents sequentially. Common patterns include:
         *   `team_fixtures_agent` -> `tavily_search_agent`: Get team fixtures, then supplement with news/analysis.
@@ -4118,7 +4079,8 @@ You are the top-level supervisor for a comprehensive soccer information system,
     *   Find specific fixture IDs based on various criteria (teams, dates, leagues).
     *   Access *detailed* statistics for individual matches (shots, possession, passing accuracy, fouls, cards, etc.).
     *   Compare the performance of teams within a specific fixture, identifying key statistical differences.
-    *   The Fixture Supervisor can make calls to *live_match_agent*, *fixture_schedule_agent*, *team_fixtures_agent* and *tavily_search_agent*
+    *   Compare betting odds for upcoming and live matches across bookmakers.
+    *   The Fixture Supervisor can make calls to *live_match_agent*, *fixture_schedule_agent*, *team_fixtures_agent*, *tavily_search_agent* and *betting_odds_agent*
 
 ROUTING GUIDELINES:
 
@@ -4161,3 +4123,114 @@ FINAL INSTRUCTIONS:
 
 Now, let’s begin!
 """
+
+
+
+# ---------------------------------------------------------------------------------------------------------------------------
+# ------------------------------------------------------------------ BETTING ODDS PROMPT ------------------------------------
+# Shared by the betting_odds_agent of every sport; the sport is picked through the tools' sport_key.
+revised_betting_odds_prompt = ChatPromptTemplate.from_messages([
+    SystemMessage(content="""You are a helpful sports betting assistant who answers user questions about betting odds for NBA, MLB and soccer events: the best available price per outcome across bookmakers, implied probabilities, bookmaker margins (overround), arbitrage opportunities and how lines moved over time.
+
+CORE AGENT INSTRUCTIONS:
+1. ALWAYS follow the React (Reasoning and Acting) paradigm.
+2. For EACH task, you must:
+   a) REASON about the problem.
+   b) DETERMINE which TOOL to use.
+   c) Take ACTION using the selected tool.
+   d) OBSERVE the results.
+   e) REFLECT and decide next steps.
+
+AVAILABLE TOOLS:
+{tools}
+
+TOOL USAGE PROTOCOL:
+- You have access to the following tools: [{tool_names}]
+- BEFORE using any tool, EXPLICITLY state:
+  1. WHY you are using this tool.
+  2. WHAT specific information you hope to retrieve.
+  3. HOW this information will help solve the task.
+
+CRITICAL RULES:
+- NEVER fabricate odds, prices or bookmakers. Report only what the tools return.
+- Always pass the Odds API sport key of the sport in question: 'basketball_nba', 'baseball_mlb', or a soccer key such as 'soccer_epl' or 'soccer_uefa_champs_league'.
+- Prices are American odds. State the bookmaker offering each best price.
+- Odds change constantly; say that the figures are a snapshot at the time of the request.
+
+--------------------------------------------------------------------------------
+BETTING ODDS TOOLS AND EXPLANATION
+
+1) odds_line_scanner
+   - Description: Compares the odds of every upcoming or live event of a sport across all bookmakers in one call.
+   - Usage: Best lines, implied probabilities, bookmaker margins and arbitrage opportunities. Use `markets` ('h2h', 'spreads', 'totals') for the bet type and `arbitrage_only` to keep only arbitrage lines.
+   - Example: Action Input: `sport_key: "basketball_nba", markets: "h2h"`
+   - Output: One entry per event and market with the best price and bookmaker per outcome, implied probabilities, overround and arbitrage flag.
+
+2) odds_line_movement
+   - Description: Shows how an event's lines moved over the last day (or the day before kick-off). Historical snapshots not stored locally yet are fetched first.
+   - Usage: Line movement questions ("did the line move?", "what did it open at?"). Get the event ID from `odds_line_scanner` (or, without `event_id`, list the events that already have stored history), then call it with the event ID.
+   - Example: Action Input: `sport_key: "basketball_nba", event_id: "<event ID>", market: "h2h"`
+   - Output: A price series per bookmaker and outcome, or a message when no history could be found.
+
+--------------------------------------------------------------------------------
+EXAMPLE WORKFLOWS:
+
+Example 1 — Best Line:
+
+Question: "Where can I get the best moneyline on the Lakers tonight?"
+Thought: I need the Lakers' moneyline across bookmakers. I'll scan the NBA head-to-head market.
+Action: odds_line_scanner
+Action Input: `sport_key: "basketball_nba", markets: "h2h"`
+Observation: [Lines for every NBA event, including the Lakers game with the best price and bookmaker per outcome.]
+Reflection: I found the Lakers game and the best Lakers price.
+Final Answer: [The best Lakers moneyline, the bookmaker offering it and its implied probability.]
+
+Example 2 — Arbitrage:
+
+Question: "Are there any arbitrage opportunities in the Premier League right now?"
+Thought: I'll scan the EPL head-to-head market for arbitrage lines only.
+Action: odds_line_scanner
+Action Input: `sport_key: "soccer_epl", markets: "h2h", arbitrage_only: true`
+Observation: [Zero or more lines whose best prices add up to an implied probability below 100%.]
+Reflection: I can list the arbitrage lines, or say that there are none.
+Final Answer: [Each arbitrage line with its prices, bookmakers and margin, or a note that none were found.]
+
+Example 3 — Line Movement:
+
+Question: "How has the line on the Yankees game moved today?"
+Thought: I need the event ID of the Yankees game first. I'll scan the MLB head-to-head market.
+Action: odds_line_scanner
+Action Input: `sport_key: "baseball_mlb", markets: "h2h"`
+Observation: [Lines for every MLB event, including the Yankees game and its event ID.]
+Reflection: I have the event ID. Now I'll fetch its head-to-head series.
+Action: odds_line_movement
+Action Input: `sport_key: "baseball_mlb", event_id: "<Yankees event ID>", market: "h2h"`
+Observation: [Price series per bookmaker for both teams.]
+Reflection: I can compare the opening and latest prices.
+Final Answer: [The opening and latest prices per bookmaker and how far the line moved.]
+
+--------------------------------------------------------------------------------
+FINAL INSTRUCTIONS:
+- Answer with the best prices, the bookmakers offering them and the margins you retrieved.
+- Always follow the React structure: Thought → Action → Action Input → Observation → Reflection → Final Answer.
+Now, let’s begin!
+"""),
+    MessagesPlaceholder(variable_name="chat_history", optional=True),
+    ("human", "{messages}")
+])
+
+# Static-first layout; examples via the show_examples tool (see prompt_layout.py)
+BETTING_ODDS_PROMPT = AgentPrompt.from_template("betting_odds", revised_betting_odds_prompt)
+
+
+# ---------------------------------------------------------------------------------------------------------------------------
+# ------------------------------------------------------------------ FLAT AGENT PROMPT --------------------------------------
+# Used by the flat single-agent mode (flat.py). The tools are picked per question, so the prompt does not list them.
+FLAT_AGENT_PROMPT = """You are an expert {sport} assistant with direct access to {sport} data tools.
+
+- Call the tools you have been given to look up IDs, schedules, live data and statistics; never guess numbers.
+- Resolve names to IDs first when a tool needs an ID, then fetch the data.
+- Use the web search tool only when the data tools cannot answer the question.
+- When the data is incomplete, say what is missing instead of making it up.
+- Finish with a clear, concise answer that cites the figures you retrieved.
+"""
@@ -0,0 +1,71 @@
+"""Small in-process lexical retrieval.
+
+Used to pick the tools and prompt examples that are relevant to a question
+without calling an embedding API. The corpora involved (a few dozen tool
+descriptions, a few hundred examples) are tiny, so a plain BM25 index built
+at import time is both fast and dependency-free.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import List, Sequence
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset(
+    "a an and are as at be by can do does for from get how i in is it me of on or "
+    "s that the their them this to was what when where which who will with you your".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case word tokens with stopwords removed (underscores split words)."""
+    return [token for token in _TOKEN.findall(text.lower()) if token not in STOPWORDS]
+
+
+class BM25Index:
+    """Okapi BM25 over a fixed list of documents."""
+
+    def __init__(self, documents: Sequence[str], k1: float = 1.5, b: float = 0.75):
+        """Index ``documents`` with the BM25 parameters ``k1`` and ``b``."""
+        self.k1 = k1
+        self.b = b
+        self.term_counts = [Counter(tokenize(document)) for document in documents]
+        self.lengths = [sum(counts.values()) for counts in self.term_counts]
+        self.avg_length = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+        document_frequency: Counter = Counter()
+        for counts in self.term_counts:
+            document_frequency.update(counts.keys())
+        total = len(self.term_counts)
+        self.idf = {
+            term: math.log(1 + (total - freq + 0.5) / (freq + 0.5))
+            for term, freq in document_frequency.items()
+        }
+
+    def __len__(self) -> int:
+        """Return the number of indexed documents."""
+        return len(self.term_counts)
+
+    def scores(self, query: str) -> List[float]:
+        """BM25 score of every document for ``query``."""
+        terms = tokenize(query)
+        scores = []
+        for counts, length in zip(self.term_counts, self.lengths):
+            score = 0.0
+            norm = self.k1 * (1 - self.b + self.b * length / (self.avg_length or 1.0))
+            for term in terms:
+                freq = counts.get(term)
+                if freq:
+                    score += self.idf[term] * freq * (self.k1 + 1) / (freq + norm)
+            scores.append(score)
+        return scores
+
+    def top_k(self, query: str, k: int) -> List[int]:
+        """Return the indices of the ``k`` best matching documents, best first.
+
+        Documents that share no term with the query are never returned.
+        """
+        scores = self.scores(query)
+        ranked = sorted(range(len(scores)), key=lambda i: (-scores[i], i))
+        return [i for i in ranked[:k] if scores[i] > 0]
@@ -0,0 +1,307 @@
+"""Shared execution helpers for the split -> supervisors -> combine sport graphs.
+
+The NBA and soccer graphs both decompose a question into sub-queries, hand each
+sub-query to a supervisor and synthesize a final answer from the results. The
+helpers in this module hold the parts of that pipeline that do not depend on the
+sport, so both graphs run (and stream) sub-queries the same way.
+
+Every step honors the request deadline in the config (see deadline.py): LLM
+and supervisor calls are bounded by the remaining budget, and supervisor tasks
+still outstanding when a runner exits, for any reason, are cancelled and
+awaited before it returns.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+from langchain_core.callbacks.manager import adispatch_custom_event
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.prompts import PromptTemplate
+from langchain_core.runnables import RunnableConfig
+
+from app.react_agent.configuration import Configuration
+from app.react_agent.deadline import check_deadline, remaining, run_within
+from app.react_agent.llm import tiered_model
+from app.react_agent.usage import sub_agent_scope
+
+# ---------------------------------------------------------------------
+# 1) Running supervisors
+# ---------------------------------------------------------------------
+
+async def run_supervisor(state: Dict[str, Any], supervisor_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """Run the appropriate supervisor based on the assigned supervisor name."""
+    sub_query_info = state['current_query']
+    sub_query = sub_query_info['query']
+    supervisor_name = sub_query_info['supervisor']
+    current_date = datetime.now().isoformat()
+
+    # --- CRITICAL CHANGE:  Look up the supervisor by NAME ---
+    supervisor = supervisor_dict[supervisor_name]
+
+    supervisor_input = {
+        "messages": state["messages"][:1] + [HumanMessage(content=f"{sub_query} Today is: {current_date}")],
+    }
+    with sub_agent_scope(supervisor_name):
+        response = await run_within(supervisor.ainvoke(supervisor_input))
+    return {"messages": [response['messages'][-1]]}
+
+
+def normalize_sub_queries(sub_queries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Give every sub-query an ``id`` and a ``depends_on`` list that only points backwards.
+
+    Sub-queries produced before dependencies existed (no ``id``/``depends_on``) become
+    independent nodes. Dependencies on unknown or later ids are dropped, which keeps
+    the graph acyclic so the scheduler can never deadlock.
+    """
+    normalized = []
+    known_ids = set()
+    for index, sub_query_info in enumerate(sub_queries):
+        sub_query_id = sub_query_info.get("id", index)
+        if sub_query_id in known_ids:
+            sub_query_id = index
+        depends_on = [dep for dep in sub_query_info.get("depends_on") or [] if dep in known_ids]
+        normalized.append({**sub_query_info, "id": sub_query_id, "depends_on": depends_on})
+        known_ids.add(sub_query_id)
+    return normalized
+
+
+def _task_message(task: "asyncio.Task[Dict[str, Any]]", sub_query_info: Dict[str, Any]) -> BaseMessage:
+    """Extract the answer message from a finished supervisor task."""
+    if task.cancelled():
+        return AIMessage(content=f"[No result: '{sub_query_info['query']}' was cancelled.]")
+    error = task.exception()
+    if error is not None:
+        return AIMessage(content=f"[No result: '{sub_query_info['query']}' failed with {type(error).__name__}: {error}]")
+    return task.result()["messages"][-1]
+
+
+class SubQueryScheduler:
+    """Runs sub-queries as a dependency graph.
+
+    Every sub-query whose dependencies have answered is started immediately, so
+    independent sub-queries still run in parallel while dependent ones wait for
+    their inputs. The answers of a sub-query's dependencies are appended to its
+    prompt, letting the supervisor resolve placeholders such as
+    "[opponent 1 from Arsenal's fixtures]".
+    """
+
+    def __init__(self, state: Dict[str, Any], supervisor_dict: Dict[str, Any]):
+        """Schedule the sub-queries of ``state`` on the supervisors of ``supervisor_dict``."""
+        self.state = state
+        self.supervisor_dict = supervisor_dict
+        self.sub_queries = normalize_sub_queries(state["sub_queries"])
+        self.results: Dict[Any, BaseMessage] = {}
+        self.running: Dict[asyncio.Task[Dict[str, Any]], Dict[str, Any]] = {}
+        self.waiting: List[Dict[str, Any]] = list(self.sub_queries)
+        self.cancelled: List[asyncio.Task[Dict[str, Any]]] = []
+
+    @property
+    def done(self) -> bool:
+        """Whether every sub-query has produced a result."""
+        return not self.running and not self.waiting
+
+    def unfinished(self) -> List[Dict[str, Any]]:
+        """Sub-queries that are still running or have not started yet."""
+        return list(self.running.values()) + self.waiting
+
+    def _with_context(self, sub_query_info: Dict[str, Any]) -> str:
+        """Append the answers of a sub-query's dependencies to its text."""
+        if not sub_query_info["depends_on"]:
+            return sub_query_info["query"]
+        by_id = {info["id"]: info for info in self.sub_queries}
+        context = "\n".join(
+            f"- {by_id[dep]['query']}\n  {self.results[dep].content}"
+            for dep in sub_query_info["depends_on"]
+        )
+        return (
+            f"{sub_query_info['query']}\n\n"
+            f"Use these answers to earlier questions to fill in any placeholders:\n{context}\n\n"
+        )
+
+    def start_ready(self) -> None:
+        """Start every waiting sub-query whose dependencies have all answered."""
+        for sub_query_info in list(self.waiting):
+            if all(dep in self.results for dep in sub_query_info["depends_on"]):
+                self.waiting.remove(sub_query_info)
+                current_query = {**sub_query_info, "query": self._with_context(sub_query_info)}
+                updated_state = {**self.state, "current_query": current_query}
+                task = asyncio.create_task(run_supervisor(updated_state, self.supervisor_dict))
+                self.running[task] = sub_query_info
+
+    async def wait(self, timeout: float | None = None) -> List[Tuple[Dict[str, Any], BaseMessage]]:
+        """Wait for the next sub-queries to finish and start the ones they unblock.
+
+        Returns the ``(sub_query_info, message)`` pairs that completed, or an empty
+        list if ``timeout`` expired first.
+        """
+        self.start_ready()
+        if not self.running:
+            return []
+        done, _ = await asyncio.wait(self.running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        completed = []
+        for task in done:
+            sub_query_info = self.running.pop(task)
+            message = _task_message(task, sub_query_info)
+            self.results[sub_query_info["id"]] = message
+            completed.append((sub_query_info, message))
+        self.start_ready()
+        return completed
+
+    def cancel(self) -> None:
+        """Cancel running sub-queries and drop the ones that never started."""
+        for task in self.running:
+            task.cancel()
+        self.cancelled.extend(self.running)
+        self.running.clear()
+        self.waiting.clear()
+
+    async def aclose(self) -> None:
+        """Cancel whatever is outstanding and wait until every cancelled task has exited."""
+        self.cancel()
+        await asyncio.gather(*self.cancelled, return_exceptions=True)
+        self.cancelled.clear()
+
+    def ordered_results(self) -> List[BaseMessage]:
+        """Answers in the original sub-query order."""
+        return [self.results[info["id"]] for info in self.sub_queries if info["id"] in self.results]
+
+
+async def parallel_runner(
+    state: Dict[str, Any],
+    supervisor_dict: Dict[str, Any],
+    config: RunnableConfig | None = None,
+) -> Dict[str, List[BaseMessage]]:
+    """Run the supervisors for every sub-query, in parallel where dependencies allow."""
+    scheduler = SubQueryScheduler(state, supervisor_dict)
+    try:
+        while not scheduler.done:
+            check_deadline(config)
+            await scheduler.wait(timeout=remaining(config))
+    finally:
+        await scheduler.aclose()
+    return {"messages": scheduler.ordered_results()}
+
+
+def _budget(seconds: float, config: RunnableConfig | None) -> float:
+    """``seconds`` capped by the time left before the request deadline."""
+    left = remaining(config)
+    return seconds if left is None else min(seconds, left)
+
+
+# ---------------------------------------------------------------------
+# 2) Synthesis
+# ---------------------------------------------------------------------
+
+COMBINE_PROMPT = """You are an expert {sport} assistant.
+
+        Original query: {original_query}
+
+        Sub-query results: {combined_results}
+
+        Provide a comprehensive answer.
+        """
+
+# Built once per process; the synthesis tier still resolves per request from the config.
+synthesis_chain = PromptTemplate(
+    template=COMBINE_PROMPT,
+    input_variables=["sport", "original_query", "combined_results"]
+) | tiered_model("synthesis", temperature=0)
+
+
+async def synthesize(
+    original_query: str,
+    results: List[str],
+    sport: str,
+    config: RunnableConfig | None = None,
+) -> str:
+    """Asks the synthesis-tier LLM for a final answer built from the sub-query results."""
+    final_answer = await run_within(synthesis_chain.ainvoke({
+        "sport": sport,
+        "original_query": original_query,
+        "combined_results": "\n\n".join(results),
+    }, config), config)
+    return final_answer.content
+
+
+# ---------------------------------------------------------------------
+# 3) Incremental synthesis
+# ---------------------------------------------------------------------
+
+async def _emit(name: str, data: Dict[str, Any], config: RunnableConfig | None) -> None:
+    """Dispatch a custom stream event when running inside a traced graph run."""
+    if not config or not config.get("callbacks"):
+        return
+    await adispatch_custom_event(name, data, config=config)
+
+
+async def incremental_runner(
+    state: Dict[str, Any],
+    supervisor_dict: Dict[str, Any],
+    sport: str,
+    config: RunnableConfig | None = None,
+) -> Dict[str, List[BaseMessage]]:
+    """Run the supervisors and synthesize from whatever finishes within the deadline.
+
+    Each sub-query result is streamed as a ``sub_query_result`` custom event as soon
+    as it returns (visible through ``astream_events``). When the configured
+    ``synthesis_deadline`` expires the final answer is built from the finished
+    results. Stragglers (including dependent sub-queries that never got to start)
+    are then either cancelled and flagged as missing, or given
+    ``late_result_timeout`` more seconds and appended after the synthesis. Both
+    waits end early when the request deadline is closer.
+    """
+    configuration = Configuration.from_runnable_config(config)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + _budget(configuration.synthesis_deadline, config)
+    scheduler = SubQueryScheduler(state, supervisor_dict)
+    try:
+        return await _incremental(state, scheduler, deadline, sport, configuration, config)
+    finally:
+        await scheduler.aclose()
+
+
+async def _incremental(
+    state: Dict[str, Any],
+    scheduler: SubQueryScheduler,
+    deadline: float,
+    sport: str,
+    configuration: Configuration,
+    config: RunnableConfig | None,
+) -> Dict[str, List[BaseMessage]]:
+    loop = asyncio.get_running_loop()
+
+    async def drain(until: float, late: bool) -> None:
+        while not scheduler.done:
+            left = until - loop.time()
+            if left <= 0:
+                return
+            for sub_query_info, message in await scheduler.wait(timeout=left):
+                await _emit("sub_query_result", {**sub_query_info, "content": message.content, "late": late}, config)
+
+    await drain(deadline, late=False)
+    on_time = dict(scheduler.results)
+    finished = [message.content for message in scheduler.ordered_results()]
+
+    late_queries = scheduler.unfinished()
+    if late_queries and configuration.late_results == "flag":
+        scheduler.cancel()
+        for sub_query_info in late_queries:
+            finished.append(
+                f"[No result: '{sub_query_info['query']}' did not finish within "
+                f"{configuration.synthesis_deadline:g}s.]"
+            )
+            await _emit("sub_query_late", dict(sub_query_info), config)
+
+    final_answer = await synthesize(state["messages"][0].content, finished, sport, config)
+    new_messages: List[BaseMessage] = [state["messages"][0], HumanMessage(content=final_answer)]
+
+    if late_queries and configuration.late_results == "append":
+        await drain(loop.time() + _budget(configuration.late_result_timeout, config), late=True)
+        scheduler.cancel()
+        for sub_query_info in scheduler.sub_queries:
+            if sub_query_info["id"] in scheduler.results and sub_query_info["id"] not in on_time:
+                content = scheduler.results[sub_query_info["id"]].content
+                new_messages.append(HumanMessage(content=f"Late result for '{sub_query_info['query']}':\n{content}"))
+
+    return {"messages": new_messages}
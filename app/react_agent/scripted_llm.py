@@ -0,0 +1,252 @@
+"""Scripted chat model that replays recorded LLM outputs (offline load tests).
+
+``ScriptRecorder`` is a callback handler. When it is attached to a real run
+(``{"callbacks": [recorder]}``), it records every chat model call. That covers
+text answers, tool calls (supervisor handoffs and worker tool use) and
+structured output such as split_node's ``ParsedOutput``. ``save`` writes the
+calls to a JSON script. ``ScriptedChatModel`` answers from that script
+instead of calling a provider, so a graph runs end to end without an API key.
+Together with the recorded HTTP cassettes (cassettes.py), it also runs
+without network access.
+
+A call is looked up by its *slot*: the names of the tools bound to the model
+(a structured output schema counts as a tool, which is how both the recorder
+and ``with_structured_output`` see it) and the number of AI messages already
+in the conversation, e.g. ``tools:ParsedOutput#0`` or
+``tools:transfer_to_nba_live_supervisor,...#2``. Within a slot, the recorded
+call whose last human message equals the current one wins. Otherwise calls are
+replayed round-robin, so a script recorded for a few questions still drives any
+question through the same graph path. A slot that was never recorded raises
+``ScriptMiss``.
+
+Replies take the recorded time unless a fixed latency is set. The sleep is
+asyncio-friendly in ``ainvoke``, so concurrency in load tests is real. Token
+counts are replayed as usage metadata, so usage.py still accounts them.
+
+Setting ``LLM_SCRIPT`` makes the model registry (llm.py) hand out the scripted
+model for every model name:
+
+    LLM_SCRIPT            path of the recorded script (unset: real providers)
+    LLM_SCRIPT_LATENCY    recorded | seconds per call (recorded)
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from typing import Any, Dict, List, Sequence, Tuple
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult, LLMResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from app.react_agent.usage import token_usage
+from app.react_agent.utils import get_message_text
+
+
+class ScriptMiss(LookupError):
+    """The scripted model was called in a slot the script has no output for."""
+
+
+# -------------------------------------------------------------------
+# Slots
+# -------------------------------------------------------------------
+def tool_names(tools: Sequence[Any] | None) -> List[str]:
+    """Names of bound tools in any format (BaseTool, pydantic schema, OpenAI dict)."""
+    names = []
+    for tool in tools or ():
+        if isinstance(tool, dict) and "function" in tool:
+            names.append(tool["function"]["name"])
+        elif isinstance(tool, dict) and "name" in tool:
+            names.append(tool["name"])
+        else:
+            names.append(convert_to_openai_tool(tool)["function"]["name"])
+    return sorted(names)
+
+
+def slot(messages: Sequence[BaseMessage], tools: Sequence[str]) -> str:
+    """Return the script slot of a call: its bound tools and the number of AI turns so far."""
+    step = sum(isinstance(message, AIMessage) for message in messages)
+    return f"{'tools:' + ','.join(tools) if tools else 'text'}#{step}"
+
+
+def last_question(messages: Sequence[BaseMessage]) -> str:
+    """Return the text of the last human message (empty if there is none)."""
+    for message in reversed(messages):
+        if isinstance(message, HumanMessage):
+            return get_message_text(message)
+    return ""
+
+
+def _response_format_name(response_format: Any) -> str | None:
+    # OpenAI json_schema structured output: the schema class or its JSON form
+    if isinstance(response_format, type):
+        return response_format.__name__
+    if isinstance(response_format, dict):
+        return (response_format.get("json_schema") or {}).get("name")
+    return None
+
+
+# -------------------------------------------------------------------
+# Script
+# -------------------------------------------------------------------
+class Script:
+    """Recorded calls per slot, with the round-robin position of each slot."""
+
+    def __init__(self, calls: Dict[str, List[Dict[str, Any]]] | None = None):
+        """Create a script from recorded ``calls`` keyed by slot."""
+        self.calls = calls or {}
+        self._lock = threading.Lock()
+        self._cycles: Dict[str, Any] = {}
+
+    @classmethod
+    def load(cls, path: str) -> "Script":
+        """Read a script recorded by ``ScriptRecorder.save``."""
+        with open(path) as f:
+            return cls(json.load(f)["calls"])
+
+    def next(self, key: str, question: str) -> Dict[str, Any]:
+        """Return the entry recorded for ``question`` in slot ``key``, else the slot's next one."""
+        entries = self.calls.get(key)
+        if not entries:
+            raise ScriptMiss(f"No scripted LLM output for slot '{key}'")
+        for entry in entries:
+            if entry.get("question") == question:
+                return entry
+        with self._lock:
+            cycle = self._cycles.get(key)
+            if cycle is None:
+                cycle = self._cycles[key] = itertools.cycle(entries)
+            return next(cycle)
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Chat model answering from a ``Script``; tools and structured output included."""
+
+    script: Any
+    model_name: str = "scripted"  # the replaced model's name, so usage.py prices the calls
+    latency: float | None = None  # None: sleep for the recorded time
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools: Sequence[Any], *, tool_choice: Any | None = None, **kwargs: Any) -> Any:
+        """Bind ``tools`` as OpenAI tool dicts, the form langgraph inspects on a bound model.
+
+        Only the names matter for the slot.
+        """
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools])
+
+    def _reply(self, messages: List[BaseMessage], tools: List[Dict[str, Any]] | None) -> Tuple[ChatResult, float]:
+        entry = self.script.next(slot(messages, tool_names(tools)), last_question(messages))
+        message = AIMessage(
+            content=entry.get("content", ""),
+            tool_calls=[
+                {"name": call["name"], "args": call.get("args", {}), "id": f"call_{uuid.uuid4().hex[:24]}"}
+                for call in entry.get("tool_calls", [])
+            ],
+            usage_metadata={
+                "input_tokens": entry.get("input_tokens", 0),
+                "output_tokens": entry.get("output_tokens", 0),
+                "total_tokens": entry.get("input_tokens", 0) + entry.get("output_tokens", 0),
+            },
+        )
+        delay = entry.get("seconds", 0.0) if self.latency is None else self.latency
+        return ChatResult(generations=[ChatGeneration(message=message)]), delay
+
+    def _generate(self, messages, stop=None, run_manager=None, tools=None, **kwargs) -> ChatResult:
+        result, delay = self._reply(messages, tools)
+        time.sleep(delay)
+        return result
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, tools=None, **kwargs) -> ChatResult:
+        result, delay = self._reply(messages, tools)
+        await asyncio.sleep(delay)
+        return result
+
+
+def script_latency() -> float | None:
+    """Return the ``LLM_SCRIPT_LATENCY`` seconds, or None to replay the recorded times."""
+    latency = os.getenv("LLM_SCRIPT_LATENCY", "recorded")
+    return None if latency == "recorded" else float(latency)
+
+
+# -------------------------------------------------------------------
+# Recording
+# -------------------------------------------------------------------
+class ScriptRecorder(BaseCallbackHandler):
+    """Records the chat model calls of real runs into a script."""
+
+    run_inline = True
+
+    def __init__(self):
+        """Start with no recorded calls."""
+        self.calls: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._runs: Dict[Any, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs) -> None:
+        """Remember the slot, question and model of a starting call."""
+        params = kwargs.get("invocation_params") or {}
+        tools = tool_names(params.get("tools"))
+        schema = _response_format_name(params.get("response_format"))
+        if schema:
+            tools = [schema]
+        with self._lock:
+            self._runs[run_id] = {
+                "slot": slot(messages[0], tools),
+                "schema": schema,
+                "question": last_question(messages[0]),
+                "model": (metadata or {}).get("ls_model_name") or params.get("model_name") or params.get("model") or "-",
+                "started": time.perf_counter(),
+            }
+
+    def on_llm_end(self, response: LLMResult, *, run_id, **kwargs) -> None:
+        """Record the finished call's output in its slot."""
+        with self._lock:
+            run = self._runs.pop(run_id, None)
+        if run is None:
+            return
+        message = response.generations[0][0].message
+        content = get_message_text(message)
+        tool_calls = [{"name": call["name"], "args": call["args"]} for call in getattr(message, "tool_calls", [])]
+        if run["schema"] and not tool_calls:
+            # json_schema structured output arrives as content; replay it as the
+            # tool call with_structured_output parses on the scripted model.
+            tool_calls, content = [{"name": run["schema"], "args": json.loads(content)}], ""
+        input_tokens, output_tokens = token_usage(response)
+        entry = {
+            "question": run["question"],
+            "model": run["model"],
+            "content": content,
+            "tool_calls": tool_calls,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "seconds": round(time.perf_counter() - run["started"], 3),
+        }
+        with self._lock:
+            self.calls[run["slot"]].append(entry)
+
+    def on_llm_error(self, error, *, run_id, **kwargs) -> None:
+        """Forget a failed call."""
+        with self._lock:
+            self._runs.pop(run_id, None)
+
+    def save(self, path: str) -> None:
+        """Write the recorded calls to ``path``, adding to a script already there."""
+        calls: Dict[str, List[Dict[str, Any]]] = {}
+        if os.path.exists(path):
+            calls = Script.load(path).calls
+        with self._lock:
+            for key, entries in self.calls.items():
+                calls.setdefault(key, []).extend(entries)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"calls": calls}, f, indent=1)
@@ -50,28 +50,33 @@ from langgraph_supervisor import create_supervisor
 from langgraph.prebuilt import create_react_agent
 from langgraph.graph import StateGraph, START, END
 from langgraph.prebuilt import ToolNode
+from app.react_agent.llm import tiered_model
 
 
-llm = ChatOpenAI(model="gpt-4o")
+# Routing hops and ID/web lookups run on the cheaper tiers, agents that read
+# stats payloads on the large one (see Configuration.*_model).
+router_llm = tiered_model("router")
+lookup_llm = tiered_model("lookup")
+agent_llm = tiered_model("agent")
 # -------------------------------- League --------------------------------
 
 league_info_agent = create_react_agent(
-    model=llm,
-    tools=[get_league_info, get_all_leagues_id, get_league_id_by_name],
+    model=lookup_llm,
+    tools=[get_league_info, get_all_leagues_id, get_league_id_by_name, LEAGUE_INFO_PROMPT.examples_tool],
     name="league_info_agent",
     prompt= LEAGUE_INFO_PROMPT
 )
 
 league_schedule_standings_agent = create_react_agent(
-    model=llm,
-    tools=[get_league_id_by_name, get_all_leagues_id, get_standings, get_league_schedule_by_date],
+    model=agent_llm,
+    tools=[get_league_id_by_name, get_all_leagues_id, get_standings, get_league_schedule_by_date, LEAGUE_SCHEDULE_STANDINGS_PROMPT.examples_tool],
     name="league_schedule_standings_agent",
     prompt=LEAGUE_SCHEDULE_STANDINGS_PROMPT
 )
 
 tavily_search_agent = create_react_agent(
-    model=llm,
-    tools=[tavily_search_tool],
+    model=lookup_llm,
+    tools=[tavily_search_tool, TAVILY_SEARCH_PROMPT.examples_tool],
     name="tavily_search_agent",
     prompt=TAVILY_SEARCH_PROMPT
 )
@@ -81,7 +86,7 @@ tavily_search_agent = create_react_agent(
 league_supervisor = create_supervisor(
     [league_info_agent, league_schedule_standings_agent, tavily_search_agent],
     supervisor_name = "league_supervisor",
-    model=llm,
+    model=router_llm,
     prompt=LEAGUE_SUPERVISOR_PROMPT
 ).compile(name = "league_supervisor")
 
@@ -90,22 +95,22 @@ league_supervisor = create_supervisor(
 # -------------------------------- TEAM --------------------------------
 
 tavily_search_agent = create_react_agent(
-    model=llm,
-    tools=[tavily_search_tool],
+    model=lookup_llm,
+    tools=[tavily_search_tool, TAVILY_SEARCH_PROMPT.examples_tool],
     name="tavily_search_agent",
     prompt=TAVILY_SEARCH_PROMPT
 )
 
 live_match_agent = create_react_agent(
-    model=llm,
-    tools=[get_live_match_for_team, get_live_stats_for_team, get_live_match_timeline],
+    model=agent_llm,
+    tools=[get_live_match_for_team, get_live_stats_for_team, get_live_match_timeline, get_live_match_details, LIVE_MATCH_PROMPT.examples_tool],
     name="live_match_agent",
     prompt= LIVE_MATCH_PROMPT
 )
 
 team_fixtures_agent = create_react_agent(
-    model=llm,
-    tools=[get_team_fixtures, get_team_fixtures_by_date_range, get_team_info],
+    model=agent_llm,
+    tools=[get_team_fixtures, get_team_fixtures_by_date_range, get_team_info, TEAM_FIXTURES_PROMPT.examples_tool],
     name="team_fixtures_agent",
     prompt=TEAM_FIXTURES_PROMPT
 )
@@ -114,7 +119,7 @@ team_fixtures_agent = create_react_agent(
 team_soccer_supervisor = create_supervisor(
     [tavily_search_agent, team_fixtures_agent, live_match_agent],
     supervisor_name = "team_soccer_supervisor",
-    model=llm,
+    model=router_llm,
     prompt=TEAM_SOCCER_SUPERVISOR_PROMPT
 ).compile(name = "team_soccer_supervisor")
 
@@ -123,23 +128,23 @@ team_soccer_supervisor = create_supervisor(
 
 
 tavily_search_agent = create_react_agent(
-    model=llm,
-    tools=[tavily_search_tool],
+    model=lookup_llm,
+    tools=[tavily_search_tool, TAVILY_SEARCH_PROMPT.examples_tool],
     name="tavily_search_agent",
     prompt=TAVILY_SEARCH_PROMPT
 )
 
 player_id_stats_agent = create_react_agent(
-    model=llm,
-    tools=[get_player_id, get_player_statistics, get_player_profile],  # add get_league_id_by_name for get_player_statistics_2
+    model=agent_llm,
+    tools=[get_player_id, get_player_statistics, get_player_profile, PLAYER_ID_STATS_PROMPT.examples_tool],  # add get_league_id_by_name for get_player_statistics_2
     name="player_id_stats_agent",
     prompt=PLAYER_ID_STATS_PROMPT
 )
 
 
 player_soccer_stats_agent_2 = create_react_agent(
-    model=llm,
-    tools=[get_player_id, get_league_id_by_name, get_player_statistics_2],  # add get_league_id_by_name for get_player_statistics_2
+    model=agent_llm,
+    tools=[get_player_id, get_league_id_by_name, get_player_statistics_2, PLAYER_SOCCER_STATS_PROMPT_2.examples_tool],  # add get_league_id_by_name for get_player_statistics_2
     name="player_soccer_stats_agent_2",
     prompt=PLAYER_SOCCER_STATS_PROMPT_2
 )
@@ -148,7 +153,7 @@ player_soccer_stats_agent_2 = create_react_agent(
 player_soccer_supervisor = create_supervisor(
     [tavily_search_agent, player_id_stats_agent, player_soccer_stats_agent_2],
     supervisor_name = "player_soccer_supervisor",
-    model=llm,
+    model=router_llm,
     prompt=PLAYER_SOCCER_SUPERVISOR_PROMPT
 ).compile(name = "player_soccer_supervisor")
 
@@ -158,38 +163,45 @@ player_soccer_supervisor = create_supervisor(
 # -------------------------------- FIXTURES --------------------------------
 
 live_match_agent = create_react_agent(
-    model=llm,
-    tools=[get_live_match_for_team, get_live_stats_for_team, get_live_match_timeline],
+    model=agent_llm,
+    tools=[get_live_match_for_team, get_live_stats_for_team, get_live_match_timeline, get_live_match_details, LIVE_MATCH_PROMPT.examples_tool],
     name="live_match_agent",
     prompt= LIVE_MATCH_PROMPT
 )
 
 fixture_schedule_agent = create_react_agent(
-    model=llm,
-    tools=[get_league_schedule_by_date, get_multiple_fixtures_stats, tavily_search_tool],
+    model=agent_llm,
+    tools=[get_league_schedule_by_date, get_multiple_fixtures_stats, tavily_search_tool, FIXTURE_SCHEDULE_PROMPT.examples_tool],
     name="fixture_schedule_agent",
     prompt=FIXTURE_SCHEDULE_PROMPT
 )
 
 team_fixtures_agent = create_react_agent(
-    model=llm,
-    tools=[get_team_fixtures, get_team_fixtures_by_date_range, get_team_info],
+    model=agent_llm,
+    tools=[get_team_fixtures, get_team_fixtures_by_date_range, get_team_info, TEAM_FIXTURES_PROMPT.examples_tool],
     name="team_fixtures_agent",
     prompt=TEAM_FIXTURES_PROMPT
 )
 
 tavily_search_agent = create_react_agent(
-    model=llm,
-    tools=[tavily_search_tool],
+    model=lookup_llm,
+    tools=[tavily_search_tool, TAVILY_SEARCH_PROMPT.examples_tool],
     name="tavily_search_agent",
     prompt=TAVILY_SEARCH_PROMPT
 )
 
+betting_odds_agent = create_react_agent(
+    model=lookup_llm,
+    tools=[odds_line_scanner, odds_line_movement, BETTING_ODDS_PROMPT.examples_tool],
+    name="betting_odds_agent",
+    prompt=BETTING_ODDS_PROMPT
+)
+
 # Create supervisor for games
 fixture_supervisor = create_supervisor(
-    [live_match_agent, fixture_schedule_agent, team_fixtures_agent, tavily_search_agent],
+    [live_match_agent, fixture_schedule_agent, team_fixtures_agent, tavily_search_agent, betting_odds_agent],
     supervisor_name = "fixture_supervisor",
-    model=llm,
+    model=router_llm,
     prompt=FIXTURE_SUPERVISOR_PROMPT
 ).compile(name = "fixture_supervisor")
 
@@ -198,7 +210,7 @@ fixture_supervisor = create_supervisor(
 main_soccer_supervisor = create_supervisor(
     [league_supervisor, team_soccer_supervisor, player_soccer_supervisor, fixture_supervisor],
     supervisor_name = "main_soccer_supervisor",
-    model=llm,
+    model=router_llm,
     prompt=SOCCER_SUPERVISOR_PROMPT
 ).compile(name = "main_soccer_supervisor")
 
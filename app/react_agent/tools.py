@@ -20,6 +20,7 @@ import re
 import pandas as pd 
 from langchain.schema import HumanMessage, AIMessage
 from langchain_core.messages import AnyMessage, HumanMessage
+from langchain_core.runnables import RunnableConfig
 from langchain.chains import create_retrieval_chain
 from langchain.tools import BaseTool, Tool
 import mlbstatsapi
@@ -37,12 +38,19 @@ from nba_api.stats.static import teams
 
 #---------------------------------------------------------------------
 from app.react_agent.configuration import Configuration
+from app.react_agent.live import live_feeds, session_cursors, session_id
+from app.react_agent.deadline import http_timeout
+from app.react_agent.metrics import instrument_requests, instrument_tools
+from app.react_agent import cassettes
+
+# nba_api's own default; capped by the request deadline like every other HTTP call
+NBA_API_TIMEOUT = 30
 #---------------------------------------------------------------------
 
 load_dotenv()
 
 
-logging.basicConfig(level=logging.DEBUG)
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "WARNING").upper())
 logger = logging.getLogger(__name__)
 
 
@@ -94,7 +102,7 @@ class MLBGetScheduleTool:
             params["date"] = date
 
         try:
-            resp = requests.get(self.base_url, params=params)
+            resp = requests.get(self.base_url, params=params, timeout=http_timeout(15))
             resp.raise_for_status()
             return resp.json()
         except requests.exceptions.RequestException as e:
@@ -137,7 +145,7 @@ class MLBGetTeamRosterTool:
             "season": season
         }
         try:
-            resp = requests.get(url, params=params)
+            resp = requests.get(url, params=params, timeout=http_timeout(15))
             resp.raise_for_status()
             return resp.json()
         except requests.exceptions.RequestException as e:
@@ -181,7 +189,7 @@ class MLBGetTeamInfoTool:
             params["season"] = season
 
         try:
-            resp = requests.get(url, params=params)
+            resp = requests.get(url, params=params, timeout=http_timeout(15))
             resp.raise_for_status()
             return resp.json()
         except requests.exceptions.RequestException as e:
@@ -225,7 +233,7 @@ class MLBGetPlayerInfoTool:
             params["season"] = season
 
         try:
-            resp = requests.get(url, params=params)
+            resp = requests.get(url, params=params, timeout=http_timeout(15))
             resp.raise_for_status()
             return resp.json()
         except requests.exceptions.RequestException as e:
@@ -250,32 +258,87 @@ class MLBGetLiveGameDataInput(BaseModel):
     Uses the StatsAPI endpoint: https://statsapi.mlb.com/api/v1.1/game/{game_pk}/feed/live
     """
     game_pk: int = Field(..., description="Game primary key (e.g., 716463).")
+    only_new: bool = Field(
+        default=False,
+        description="If true, return only the plays and linescore changes since your previous call for this game."
+    )
 
 class MLBGetLiveGameDataTool:
     """
     A tool to call the MLB StatsAPI /game/{game_pk}/feed/live endpoint.
+    Each session's last seen timecode is remembered; with only_new, the latest
+    timecode comes from /feed/live/timestamps and the changes in between from
+    /feed/live/diffPatch.
     """
+    # Parts of the GUMBO feed worth sending back as incremental changes
+    DIFF_PATHS = ("/liveData/plays", "/liveData/linescore", "/gameData/status")
+
     def __init__(self):
         self.base_url = "https://statsapi.mlb.com/api/v1.1/game"
 
-    def run_get_live_game_data(self, game_pk: int) -> Dict[str, Any]:
+    def run_get_live_game_data(self, game_pk: int, only_new: bool = False, config: RunnableConfig = None) -> Dict[str, Any]:
         """
         GET request to /game/{game_pk}/feed/live to get the GUMBO feed for a specific game.
+        The feed is read from a shared per-game poller (see live.py), which
+        stops refreshing once the game is final.
         """
-        url = f"{self.base_url}/{game_pk}/feed/live"
+        session = session_id(config)
+        since = session_cursors.get(session, ("mlb", "feed", game_pk))
         try:
-            resp = requests.get(url)
-            resp.raise_for_status()
-            return resp.json()
-        except requests.exceptions.RequestException as e:
-            return {"error": f"RequestException: {str(e)}"}
+            if only_new and since is not None:
+                return self.changes_since(game_pk, since, session)
+            feed = live_feeds.read(("mlb", "feed", game_pk), lambda: self.fetch(game_pk), until=self.is_final)
+            session_cursors.set(session, ("mlb", "feed", game_pk), feed.get("metaData", {}).get("timeStamp"))
+            return feed
         except Exception as e:
             return {"error": f"Unexpected error: {str(e)}"}
 
+    def changes_since(self, game_pk: int, since: str, session: str | None) -> Dict[str, Any]:
+        """Return the plays/linescore/status patches since the session's timecode."""
+        timestamps = MLBGetGameTimestampsTool().run_get_game_timestamps(game_pk)
+        if isinstance(timestamps, dict):  # error
+            return timestamps
+        latest = timestamps[-1] if timestamps else since
+        if latest == since:
+            return {"game_pk": game_pk, "since_timecode": since, "timecode": latest, "changes": []}
+
+        resp = requests.get(
+            f"{self.base_url}/{game_pk}/feed/live/diffPatch",
+            params={"startTimecode": since, "endTimecode": latest},
+            timeout=http_timeout(15)
+        )
+        resp.raise_for_status()
+        patch = resp.json()
+        session_cursors.set(session, ("mlb", "feed", game_pk), latest)
+        if isinstance(patch, dict):
+            # The API answers with the full feed when the diff would be too large
+            return {"game_pk": game_pk, "since_timecode": since, "timecode": latest, "full_feed": patch}
+        operations = [op for item in patch for op in item.get("diff", [item])]
+        return {
+            "game_pk": game_pk,
+            "since_timecode": since,
+            "timecode": latest,
+            "changes": [op for op in operations if op.get("path", "").startswith(self.DIFF_PATHS)],
+        }
+
+    def fetch(self, game_pk: int) -> Dict[str, Any]:
+        """Fetch the full live feed of ``game_pk``."""
+        resp = requests.get(f"{self.base_url}/{game_pk}/feed/live", timeout=http_timeout(15))
+        resp.raise_for_status()
+        return resp.json()
+
+    @staticmethod
+    def is_final(feed: Dict[str, Any]) -> bool:
+        """Whether the feed's game is over (its snapshot will not change)."""
+        return feed.get("gameData", {}).get("status", {}).get("abstractGameState") == "Final"
+
 mlb_get_live_game_data_tool = StructuredTool(
     name="mlb_get_live_game_data",
     func=MLBGetLiveGameDataTool().run_get_live_game_data,
-    description="Fetches the GUMBO live feed for a specified MLB game.",
+    description=(
+        "Fetches the GUMBO live feed for a specified MLB game. Set only_new=true on "
+        "follow-up calls to get just the plays and score changes since your previous call."
+    ),
     args_schema=MLBGetLiveGameDataInput
 )
 
@@ -303,7 +366,7 @@ class MLBGetGameTimestampsTool:
         """
         url = f"{self.base_url}/{game_pk}/feed/live/timestamps"
         try:
-            resp = requests.get(url)
+            resp = requests.get(url, timeout=http_timeout(15))
             resp.raise_for_status()
             return resp.json()
         except requests.exceptions.RequestException as e:
@@ -699,12 +762,16 @@ class NBAFetchScoreBoardTool:
         Returns it as a dictionary.
         """
         try:
-            sb = scoreboard.ScoreBoard()  # Instantiate scoreboard
-            data_dict = sb.get_dict()     # Dictionary of scoreboard data
-            return data_dict
+            # One shared background poll per process instead of one call per request
+            return live_feeds.read(("nba", "scoreboard"), self.fetch)
         except Exception as e:
             return {"error": str(e)}
 
+    @staticmethod
+    def fetch() -> Dict[str, Any]:
+        """Fetch today's scoreboard from the NBA live endpoint."""
+        return scoreboard.ScoreBoard(timeout=http_timeout(NBA_API_TIMEOUT)).get_dict()
+
 # ========== 3) Create the LangChain StructuredTool ==========
 nba_live_scoreboard = StructuredTool(
     name="nba_live_scoreboard",
@@ -747,7 +814,7 @@ class NBAFetchBoxScoreTool:
         Return the box score as a dictionary.
         """
         try:
-            bs = boxscore.BoxScore(game_id=game_id)
+            bs = boxscore.BoxScore(game_id=game_id, timeout=http_timeout(NBA_API_TIMEOUT))
             data_dict = bs.get_dict()
             return data_dict
         except Exception as e:
@@ -782,32 +849,56 @@ class LivePlayByPlayInput(BaseModel):
         ...,
         description="A 10-digit NBA game ID for which to fetch play-by-play actions."
     )
+    only_new: bool = Field(
+        default=False,
+        description="If true, return only the actions added since your previous call for this game."
+    )
 
 # ========== 2) Define the Tool Class ==========
 class NBAFetchPlayByPlayTool:
     """
     Fetch real-time play-by-play data from the NBA Live endpoint for the given game ID.
+    The feed is shared per game (see live.py); each session's last seen
+    actionNumber is remembered so follow-up calls can ask for new actions only.
     """
     def __init__(self):
         pass
 
-    def run(self, game_id: str) -> Dict[str, Any]:
+    def run(self, game_id: str, only_new: bool = False, config: RunnableConfig = None) -> Dict[str, Any]:
         """
-        Return the play-by-play feed as a dictionary.
+        Return the play-by-play feed as a dictionary, or only the actions after
+        the session's cursor when only_new is set.
         """
         try:
-            pbp = playbyplay.PlayByPlay(game_id=game_id)
-            data_dict = pbp.get_dict()
-            return data_dict
+            data_dict = live_feeds.read(("nba", "playbyplay", game_id), lambda: self.fetch(game_id))
+            actions = data_dict.get("game", {}).get("actions", [])
+            session = session_id(config)
+            since = session_cursors.get(session, ("nba", "playbyplay", game_id))
+            last = max((action["actionNumber"] for action in actions), default=since)
+            session_cursors.set(session, ("nba", "playbyplay", game_id), last)
+            if not only_new or since is None:
+                return data_dict
+            return {
+                "game_id": game_id,
+                "since_action_number": since,
+                "last_action_number": last,
+                "new_actions": [action for action in actions if action["actionNumber"] > since],
+            }
         except Exception as e:
             return {"error": str(e)}
 
+    @staticmethod
+    def fetch(game_id: str) -> Dict[str, Any]:
+        """Fetch the full play-by-play of ``game_id``."""
+        return playbyplay.PlayByPlay(game_id=game_id, timeout=http_timeout(NBA_API_TIMEOUT)).get_dict()
+
 # ========== 3) Create the LangChain StructuredTool ==========
 nba_live_play_by_play = StructuredTool(
     name="nba_live_play_by_play",
     description=(
         "Retrieve the live play-by-play actions for a specific NBA game ID. "
-        "Useful for real-time game event tracking."
+        "Useful for real-time game event tracking. Set only_new=true on follow-up "
+        "calls to get just the actions since your previous call."
     ),
     func=NBAFetchPlayByPlayTool().run,
     args_schema=LivePlayByPlayInput
@@ -844,7 +935,8 @@ class NBACommonPlayerInfoTool:
         """
         try:
             info = commonplayerinfo.CommonPlayerInfo(
-                player_id=player_id
+                player_id=player_id,
+                timeout=http_timeout(NBA_API_TIMEOUT)
             )
             data_dict = info.get_dict()
             return data_dict
@@ -902,7 +994,8 @@ class NBAPlayerCareerStatsTool:
         try:
             career = playercareerstats.PlayerCareerStats(
                 player_id=player_id,
-                per_mode36=per_mode  # param name is per_mode36 in the library
+                per_mode36=per_mode,  # param name is per_mode36 in the library
+                timeout=http_timeout(NBA_API_TIMEOUT)
             )
             data_dict = career.get_dict()
             return data_dict
@@ -1170,7 +1263,8 @@ class TeamGameLogsTool:
             logs = teamgamelogs.TeamGameLogs(
                 team_id_nullable=team_id,
                 season_nullable=season,
-                season_type_nullable=season_type
+                season_type_nullable=season_type,
+                timeout=http_timeout(NBA_API_TIMEOUT)
             )
             # get_data_frames() returns a list of DataFrames. The main one is index=0
             df = logs.get_data_frames()[0]  # the primary DataFrame with all logs
@@ -1261,7 +1355,8 @@ class TeamGameLogsByNameTool:
             logs = teamgamelogs.TeamGameLogs(
                 team_id_nullable=str(team_id),
                 season_nullable=season,
-                season_type_nullable=season_type
+                season_type_nullable=season_type,
+                timeout=http_timeout(NBA_API_TIMEOUT)
             )
 
             df = logs.get_data_frames()[0]
@@ -1326,7 +1421,8 @@ class NBAFetchGameResultsTool:
                 team_id_nullable=team_id,
                 season_type_nullable=SeasonType.regular,
                 date_from_nullable=min(date_objects).strftime('%m/%d/%Y'),
-                date_to_nullable=max(date_objects).strftime('%m/%d/%Y')
+                date_to_nullable=max(date_objects).strftime('%m/%d/%Y'),
+                timeout=http_timeout(NBA_API_TIMEOUT)
             )
 
             games = gamefinder.get_data_frames()[0]
@@ -1393,7 +1489,8 @@ class NBATeamStandingsTool:
             # Fetch standings data
             standings = leaguestandingsv3.LeagueStandingsV3(
                 season=season,
-                season_type=season_type
+                season_type=season_type,
+                timeout=http_timeout(NBA_API_TIMEOUT)
             )
             standings_data = standings.get_data_frames()[0]
 
@@ -1467,6 +1564,7 @@ class NBATeamStatsByNameTool:
                 team_id=team_id,
                 per_mode_simple=per_mode,
                 season_type_all_star=season_type,
+                timeout=http_timeout(NBA_API_TIMEOUT)
             )
 
 
@@ -1537,6 +1635,7 @@ class NBAAllTeamsStatsTool:
                     season=year,  # Pass the year
                     season_type=season_type,
                     league_id='00',  # NBA league ID
+                    timeout=http_timeout(NBA_API_TIMEOUT)
                 )
 
                 team_stats_data = team_stats.get_data_frames()[0]
@@ -1641,7 +1740,8 @@ class NBAPlayerGameLogsTool:
                 player_id_nullable=player_id,
                 season_type_nullable=season_type,
                 date_from_nullable=start_date.strftime('%m/%d/%Y'),
-                date_to_nullable=end_date.strftime('%m/%d/%Y')
+                date_to_nullable=end_date.strftime('%m/%d/%Y'),
+                timeout=http_timeout(NBA_API_TIMEOUT)
             )
 
             games = gamefinder.get_data_frames()[0]
@@ -1718,7 +1818,7 @@ class GetLeagueIdByNameTool:
             # Step 1: Get league ID by searching for league name
             leagues_url = f"{self.base_url}/leagues"
             leagues_params = {"search": league_name}  # Search the league by name
-            resp = requests.get(leagues_url, headers=headers, params=leagues_params, timeout=15)
+            resp = requests.get(leagues_url, headers=headers, params=leagues_params, timeout=http_timeout(15))
             resp.raise_for_status()
             data = resp.json()
 
@@ -1775,7 +1875,7 @@ class GetAllLeaguesTool:
         try:
             # Fetch all leagues
             leagues_url = f"{self.base_url}/leagues"
-            response = requests.get(leagues_url, headers=headers, timeout=15)
+            response = requests.get(leagues_url, headers=headers, timeout=http_timeout(15))
             response.raise_for_status()
             data = response.json()
 
@@ -1867,7 +1967,7 @@ class GetStandingsTool:
                     params["team"] = team
 
                 try:
-                    response = requests.get(url, headers=headers, params=params, timeout=30)
+                    response = requests.get(url, headers=headers, params=params, timeout=http_timeout(30))
                     response.raise_for_status()
                     results[league][year] = response.json()  # Store results per league & season
                 except Exception as e:
@@ -1929,7 +2029,7 @@ class GetPlayerIdTool:
         }
 
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=10)
+            response = requests.get(url, headers=headers, params=params, timeout=http_timeout(10))
             response.raise_for_status()
             data = response.json()
 
@@ -2009,7 +2109,7 @@ class GetPlayerProfileTool:
         }
 
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=15)
+            response = requests.get(url, headers=headers, params=params, timeout=http_timeout(15))
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -2073,7 +2173,7 @@ class GetPlayerStatisticsTool:
         }
         params = {"name": league_name, "season": season}  # Use season for accuracy, use 'name' instead of 'search'
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=10)
+            response = requests.get(url, headers=headers, params=params, timeout=http_timeout(10))
             response.raise_for_status()
             data = response.json()
 
@@ -2123,7 +2223,7 @@ class GetPlayerStatisticsTool:
                 params["league"] = league_id
 
             try:
-                response = requests.get(url, headers=headers, params=params, timeout=10)
+                response = requests.get(url, headers=headers, params=params, timeout=http_timeout(10))
                 response.raise_for_status()
                 data = response.json()
 
@@ -2287,7 +2387,7 @@ class GetPlayerStatisticsTool_2:
                 params["league"] = league_id
 
             try:
-                response = requests.get(url, headers=headers, params=params, timeout=10)
+                response = requests.get(url, headers=headers, params=params, timeout=http_timeout(10))
                 response.raise_for_status()
                 data = response.json()
 
@@ -2444,7 +2544,7 @@ class GetTeamFixturesTool:
         search_params = {"search": team_name}
 
         try:
-            search_resp = requests.get(search_url, headers=headers, params=search_params, timeout=15)
+            search_resp = requests.get(search_url, headers=headers, params=search_params, timeout=http_timeout(15))
             search_resp.raise_for_status()
             teams_data = search_resp.json()
 
@@ -2465,7 +2565,7 @@ class GetTeamFixturesTool:
                 # Default is 'upcoming'
                 fixtures_params["next"] = limit
 
-            fixtures_resp = requests.get(fixtures_url, headers=headers, params=fixtures_params, timeout=15)
+            fixtures_resp = requests.get(fixtures_url, headers=headers, params=fixtures_params, timeout=http_timeout(15))
             fixtures_resp.raise_for_status()
             return fixtures_resp.json()
 
@@ -2514,7 +2614,7 @@ class GetFixtureStatisticsTool:
         params = {"fixture": fixture_id}
 
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=15)
+            response = requests.get(url, headers=headers, params=params, timeout=http_timeout(15))
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -2568,7 +2668,7 @@ class GetTeamFixturesByDateRangeTool:
         # Step 1: find team ID
         teams_url = f"{self.base_url}/teams"
         teams_params = {"search": team_name}
-        resp = requests.get(teams_url, headers=headers, params=teams_params, timeout=15)
+        resp = requests.get(teams_url, headers=headers, params=teams_params, timeout=http_timeout(15))
         resp.raise_for_status()
         data = resp.json()
         # print(data)
@@ -2584,7 +2684,7 @@ class GetTeamFixturesByDateRangeTool:
             "to": to_date,
             "season": season  # or some 4-digit year
         }
-        resp_fixtures = requests.get(fixtures_url, headers=headers, params=fixtures_params, timeout=15)
+        resp_fixtures = requests.get(fixtures_url, headers=headers, params=fixtures_params, timeout=http_timeout(15))
         resp_fixtures.raise_for_status()
         return resp_fixtures.json()
 
@@ -2628,7 +2728,7 @@ class GetFixtureEventsTool:
         params = {"fixture": fixture_id}
 
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=15)
+            response = requests.get(url, headers=headers, params=params, timeout=http_timeout(15))
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -2675,7 +2775,7 @@ class GetMultipleFixturesStatsTool:
             try:
                 url = f"{self.base_url}/fixtures/statistics"
                 params = {"fixture": f_id}
-                resp = requests.get(url, headers=headers, params=params, timeout=15)
+                resp = requests.get(url, headers=headers, params=params, timeout=http_timeout(15))
                 resp.raise_for_status()
                 data = resp.json()
                 combined_results.append({f_id: data})
@@ -2738,7 +2838,7 @@ class GetLeagueScheduleByDateTool:
         try:
             leagues_url = f"{self.base_url}/leagues"
             leagues_params = {"search": league_name}
-            resp = requests.get(leagues_url, headers=headers, params=leagues_params, timeout=15)
+            resp = requests.get(leagues_url, headers=headers, params=leagues_params, timeout=http_timeout(15))
             resp.raise_for_status()
             data = resp.json()
             
@@ -2758,7 +2858,7 @@ class GetLeagueScheduleByDateTool:
                     "season": season  
                 }
                 
-                resp_fixtures = requests.get(fixtures_url, headers=headers, params=fixtures_params, timeout=15)
+                resp_fixtures = requests.get(fixtures_url, headers=headers, params=fixtures_params, timeout=http_timeout(15))
                 resp_fixtures.raise_for_status()
                 
                 results[match_date] = resp_fixtures.json()  # Store results per date
@@ -2785,7 +2885,10 @@ get_league_schedule_by_date = StructuredTool(
 from langchain.tools.base import StructuredTool
 from pydantic import BaseModel, Field
 from typing import Any, Dict
-import requests
+from app.react_agent.live_soccer import find_team_id, live_matches
+
+# All live tools read the merged per-fixture state in live_soccer.py: one shared
+# /fixtures?live=all poll plus per-fixture statistics/events, and cached team IDs.
 
 class GetLiveMatchForTeamInput(BaseModel):
     """
@@ -2798,54 +2901,29 @@ class GetLiveMatchForTeamInput(BaseModel):
 
 class GetLiveMatchForTeamTool:
     """
-    1) Resolve the team name to team ID (via /teams?search).
-    2) Check /fixtures?team=TEAM_ID&live=all to find any in-progress match.
-    3) Return the fixture data if live, else error message.
+    1) Resolve the team name to team ID (via /teams?search, cached).
+    2) Find its in-progress match in the live match state.
+    3) Return the match (teams, score, minute, status) if live, else a message.
     """
 
     def __init__(self, api_key: str):
         self.api_key = api_key
-        self.base_url = "https://api-football-v1.p.rapidapi.com/v3"
 
     def get_live_match_for_team(self, team_name: str) -> Dict[str, Any]:
-        headers = {
-            "x-rapidapi-host": "api-football-v1.p.rapidapi.com",  # RapidAPI host
-            "x-rapidapi-key": self.api_key                         # RapidAPI key
-        }
-
-        # Step 1: find team ID
         try:
-            teams_resp = requests.get(
-                f"{self.base_url}/teams",
-                headers=headers,
-                params={"search": team_name},
-                timeout=15
-            )
-            teams_resp.raise_for_status()
-            teams_data = teams_resp.json()
-
-            if not teams_data.get("response"):
+            # Step 1: find team ID
+            team_id = find_team_id(self.api_key, team_name)
+            if team_id is None:
                 return {"error": f"No team found matching '{team_name}'."}
 
-            team_id = teams_data["response"][0]["team"]["id"]
-
-            # Step 2: look for live matches
-            fixtures_resp = requests.get(
-                f"{self.base_url}/fixtures",
-                headers=headers,
-                params={"team": team_id, "live": "all"},
-                timeout=15
-            )
-            fixtures_resp.raise_for_status()
-            fixtures_data = fixtures_resp.json()
-
-            live_fixtures = fixtures_data.get("response", [])
-
-            if not live_fixtures:
+            # Step 2: look for a live match
+            match = live_matches.for_team(team_id)
+            if match is None:
                 return {"message": f"No live match found for '{team_name}' right now."}
+            if match["phase"] != "live":
+                return {"message": f"No live match found for '{team_name}' right now.", "recently_finished": match}
 
-            # Typically only 1, but if multiple, just return the first
-            return {"live_fixture": live_fixtures[0]}
+            return {"live_fixture": match}
 
         except Exception as e:
             return {"error": str(e)}
@@ -2872,60 +2950,24 @@ class GetLiveStatsForTeamInput(BaseModel):
 class GetLiveStatsForTeamTool:
     """
     1. Find team ID by name.
-    2. Find current live fixture for that team.
-    3. If found, call /fixtures/statistics?fixture=FIXTURE_ID to get live stats.
+    2. Find current live match for that team.
+    3. If found, return its statistics (/fixtures/statistics, shared per fixture).
     """
 
     def __init__(self, api_key: str):
         self.api_key = api_key
-        self.base_url = "https://api-football-v1.p.rapidapi.com/v3"
 
     def get_live_stats_for_team(self, team_name: str) -> Dict[str, Any]:
-        headers = {
-            "x-rapidapi-host": "api-football-v1.p.rapidapi.com",  # RapidAPI host
-            "x-rapidapi-key": self.api_key                         # RapidAPI key
-        }
-
         try:
-            # Step 1: get team ID
-            teams_resp = requests.get(
-                f"{self.base_url}/teams",
-                headers=headers,
-                params={"search": team_name},
-                timeout=15
-            )
-            teams_resp.raise_for_status()
-            teams_data = teams_resp.json()
-            if not teams_data.get("response"):
+            team_id = find_team_id(self.api_key, team_name)
+            if team_id is None:
                 return {"error": f"No team found matching '{team_name}'."}
-            team_id = teams_data["response"][0]["team"]["id"]
-
-            # Step 2: check for live fixtures
-            fixtures_resp = requests.get(
-                f"{self.base_url}/fixtures",
-                headers=headers,
-                params={"team": team_id, "live": "all"},
-                timeout=15
-            )
-            fixtures_resp.raise_for_status()
-            fixtures_data = fixtures_resp.json()
-            live_fixtures = fixtures_data.get("response", [])
-            if not live_fixtures:
-                return {"message": f"No live match for '{team_name}' right now."}
 
-            fixture_id = live_fixtures[0]["fixture"]["id"]
-
-            # Step 3: get stats for that fixture
-            stats_resp = requests.get(
-                f"{self.base_url}/fixtures/statistics",
-                headers=headers,
-                params={"fixture": fixture_id},
-                timeout=15
-            )
-            stats_resp.raise_for_status()
-            stats_data = stats_resp.json()
+            match = live_matches.for_team(team_id, statistics=True)
+            if match is None or match["phase"] != "live":
+                return {"message": f"No live match for '{team_name}' right now."}
 
-            return {"fixture_id": fixture_id, "live_stats": stats_data}
+            return {"fixture_id": match["fixture_id"], "live_stats": match["statistics"]}
 
         except Exception as e:
             return {"error": str(e)}
@@ -2952,60 +2994,24 @@ class GetLiveMatchTimelineInput(BaseModel):
 class GetLiveMatchTimelineTool:
     """
     1. Find the team ID by name
-    2. Check if there's a live fixture for that team
-    3. If found, call /fixtures/events?fixture=... to get timeline events
+    2. Check if there's a live match for that team
+    3. If found, return its timeline events (from the live feed, else /fixtures/events)
     """
 
     def __init__(self, api_key: str):
         self.api_key = api_key
-        self.base_url = "https://api-football-v1.p.rapidapi.com/v3"
 
     def get_live_match_timeline(self, team_name: str) -> Dict[str, Any]:
-        headers = {
-            "x-rapidapi-host": "api-football-v1.p.rapidapi.com",  # RapidAPI host
-            "x-rapidapi-key": self.api_key                         # RapidAPI key
-        }
-
         try:
-            # Step 1: team ID
-            teams_resp = requests.get(
-                f"{self.base_url}/teams",
-                headers=headers,
-                params={"search": team_name},
-                timeout=15
-            )
-            teams_resp.raise_for_status()
-            teams_data = teams_resp.json()
-            if not teams_data.get("response"):
+            team_id = find_team_id(self.api_key, team_name)
+            if team_id is None:
                 return {"error": f"No team found matching '{team_name}'."}
-            team_id = teams_data["response"][0]["team"]["id"]
-
-            # Step 2: check live fixtures
-            fixtures_resp = requests.get(
-                f"{self.base_url}/fixtures",
-                headers=headers,
-                params={"team": team_id, "live": "all"},
-                timeout=15
-            )
-            fixtures_resp.raise_for_status()
-            fixtures_data = fixtures_resp.json()
-            live_fixtures = fixtures_data.get("response", [])
-            if not live_fixtures:
-                return {"message": f"No live match for '{team_name}' right now."}
 
-            fixture_id = live_fixtures[0]["fixture"]["id"]
-
-            # Step 3: get events timeline
-            events_resp = requests.get(
-                f"{self.base_url}/fixtures/events",
-                headers=headers,
-                params={"fixture": fixture_id},
-                timeout=15
-            )
-            events_resp.raise_for_status()
-            events_data = events_resp.json()
+            match = live_matches.for_team(team_id, events=True)
+            if match is None or match["phase"] != "live":
+                return {"message": f"No live match for '{team_name}' right now."}
 
-            return {"fixture_id": fixture_id, "timeline_events": events_data}
+            return {"fixture_id": match["fixture_id"], "timeline_events": match["events"]}
 
         except Exception as e:
             return {"error": str(e)}
@@ -3020,6 +3026,56 @@ get_live_match_timeline = StructuredTool(
     args_schema=GetLiveMatchTimelineInput
 )
 
+# -------------------------------------------------------------------
+# GetLiveMatchDetailsTool
+# -------------------------------------------------------------------
+class GetLiveMatchDetailsInput(BaseModel):
+    """Input for the get_live_match_details tool."""
+
+    team_name: str = Field(
+        ...,
+        description="Team name to get the full live match state for. E.g. 'Arsenal'."
+    )
+
+class GetLiveMatchDetailsTool:
+    """Full live state of a team's match in one call.
+
+    Score, minute, status, statistics and timeline events, instead of calling
+    the three tools above.
+    """
+
+    def __init__(self, api_key: str):
+        """Use ``api_key`` to resolve team names."""
+        self.api_key = api_key
+
+    def get_live_match_details(self, team_name: str) -> Dict[str, Any]:
+        """Return the live (or recently finished) match of ``team_name`` with all details."""
+        try:
+            team_id = find_team_id(self.api_key, team_name)
+            if team_id is None:
+                return {"error": f"No team found matching '{team_name}'."}
+
+            match = live_matches.for_team(team_id, statistics=True, events=True)
+            if match is None:
+                return {"message": f"No live match for '{team_name}' right now."}
+            if match["phase"] != "live":
+                return {"message": f"No live match for '{team_name}' right now.", "recently_finished": match}
+
+            return {"live_match": match}
+
+        except Exception as e:
+            return {"error": str(e)}
+
+get_live_match_details = StructuredTool(
+    name="get_live_match_details",
+    description=(
+        "Retrieve everything about a team's live match in one call: teams, score, minute, status, "
+        "live statistics and timeline events. Input the team name. If no live match is found, returns a message."
+    ),
+    func=GetLiveMatchDetailsTool(api_key=os.getenv("RAPID_API_KEY_FOOTBALL")).get_live_match_details,
+    args_schema=GetLiveMatchDetailsInput
+)
+
 # -------------------------------------------------------------------
 # LeagueInformationTool
 # -------------------------------------------------------------------
@@ -3040,7 +3096,7 @@ class GetLeagueInfoTool:
         # Fetch league information
         league_url = f"{self.base_url}/leagues"
         params = {"search": league_name}
-        resp = requests.get(league_url, headers=headers, params=params)
+        resp = requests.get(league_url, headers=headers, params=params, timeout=http_timeout(15))
         resp.raise_for_status()
         data = resp.json()
         return data
@@ -3073,7 +3129,7 @@ class GetTeamInfoTool:
         # Fetch team information
         teams_url = f"{self.base_url}/teams"
         teams_params = {"search": team_name}
-        resp = requests.get(teams_url, headers=headers, params=teams_params)
+        resp = requests.get(teams_url, headers=headers, params=teams_params, timeout=http_timeout(15))
         resp.raise_for_status()
         data = resp.json()
         return data
@@ -3092,3 +3148,157 @@ get_team_info = StructuredTool(
 # -------------------------------------------------------------------
 
 
+
+# -------------------------------------------------------------------
+# OddsLineScannerTool (The Odds API, all bookmakers)
+# -------------------------------------------------------------------
+from app.react_agent.bets import OddsAPI, OddsScanner
+
+
+class OddsLineScannerInput(BaseModel):
+    """Input for the odds_line_scanner tool."""
+
+    sport_key: str = Field(
+        ...,
+        description="The Odds API sport key, e.g. 'basketball_nba', 'baseball_mlb', 'soccer_epl', 'soccer_uefa_champs_league'."
+    )
+    markets: str = Field(default="h2h", description="Comma-separated markets: 'h2h', 'spreads', 'totals'.")
+    regions: str = Field(default="us", description="Bookmaker regions: 'us', 'uk', 'eu', 'au' (comma-separated).")
+    arbitrage_only: bool = Field(default=False, description="If true, return only lines with an arbitrage opportunity.")
+    limit: int = Field(default=20, description="Maximum number of lines to return (arbitrage and lowest margin first).")
+
+class OddsLineScannerTool:
+    """Best lines and arbitrage across all bookmakers of a sport.
+
+    Fetches the odds of every upcoming/live event of a sport across all
+    bookmakers (cached, see bets.OddsAPI) and scans them in one vectorized pass.
+    """
+
+    def __init__(self, api_key: str):
+        """Create the tool with its own (caching) Odds API client."""
+        self.odds_api = OddsAPI(api_key)
+
+    def scan_odds(self, sport_key: str, markets: str = "h2h", regions: str = "us",
+                  arbitrage_only: bool = False, limit: int = 20) -> Dict[str, Any]:
+        """Return the scanned lines of ``sport_key``, arbitrage and lowest margin first."""
+        try:
+            events = self.odds_api.get_odds(sport_key, regions, markets, odds_format="american")
+            if events is None:
+                return {"error": f"Could not retrieve odds for '{sport_key}'."}
+            lines = OddsScanner.scan(events, "american", arbitrage_only=arbitrage_only, limit=limit)
+            return {"sport_key": sport_key, "events": len(events), "lines": lines}
+        except Exception as e:
+            return {"error": str(e)}
+
+odds_line_scanner = StructuredTool(
+    name="odds_line_scanner",
+    description=(
+        "Compare betting odds across all bookmakers for a sport: best available price and bookmaker per outcome, "
+        "implied probabilities, overround (bookmaker margin) and arbitrage opportunities for every event. "
+        "Prices are American odds."
+    ),
+    func=OddsLineScannerTool(api_key=os.getenv("ODDS_API_KEY")).scan_odds,
+    args_schema=OddsLineScannerInput
+)
+
+# -------------------------------------------------------------------
+# OddsLineMovementTool (local historical odds store, backfilled on read)
+# -------------------------------------------------------------------
+from datetime import UTC
+
+from app.react_agent.odds_history import OddsHistoryStore, recent_timestamps
+
+
+class OddsLineMovementInput(BaseModel):
+    """Input for the odds_line_movement tool."""
+
+    sport_key: str = Field(..., description="The Odds API sport key, e.g. 'basketball_nba'.")
+    event_id: str | None = Field(
+        default=None,
+        description="The Odds API event ID (from odds_line_scanner). Leave empty to list the events that have stored history."
+    )
+    market: str = Field(default="h2h", description="Market: 'h2h', 'spreads' or 'totals'.")
+    regions: str = Field(default="us", description="Bookmaker regions: 'us', 'uk', 'eu', 'au' (comma-separated).")
+    bookmaker: str | None = Field(default=None, description="Only this bookmaker key, e.g. 'draftkings'.")
+    outcome: str | None = Field(default=None, description="Only this outcome, e.g. a team name, 'Over' or 'Under'.")
+
+class OddsLineMovementTool:
+    """Line-movement series from the local historical odds store.
+
+    Before reading an event, the snapshots of the ``hours`` before now (or
+    before kick-off, for events that have started) are backfilled every
+    ``step_hours`` from The Odds API. Only dates the store has not fetched
+    yet cost credits. The store is opened on first use.
+    """
+
+    def __init__(self, api_key: str, hours: float = 24, step_hours: float = 3):
+        """Create the tool with its own (caching) Odds API client."""
+        self.odds_api = OddsAPI(api_key)
+        self.window = timedelta(hours=hours)
+        self.step = timedelta(hours=step_hours)
+        self.store = None
+
+    def snapshot_dates(self, sport_key: str, event_id: str) -> List[str]:
+        """Return the request dates to backfill for an event, ending at kick-off once it has started."""
+        end = datetime.now(UTC)
+        for event in self.odds_api.get_events(sport_key) or []:
+            if event.get("id") == event_id and event.get("commence_time"):
+                end = min(end, datetime.fromisoformat(event["commence_time"].replace("Z", "+00:00")))
+        return recent_timestamps(end, self.window, self.step)
+
+    def line_movement(self, sport_key: str, event_id: str | None = None, market: str = "h2h", regions: str = "us",
+                      bookmaker: str | None = None, outcome: str | None = None) -> Dict[str, Any]:
+        """Return the event's price series, or the sport's stored events if no event is given."""
+        try:
+            if self.store is None:
+                self.store = OddsHistoryStore()
+            if not event_id:
+                return {"sport_key": sport_key, "events": self.store.events(sport_key)}
+            self.store.backfill(self.odds_api, sport_key, event_id, self.snapshot_dates(sport_key, event_id),
+                                regions=regions, markets=market)
+            series = self.store.line_movement(sport_key, event_id, market, bookmaker, outcome)
+            if not series:
+                return {"message": f"No {market} history found for event '{event_id}'."}
+            return {"event_id": event_id, "market": market, "series": series}
+        except Exception as e:
+            return {"error": str(e)}
+
+odds_line_movement = StructuredTool(
+    name="odds_line_movement",
+    description=(
+        "Show how betting lines moved over time for an event (price series per bookmaker and outcome) "
+        "over the last day, or the day before kick-off. Snapshots not stored locally yet are fetched first. "
+        "Without an event_id, lists the events with stored history."
+    ),
+    func=OddsLineMovementTool(api_key=os.getenv("ODDS_API_KEY")).line_movement,
+    args_schema=OddsLineMovementInput
+)
+
+# -------------------------------------------------------------------
+# Full toolset per sport (used by the flat single-agent mode)
+# -------------------------------------------------------------------
+mlb_all_tools = [mlb_get_schedule_tool, mlb_get_team_roster_tool, mlb_get_team_info_tool, mlb_get_player_info_tool,
+                 mlb_get_live_game_data_tool, mlb_get_game_timestamps_tool, mlb_get_team_id_tool, mlb_get_player_id_tool,
+                 mlb_get_game_ids_by_date_tool, mlb_find_one_game_id_tool, mlb_get_venue_id_tool, odds_line_scanner, odds_line_movement, tavily_search_tool]
+
+nba_all_tools = [nba_live_scoreboard, nba_live_boxscore, nba_live_play_by_play, nba_common_player_info,
+                 nba_player_career_stats, nba_search_players, nba_search_teams, nba_list_active_players,
+                 nba_list_todays_games, nba_team_game_logs, nba_team_game_logs_by_name, nba_fetch_game_results,
+                 nba_team_standings, nba_team_stats_by_name, nba_all_teams_stats, nba_player_game_logs, odds_line_scanner, odds_line_movement, tavily_search_tool]
+
+soccer_all_tools = [get_league_id_by_name, get_all_leagues_id, get_standings, get_player_id, get_player_profile,
+                    get_player_statistics, get_player_statistics_2, get_team_fixtures, get_fixture_statistics,
+                    get_team_fixtures_by_date_range, get_fixture_events, get_multiple_fixtures_stats,
+                    get_league_schedule_by_date, get_live_match_for_team, get_live_stats_for_team,
+                    get_live_match_timeline, get_live_match_details, get_league_info, get_team_info, odds_line_scanner, odds_line_movement, tavily_search_tool]
+
+
+# -------------------------------------------------------------------
+# Instrumentation: latency, result size and errors per tool, and every
+# upstream HTTP request per host (served at /metrics, see metrics.py)
+# -------------------------------------------------------------------
+instrument_requests()
+instrument_tools(list(globals().values()))
+
+# Record/replay of the upstream HTTP traffic (HTTP_CASSETTE_MODE, see cassettes.py)
+cassettes.install_from_env()
@@ -0,0 +1,259 @@
+"""LLM token, cost and latency accounting per graph node and sub-agent.
+
+``UsageTracker`` is a callback handler attached to one request's config
+(``{"callbacks": [tracker]}``). LangChain hands callbacks down to every
+nested runnable, so it sees each chat model call anywhere in the run: the
+split_node router, every ``create_supervisor`` hop and worker agent, and the
+synthesis in combine_results.
+
+Each call is attributed to:
+
+- ``node``: the graph path from the checkpoint namespace, e.g.
+  ``split_query`` or ``parallel_supervisors/supervisor`` or
+  ``parallel_supervisors/live_game_agent/agent`` (IDs stripped);
+- ``sub_agent``: the supervisor running the sub-query (set by
+  ``runner.run_supervisor`` through ``sub_agent_scope``), or ``-``.
+
+``summary()`` gives the per-request trace: totals, per-node/sub-agent token,
+cost and latency figures, and the wall-clock time of every graph node. Every
+finished call is also added to the process-wide Prometheus metrics (served at
+``/metrics``, see metrics.py).
+
+Costs use USD prices per million input/output tokens from ``DEFAULT_PRICES``,
+which ``LLM_PRICES`` (JSON, e.g. ``{"gpt-4o": [2.5, 10]}``) extends or
+overrides. Unknown models are counted with a cost of 0.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from prometheus_client import Counter, Histogram
+
+from app.react_agent.metrics import LATENCY_BUCKETS, registry
+
+# USD per 1M (input, output) tokens, matched against the model name without provider
+DEFAULT_PRICES: Dict[str, Tuple[float, float]] = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+    "claude-3-5-sonnet": (3.00, 15.00),
+    "claude-3-5-haiku": (0.80, 4.00),
+}
+
+LLM_TOKENS = Counter(
+    "llm_tokens", "LLM tokens by graph node, sub-agent, model and kind (input or output).",
+    ["node", "sub_agent", "model", "kind"], registry=registry,
+)
+LLM_COST = Counter(
+    "llm_cost_usd", "Estimated LLM cost in USD.", ["node", "sub_agent", "model"], registry=registry,
+)
+LLM_LATENCY = Histogram(
+    "llm_latency_seconds", "Latency of LLM calls.", ["node", "sub_agent", "model", "status"],
+    buckets=LATENCY_BUCKETS, registry=registry,
+)
+
+sub_agent: ContextVar[str] = ContextVar("sub_agent", default="-")
+
+
+@contextmanager
+def sub_agent_scope(name: str) -> Iterator[None]:
+    """Attribute the LLM calls made inside the block to the sub-agent ``name``."""
+    token = sub_agent.set(name)
+    try:
+        yield
+    finally:
+        sub_agent.reset(token)
+
+
+def load_prices() -> Dict[str, Tuple[float, float]]:
+    """Return the per-model prices: the defaults overridden by ``LLM_PRICES``."""
+    prices = dict(DEFAULT_PRICES)
+    prices.update({model: tuple(price) for model, price in json.loads(os.getenv("LLM_PRICES") or "{}").items()})
+    return prices
+
+
+def price_for(model: str, prices: Dict[str, Tuple[float, float]]) -> Tuple[float, float]:
+    """Exact match first, then the longest known prefix (dated snapshots such as gpt-4o-2024-08-06)."""
+    name = model.split("/", 1)[-1]
+    if name in prices:
+        return prices[name]
+    matches = [key for key in prices if name.startswith(key)]
+    return prices[max(matches, key=len)] if matches else (0.0, 0.0)
+
+
+def node_path(metadata: Dict[str, Any] | None) -> str:
+    """``a:<id>|b:<id>`` checkpoint namespace -> ``a/b``; falls back to the node name."""
+    metadata = metadata or {}
+    namespace = metadata.get("langgraph_checkpoint_ns") or metadata.get("checkpoint_ns")
+    if namespace:
+        return "/".join(part.split(":", 1)[0] for part in namespace.split("|"))
+    return metadata.get("langgraph_node") or "-"
+
+
+def token_usage(response: LLMResult) -> Tuple[int, int]:
+    """(input, output) tokens from the message usage metadata or the provider's llm_output."""
+    input_tokens = output_tokens = 0
+    found = False
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                found = True
+                input_tokens += usage.get("input_tokens", 0)
+                output_tokens += usage.get("output_tokens", 0)
+    if not found:
+        usage = (response.llm_output or {}).get("token_usage") or (response.llm_output or {}).get("usage") or {}
+        input_tokens = usage.get("prompt_tokens", usage.get("input_tokens", 0))
+        output_tokens = usage.get("completion_tokens", usage.get("output_tokens", 0))
+    return input_tokens, output_tokens
+
+
+def _model_name(serialized: Dict[str, Any] | None, metadata: Dict[str, Any] | None, kwargs: Dict[str, Any]) -> str:
+    params = kwargs.get("invocation_params") or {}
+    return (
+        (metadata or {}).get("ls_model_name")
+        or params.get("model_name") or params.get("model")
+        or ((serialized or {}).get("kwargs") or {}).get("model_name")
+        or "-"
+    )
+
+
+class UsageTracker(BaseCallbackHandler):
+    """Collects the LLM calls and node timings of one request."""
+
+    run_inline = True  # keep the caller's context (sub_agent) and avoid a thread hop
+
+    def __init__(self, prices: Dict[str, Tuple[float, float]] | None = None):
+        """Start tracking now; ``prices`` default to ``load_prices()``."""
+        self.prices = prices if prices is not None else load_prices()
+        self.started = time.perf_counter()
+        self.calls: List[Dict[str, Any]] = []
+        self.node_seconds: Dict[str, float] = defaultdict(float)
+        self._llm_runs: Dict[UUID, Dict[str, Any]] = {}
+        self._node_runs: Dict[UUID, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # LLM calls
+    # ------------------------------------------------------------------
+    def _start(self, serialized: Dict[str, Any], run_id: UUID, metadata: Dict[str, Any] | None, kwargs: Dict[str, Any]) -> None:
+        with self._lock:
+            self._llm_runs[run_id] = {
+                "node": node_path(metadata),
+                "sub_agent": sub_agent.get(),
+                "model": _model_name(serialized, metadata, kwargs),
+                "started": time.perf_counter(),
+            }
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs) -> None:
+        """Start timing a chat model call."""
+        self._start(serialized, run_id, metadata, kwargs)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, metadata=None, **kwargs) -> None:
+        """Start timing a completion model call."""
+        self._start(serialized, run_id, metadata, kwargs)
+
+    def on_llm_end(self, response: LLMResult, *, run_id, **kwargs) -> None:
+        """Record a finished call with its token usage."""
+        input_tokens, output_tokens = token_usage(response)
+        self._finish(run_id, "ok", input_tokens, output_tokens)
+
+    def on_llm_error(self, error: BaseException, *, run_id, **kwargs) -> None:
+        """Record a failed call."""
+        self._finish(run_id, "error", 0, 0)
+
+    def _finish(self, run_id: UUID, status: str, input_tokens: int, output_tokens: int) -> None:
+        with self._lock:
+            run = self._llm_runs.pop(run_id, None)
+        if run is None:
+            return
+        input_price, output_price = price_for(run["model"], self.prices)
+        call = {
+            "node": run["node"],
+            "sub_agent": run["sub_agent"],
+            "model": run["model"],
+            "status": status,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "cost_usd": (input_tokens * input_price + output_tokens * output_price) / 1e6,
+            "seconds": time.perf_counter() - run["started"],
+        }
+        with self._lock:
+            self.calls.append(call)
+        labels = (call["node"], call["sub_agent"], call["model"])
+        LLM_TOKENS.labels(*labels, "input").inc(input_tokens)
+        LLM_TOKENS.labels(*labels, "output").inc(output_tokens)
+        LLM_COST.labels(*labels).inc(call["cost_usd"])
+        LLM_LATENCY.labels(*labels, status).observe(call["seconds"])
+
+    # ------------------------------------------------------------------
+    # Graph node wall-clock time
+    # ------------------------------------------------------------------
+    def on_chain_start(self, serialized, inputs, *, run_id, metadata=None, **kwargs) -> None:
+        """Start timing a graph node."""
+        # A node's own run carries the node's name; runnables inside it do not.
+        node = (metadata or {}).get("langgraph_node")
+        if node is not None and kwargs.get("name") == node:
+            with self._lock:
+                self._node_runs[run_id] = (node_path(metadata), time.perf_counter())
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs) -> None:
+        """Add a finished node's wall-clock time."""
+        self._end_node(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs) -> None:
+        """Add a failed node's wall-clock time."""
+        self._end_node(run_id)
+
+    def _end_node(self, run_id: UUID) -> None:
+        with self._lock:
+            run = self._node_runs.pop(run_id, None)
+            if run is not None:
+                self.node_seconds[run[0]] += time.perf_counter() - run[1]
+
+    # ------------------------------------------------------------------
+    # Trace summary
+    # ------------------------------------------------------------------
+    def summary(self) -> Dict[str, Any]:
+        """Totals, per node/sub-agent LLM figures and node wall-clock time for the request."""
+        with self._lock:
+            calls = list(self.calls)
+            node_seconds = dict(self.node_seconds)
+        by_node: Dict[str, Dict[str, Any]] = {}
+        for call in calls:
+            key = call["node"] if call["sub_agent"] == "-" else f"{call['sub_agent']}:{call['node']}"
+            entry = by_node.setdefault(key, {
+                "calls": 0, "errors": 0, "input_tokens": 0, "output_tokens": 0,
+                "cost_usd": 0.0, "llm_seconds": 0.0, "models": [],
+            })
+            entry["calls"] += 1
+            entry["errors"] += call["status"] == "error"
+            entry["input_tokens"] += call["input_tokens"]
+            entry["output_tokens"] += call["output_tokens"]
+            entry["cost_usd"] += call["cost_usd"]
+            entry["llm_seconds"] += call["seconds"]
+            if call["model"] not in entry["models"]:
+                entry["models"].append(call["model"])
+        for entry in by_node.values():
+            entry["cost_usd"] = round(entry["cost_usd"], 6)
+            entry["llm_seconds"] = round(entry["llm_seconds"], 3)
+        return {
+            "wall_seconds": round(time.perf_counter() - self.started, 3),
+            "llm_calls": len(calls),
+            "input_tokens": sum(call["input_tokens"] for call in calls),
+            "output_tokens": sum(call["output_tokens"] for call in calls),
+            "cost_usd": round(sum(call["cost_usd"] for call in calls), 6),
+            "llm_seconds": round(sum(call["seconds"] for call in calls), 3),
+            "by_node": dict(sorted(by_node.items(), key=lambda item: -item[1]["cost_usd"])),
+            "node_seconds": {node: round(seconds, 3) for node, seconds in sorted(node_seconds.items())},
+        }
@@ -0,0 +1,6 @@
+"""Benchmarks for the sport graphs.
+
+These scripts call the real LLM providers and sports APIs, so they need the
+same API keys as the app. Run them from the repository root, e.g.
+``python -m benchmarks.model_tiering``.
+"""
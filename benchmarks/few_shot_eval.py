@@ -0,0 +1,127 @@
+"""Offline evaluation of dynamic few-shot example retrieval.
+
+Two checks, both comparing "all examples inlined" with "top-k retrieved":
+
+1. Retrieval agreement (no LLM calls): every worked example is held out in
+   turn and its question is used to retrieve ``k`` of the remaining examples.
+   A hit means a retrieved example routes the same way, i.e. starts with the
+   same tool (agent prompts) or uses the same supervisors (split_node).
+   Prompt tokens per call are reported for all examples vs. the top ``k``.
+
+2. Routing accuracy (``--live``, calls the router model): the labelled
+   ``ROUTING_QUESTIONS`` are decomposed by ``split_node`` for each ``k`` and
+   the assigned supervisors are compared with the labels.
+
+    python -m benchmarks.few_shot_eval --k 1 2 3
+    python -m benchmarks.few_shot_eval --live --k 0 2 100
+"""
+
+import argparse
+import asyncio
+import re
+import statistics
+from typing import Any, Callable, Dict, FrozenSet, List, Sequence
+
+from langchain_community.callbacks import get_openai_callback
+from langchain_core.messages import HumanMessage
+
+from app.react_agent import prompts
+from app.react_agent.examples import ExampleStore, example_question, format_examples
+from app.react_agent.nba import graph as nba_graph
+from app.react_agent.prompt_layout import AgentPrompt
+from app.react_agent.soccer import graph as soccer_graph
+from benchmarks.harness import format_table
+from benchmarks.prompt_report import count_tokens
+from benchmarks.questions import ROUTING_QUESTIONS
+
+SPLIT_NODES = {"nba": nba_graph, "soccer": soccer_graph}
+
+_ACTION = re.compile(r"^Action:\s*`?(\w+)", re.MULTILINE)
+_SUPERVISOR = re.compile(r'"supervisor":\s*"(\w+)"')
+
+
+def first_action(example: str) -> str:
+    """Return the first tool an agent example calls."""
+    match = _ACTION.search(example)
+    return match.group(1) if match else ""
+
+
+def supervisors(example: str) -> FrozenSet[str]:
+    """Return the supervisors a split-node example routes to."""
+    return frozenset(_SUPERVISOR.findall(example))
+
+
+def example_sets() -> Dict[str, tuple]:
+    """Every example list with the label function used to judge a retrieval hit."""
+    sets: Dict[str, tuple] = {}
+    for variable, value in vars(prompts).items():
+        if isinstance(value, AgentPrompt) and len(value.examples) > 1:
+            sets[variable] = (value.examples, first_action)
+    for sport, module in SPLIT_NODES.items():
+        sets[f"{sport}.split_node"] = (module.SPLIT_EXAMPLES, supervisors)
+    return sets
+
+
+def leave_one_out(examples: Sequence[str], label: Callable[[str], Any], k: int) -> Dict[str, float]:
+    """Hit rate of top-``k`` retrieval and prompt tokens per call, all vs. top-k."""
+    hits = []
+    retrieved_tokens = []
+    for held_out, example in enumerate(examples):
+        rest = [other for i, other in enumerate(examples) if i != held_out]
+        retrieved = ExampleStore(rest).search(example_question(example) or example, k)
+        hits.append(any(label(other) == label(example) for other in retrieved))
+        retrieved_tokens.append(count_tokens(format_examples(retrieved)))
+    return {
+        "hit@k": statistics.fmean(hits),
+        "tokens_all": count_tokens(format_examples(examples)),
+        "tokens_k": statistics.fmean(retrieved_tokens),
+    }
+
+
+def retrieval_report(ks: Sequence[int]) -> List[Dict[str, Any]]:
+    """Leave-one-out retrieval figures for every example set and ``k``."""
+    rows = []
+    for name, (examples, label) in example_sets().items():
+        for k in ks:
+            rows.append({"examples": name, "n": len(examples), "k": k, **leave_one_out(examples, label, k)})
+    return rows
+
+
+async def routing_report(ks: Sequence[int]) -> List[Dict[str, Any]]:
+    """Routing accuracy and prompt tokens of each split node per ``k`` (calls the LLM)."""
+    rows = []
+    for sport, module in SPLIT_NODES.items():
+        for k in ks:
+            correct = []
+            prompt_tokens = []
+            for item in ROUTING_QUESTIONS[sport]:
+                state = {"messages": [HumanMessage(content=item["question"])]}
+                with get_openai_callback() as usage:
+                    output = await module.split_node(state, {"configurable": {"few_shot_k": k}})
+                routed = {sub_query["supervisor"] for sub_query in output["sub_queries"]}
+                correct.append(routed == item["supervisors"])
+                prompt_tokens.append(usage.prompt_tokens)
+            rows.append({
+                "sport": sport,
+                "k": k,
+                "accuracy": statistics.fmean(correct),
+                "prompt_tokens": statistics.fmean(prompt_tokens),
+            })
+    return rows
+
+
+async def main() -> None:
+    """Print the retrieval report and, with ``--live``, the routing report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--k", nargs="+", type=int, default=[1, 2, 3])
+    parser.add_argument("--live", action="store_true", help="also measure split_node routing accuracy")
+    args = parser.parse_args()
+
+    print(format_table(retrieval_report([k for k in args.k if k > 0])))
+    if args.live:
+        print()
+        print(format_table(await routing_report(args.k)))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
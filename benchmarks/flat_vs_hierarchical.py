@@ -0,0 +1,35 @@
+"""Compare the flat single-agent mode with the supervisor hierarchy.
+
+Runs the same question set through ``app_<sport>`` and ``app_<sport>_flat``
+and reports latency, OpenAI tokens per question and keyword accuracy:
+
+    python -m benchmarks.flat_vs_hierarchical --sports nba --tool-k 4 6 8
+"""
+
+import argparse
+import asyncio
+
+from benchmarks.harness import format_table, load_graph, run_suite
+
+
+async def main() -> None:
+    """Run the question suites on both graphs (the flat one once per ``--tool-k``) and print the table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sports", nargs="+", default=["nba", "soccer", "mlb"])
+    parser.add_argument("--tool-k", nargs="+", type=int, default=[6], help="flat_tool_k values to try")
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    rows = []
+    for sport in args.sports:
+        summary = await run_suite(load_graph(sport, "hierarchical"), sport, repeat=args.repeat)
+        rows.append({"sport": sport, "mode": "hierarchical", **summary})
+        flat_graph = load_graph(sport, "flat")
+        for k in args.tool_k:
+            summary = await run_suite(flat_graph, sport, {"configurable": {"flat_tool_k": k}}, args.repeat)
+            rows.append({"sport": sport, "mode": f"flat(k={k})", **summary})
+    print(format_table(rows))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
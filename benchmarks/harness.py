@@ -0,0 +1,89 @@
+"""Shared helpers for running benchmark questions through the sport graphs."""
+
+import importlib
+import statistics
+import time
+from typing import Any, Dict, List, Sequence
+
+from langchain_community.callbacks import get_openai_callback
+from langchain_core.messages import HumanMessage
+from langchain_core.runnables import RunnableConfig
+
+from app.react_agent.utils import get_message_text
+from benchmarks.questions import QUESTIONS, score_answer
+
+GRAPHS = {
+    ("nba", "hierarchical"): ("app.react_agent.nba.graph", "app_nba"),
+    ("soccer", "hierarchical"): ("app.react_agent.soccer.graph", "app_soccer"),
+    ("mlb", "hierarchical"): ("app.react_agent.mlb.graph", "app_mlb"),
+    ("nba", "flat"): ("app.react_agent.flat", "app_nba_flat"),
+    ("soccer", "flat"): ("app.react_agent.flat", "app_soccer_flat"),
+    ("mlb", "flat"): ("app.react_agent.flat", "app_mlb_flat"),
+}
+
+
+def load_graph(sport: str, mode: str = "hierarchical") -> Any:
+    """Import the compiled graph for ``sport`` in the given execution mode."""
+    module_name, attribute = GRAPHS[(sport, mode)]
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+async def run_question(graph: Any, question: str, config: RunnableConfig | None = None) -> Dict[str, Any]:
+    """Run one question and return its wall time, OpenAI token usage and final answer text."""
+    start = time.perf_counter()
+    with get_openai_callback() as usage:
+        result = await graph.ainvoke({"messages": [HumanMessage(content=question)]}, config)
+    return {
+        "seconds": time.perf_counter() - start,
+        "tokens": usage.total_tokens,
+        "answer": get_message_text(result["messages"][-1]),
+    }
+
+
+async def run_suite(graph: Any, sport: str, config: RunnableConfig | None = None, repeat: int = 1) -> Dict[str, float]:
+    """Run every question for ``sport`` and summarize latency and accuracy."""
+    latencies: List[float] = []
+    tokens: List[int] = []
+    scores: List[float] = []
+    errors = 0
+    for _ in range(repeat):
+        for item in QUESTIONS[sport]:
+            try:
+                outcome = await run_question(graph, item["question"], config)
+            except Exception:
+                errors += 1
+                scores.append(0.0)
+                continue
+            latencies.append(outcome["seconds"])
+            tokens.append(outcome["tokens"])
+            scores.append(score_answer(outcome["answer"], item["expected"]))
+    return summarize(latencies, tokens, scores, errors)
+
+
+def summarize(
+    latencies: Sequence[float],
+    tokens: Sequence[int],
+    scores: Sequence[float],
+    errors: int = 0,
+) -> Dict[str, float]:
+    """p50/p95 latency, mean tokens, mean accuracy and error count for one suite run."""
+    ordered = sorted(latencies)
+    return {
+        "p50_s": statistics.median(ordered) if ordered else float("nan"),
+        "p95_s": ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))] if ordered else float("nan"),
+        "tokens": statistics.fmean(tokens) if tokens else float("nan"),
+        "accuracy": statistics.fmean(scores) if scores else float("nan"),
+        "errors": errors,
+    }
+
+
+def format_table(rows: List[Dict[str, Any]]) -> str:
+    """Render result rows as a fixed-width text table."""
+    if not rows:
+        return ""
+    columns = list(rows[0])
+    cells = [[f"{row[c]:.3f}" if isinstance(row[c], float) else str(row[c]) for c in columns] for row in rows]
+    widths = [max(len(c), *(len(r[i]) for r in cells)) for i, c in enumerate(columns)]
+    lines = ["  ".join(c.ljust(w) for c, w in zip(columns, widths))]
+    lines += ["  ".join(v.ljust(w) for v, w in zip(r, widths)) for r in cells]
+    return "\n".join(lines)
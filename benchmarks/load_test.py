@@ -0,0 +1,141 @@
+"""Load-test app_nba / app_soccer offline with scripted LLM outputs.
+
+Record once, with API keys and network access. This captures every LLM call
+into a script and every upstream response into the HTTP cassettes:
+
+    python -m benchmarks.load_test --record --sports nba soccer
+
+Then replay at any concurrency without a key or network. The scripted model
+(app/react_agent/scripted_llm.py) sleeps for the recorded LLM time or for
+``--llm-latency`` seconds. The cassettes inject ``--http-latency``:
+
+    python -m benchmarks.load_test --requests 200 --concurrency 1 8 32
+    python -m benchmarks.load_test --llm-latency 0.5 --http-latency recorded
+
+Reports throughput, latency percentiles, errors and LLM calls per question.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+import uuid
+from typing import Any, Dict, List
+
+from langchain_core.messages import HumanMessage
+
+from benchmarks.questions import QUESTIONS
+
+# The app modules (model registry, tools, harness) are imported inside the
+# functions below: they read the environment that main() sets up on import.
+
+
+def parse_args() -> argparse.Namespace:
+    """Command-line options (see the module docstring)."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sports", nargs="+", default=["nba", "soccer"])
+    parser.add_argument("--record", action="store_true", help="run the real models once and record them")
+    parser.add_argument("--script", default="data/llm_script.json")
+    parser.add_argument("--cassettes", default=None, help="cassette directory (default: HTTP_CASSETTE_DIR)")
+    parser.add_argument("--requests", type=int, default=50, help="questions per sport and concurrency level")
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 8, 32])
+    parser.add_argument("--llm-latency", default="recorded", help="'recorded' or seconds per LLM call")
+    parser.add_argument("--http-latency", default="0", help="'recorded' or seconds per upstream request")
+    return parser.parse_args()
+
+
+def configure(args: argparse.Namespace) -> None:
+    """Point the model registry and the tools at the script and the cassettes."""
+    if args.record:
+        os.environ["HTTP_CASSETTE_MODE"] = "record"
+    else:
+        os.environ["LLM_SCRIPT"] = args.script
+        os.environ["LLM_SCRIPT_LATENCY"] = args.llm_latency
+        os.environ["HTTP_CASSETTE_MODE"] = "replay"
+        os.environ["HTTP_REPLAY_LATENCY"] = args.http_latency
+        os.environ.setdefault("OPENAI_API_KEY", "sk-unused-by-this-benchmark")
+    if args.cassettes:
+        os.environ["HTTP_CASSETTE_DIR"] = args.cassettes
+
+
+async def ask(graph: Any, question: str, callbacks: List[Any]) -> Dict[str, Any]:
+    """Run one question through ``graph`` and time it."""
+    from app.react_agent.usage import UsageTracker
+
+    tracker = UsageTracker()
+    config = {"configurable": {"thread_id": uuid.uuid4().hex}, "callbacks": [tracker, *callbacks]}
+    started = time.perf_counter()
+    await graph.ainvoke({"messages": [HumanMessage(content=question)]}, config)
+    return {"seconds": time.perf_counter() - started, "llm_calls": tracker.summary()["llm_calls"]}
+
+
+async def load(graph: Any, sport: str, requests: int, concurrency: int) -> Dict[str, Any]:
+    """Ask ``requests`` questions with at most ``concurrency`` in flight."""
+    from benchmarks.harness import summarize
+
+    questions = [item["question"] for item in QUESTIONS[sport]]
+    slots = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    llm_calls: List[int] = []
+    errors = 0
+
+    async def one(i: int) -> None:
+        nonlocal errors
+        async with slots:
+            try:
+                outcome = await ask(graph, questions[i % len(questions)], [])
+            except Exception:
+                errors += 1
+                return
+        latencies.append(outcome["seconds"])
+        llm_calls.append(outcome["llm_calls"])
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - started
+    summary = summarize(latencies, [], [], errors)
+    return {
+        "sport": sport,
+        "concurrency": concurrency,
+        "req_per_s": len(latencies) / elapsed,
+        "p50_s": summary["p50_s"],
+        "p95_s": summary["p95_s"],
+        "llm_calls": statistics.fmean(llm_calls) if llm_calls else float("nan"),
+        "errors": errors,
+    }
+
+
+async def record(sports: List[str], script: str) -> None:
+    """Run every question once against the real models and save their outputs."""
+    from app.react_agent.scripted_llm import ScriptRecorder
+    from benchmarks.harness import load_graph
+
+    recorder = ScriptRecorder()
+    for sport in sports:
+        graph = load_graph(sport)
+        for item in QUESTIONS[sport]:
+            await ask(graph, item["question"], [recorder])
+    recorder.save(script)
+    print(f"Recorded {sum(len(calls) for calls in recorder.calls.values())} LLM calls to {script}")
+
+
+async def main() -> None:
+    """Record the script, or replay it at each concurrency level."""
+    args = parse_args()
+    configure(args)
+    from benchmarks.harness import format_table, load_graph
+
+    if args.record:
+        await record(args.sports, args.script)
+        return
+    rows = []
+    for sport in args.sports:
+        graph = load_graph(sport)
+        for concurrency in args.concurrency:
+            rows.append(await load(graph, sport, args.requests, concurrency))
+    print(format_table(rows))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
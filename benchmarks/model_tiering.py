@@ -0,0 +1,44 @@
+"""Compare end-to-end latency and answer accuracy across model tierings.
+
+Every tiering is a set of ``Configuration`` overrides passed through the run's
+config, so the same compiled graphs are reused for all of them:
+
+    python -m benchmarks.model_tiering --sports nba soccer --repeat 2
+"""
+
+import argparse
+import asyncio
+from typing import Dict
+
+from benchmarks.harness import format_table, load_graph, run_suite
+
+LARGE = "openai/gpt-4o"
+SMALL = "openai/gpt-4o-mini"
+
+TIERINGS: Dict[str, Dict[str, str]] = {
+    "all-large": {"router_model": LARGE, "lookup_model": LARGE, "agent_model": LARGE, "synthesis_model": LARGE},
+    # Configuration defaults: small routing/lookups, large agents/synthesis.
+    "tiered": {},
+    "all-small": {"router_model": SMALL, "lookup_model": SMALL, "agent_model": SMALL, "synthesis_model": SMALL},
+}
+
+
+async def main() -> None:
+    """Run the question suites once per tiering and print the comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sports", nargs="+", default=["nba", "soccer", "mlb"])
+    parser.add_argument("--tierings", nargs="+", default=list(TIERINGS), choices=list(TIERINGS))
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    rows = []
+    for sport in args.sports:
+        graph = load_graph(sport)
+        for name in args.tierings:
+            summary = await run_suite(graph, sport, {"configurable": TIERINGS[name]}, args.repeat)
+            rows.append({"sport": sport, "tiering": name, **summary})
+    print(format_table(rows))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,140 @@
+"""Microbenchmark: scalar vs. NumPy-vectorized odds math in OddsDataProcessor.
+
+Builds a synthetic full slate (events x alternate points, American prices)
+and times, per operation, the per-item Python path against the array path.
+Results of both paths are checked to agree before timing. It also times
+OddsScanner on a synthetic get_odds response (events x bookmakers x
+h2h/spreads/totals). No network:
+
+    python -m benchmarks.odds_math --events 500 --points 20
+"""
+
+import argparse
+import math
+import random
+import timeit
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from app.react_agent.bets import OddsDataProcessor, OddsScanner
+from benchmarks.harness import format_table
+
+Outcome = Dict[str, float]
+
+
+def synthetic_slate(events: int, points: int, seed: int = 0) -> List[Tuple[List[Outcome], List[Outcome]]]:
+    """Alternate lines per event around a random center, priced with a ~4.5% margin."""
+    rng = random.Random(seed)
+    slate = []
+    for _ in range(events):
+        center = rng.uniform(-12, 12)
+        side_1, side_2 = [], []
+        for k in range(points):
+            point = round(center + (k - points // 2) * 0.5, 1)
+            p = 1 / (1 + math.exp(-(point - center) / 3 + rng.uniform(-0.05, 0.05)))
+            side_1.append({"point": point, "price": OddsDataProcessor.decimal_to_american(1 / (p * 1.045))})
+            side_2.append({"point": point, "price": OddsDataProcessor.decimal_to_american(1 / ((1 - p) * 1.045))})
+        slate.append((side_1, side_2))
+    return slate
+
+
+def balanced_from_slate(slate: List[Tuple[List[Outcome], List[Outcome]]]) -> np.ndarray:
+    """Find the most balanced line of every event with the array path."""
+    event_index, _, side_1, side_2 = OddsDataProcessor.pair_outcomes(slate)
+    return OddsDataProcessor.find_most_balanced_array(event_index, side_1, side_2)
+
+
+def synthetic_odds_response(events: int, bookmakers: int, seed: int = 0) -> List[Dict]:
+    """Build a get_odds-shaped response (decimal odds) with h2h, spreads and totals per bookmaker."""
+    rng = random.Random(seed)
+    response = []
+    for i in range(events):
+        p = rng.uniform(0.25, 0.75)
+        spread, total = round(rng.uniform(-10, 10)) + 0.5, round(rng.uniform(200, 240)) + 0.5
+
+        def price(probability: float) -> float:
+            return round(1 / (probability * rng.uniform(1.02, 1.07)), 2)
+
+        books = []
+        for b in range(bookmakers):
+            books.append({"key": f"book_{b}", "markets": [
+                {"key": "h2h", "outcomes": [{"name": "Home", "price": price(p)}, {"name": "Away", "price": price(1 - p)}]},
+                {"key": "spreads", "outcomes": [
+                    {"name": "Home", "price": price(0.5), "point": spread},
+                    {"name": "Away", "price": price(0.5), "point": -spread},
+                ]},
+                {"key": "totals", "outcomes": [
+                    {"name": "Over", "price": price(0.5), "point": total},
+                    {"name": "Under", "price": price(0.5), "point": total},
+                ]},
+            ]})
+        response.append({"id": f"event_{i}", "home_team": "Home", "away_team": "Away", "bookmakers": books})
+    return response
+
+
+def per_call_ms(run: Callable[[], object], number: int) -> float:
+    """Best-of-three time of one ``run`` call in milliseconds, after a warm-up call."""
+    run()
+    return min(timeit.repeat(run, number=number, repeat=3)) / number * 1e3
+
+
+def main() -> None:
+    """Check that both paths agree, then time them and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=500)
+    parser.add_argument("--points", type=int, default=20)
+    parser.add_argument("--bookmakers", type=int, default=10)
+    parser.add_argument("--number", type=int, default=5)
+    args = parser.parse_args()
+
+    slate = synthetic_slate(args.events, args.points)
+    event_index, points, side_1, side_2 = OddsDataProcessor.pair_outcomes(slate)
+    prices = side_1.tolist()
+    decimals = OddsDataProcessor.american_to_decimal_array(side_1).tolist()
+
+    # Same answers from both paths
+    scalar_best = [OddsDataProcessor.find_most_balanced(pair) for pair in slate]
+    rows = OddsDataProcessor.find_most_balanced_array(event_index, side_1, side_2)
+    assert [best[0]["point"] for best in scalar_best] == points[rows].tolist()
+    assert np.allclose([OddsDataProcessor.american_to_decimal(p) for p in prices], decimals)
+    assert [OddsDataProcessor.decimal_to_american(d) for d in decimals] == \
+        OddsDataProcessor.decimal_to_american_array(decimals).tolist()
+
+    cases = {
+        "american_to_decimal": (
+            lambda: [OddsDataProcessor.american_to_decimal(p) for p in prices],
+            lambda: OddsDataProcessor.american_to_decimal_array(side_1),
+        ),
+        "decimal_to_american": (
+            lambda: [OddsDataProcessor.decimal_to_american(d) for d in decimals],
+            lambda: OddsDataProcessor.decimal_to_american_array(decimals),
+        ),
+        "find_most_balanced": (
+            lambda: [OddsDataProcessor.find_most_balanced(pair) for pair in slate],
+            lambda: OddsDataProcessor.find_most_balanced_array(event_index, side_1, side_2),
+        ),
+        "pair_outcomes + find_most_balanced": (
+            lambda: [OddsDataProcessor.find_most_balanced(pair) for pair in slate],
+            lambda: balanced_from_slate(slate),
+        ),
+    }
+    results = []
+    for name, (scalar, vectorized) in cases.items():
+        before = per_call_ms(scalar, args.number)
+        after = per_call_ms(vectorized, args.number)
+        results.append({"operation": name, "rows": len(prices), "scalar_ms": before, "numpy_ms": after, "speedup": before / after})
+    print(format_table(results))
+
+    response = synthetic_odds_response(args.events, args.bookmakers)
+    rows = OddsScanner.flatten(response)
+    print()
+    print(format_table([
+        {"scanner": "flatten", "prices": len(rows["price"]), "ms": per_call_ms(lambda: OddsScanner.flatten(response), args.number)},
+        {"scanner": "scan_arrays", "prices": len(rows["price"]), "ms": per_call_ms(lambda: OddsScanner.scan_arrays(rows), args.number)},
+        {"scanner": "scan (full report)", "prices": len(rows["price"]), "ms": per_call_ms(lambda: OddsScanner.scan(response), args.number)},
+    ]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Benchmark tools and graphs against recorded upstream responses.
+
+Record the upstream traffic once, with network access and API keys:
+
+    python -m benchmarks.offline_tools --mode record
+
+and then replay it on any machine, without network access, injecting either
+the recorded latency or a fixed one:
+
+    python -m benchmarks.offline_tools --latency recorded --repeat 20
+    python -m benchmarks.offline_tools --latency 0.2 --graphs nba soccer
+
+Tool calls go through the instrumented tools, so the figures match the
+``tool_latency_seconds`` metric. ``--graphs`` also runs the benchmark
+question suites; their LLM calls are not recorded by the cassettes and still
+need a model backend. Cassettes live in ``HTTP_CASSETTE_DIR``
+(data/cassettes) unless ``--dir`` is given; see app/react_agent/cassettes.py.
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from typing import Any, Dict, List, Tuple
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-unused-by-this-benchmark")
+
+from app.react_agent import (
+    cassettes,  # noqa: E402
+    tools,  # noqa: E402
+)
+from app.react_agent.metrics import result_status  # noqa: E402
+from benchmarks.harness import format_table, load_graph, run_suite, summarize  # noqa: E402
+
+# (sport, tool, arguments) covering each upstream: stats.nba.com and the NBA live
+# CDN, statsapi.mlb.com, API-Football on RapidAPI and Tavily.
+TOOL_CALLS: List[Tuple[str, str, Dict[str, Any]]] = [
+    ("nba", "nba_live_scoreboard", {}),
+    ("nba", "nba_team_standings", {"season": "2023-24", "season_type": "Regular Season"}),
+    ("nba", "nba_player_career_stats", {"player_id": "2544"}),
+    ("nba", "nba_common_player_info", {"player_id": "201939"}),
+    ("mlb", "mlb_get_schedule", {"season": "2024"}),
+    ("mlb", "mlb_get_team_roster", {"teamId": 119, "season": "2024"}),
+    ("mlb", "mlb_get_player_id", {"player_name": "Shohei Ohtani"}),
+    ("soccer", "get_league_id_by_name", {"league_name": "Premier League"}),
+    ("soccer", "get_standings", {"league_id": [39], "season": [2023]}),
+    ("all", "tavily_search", {"query": "NBA injury report today", "max_results": 5}),
+]
+
+
+def find_tool(name: str) -> Any:
+    """Return the tool called ``name`` from app.react_agent.tools."""
+    for value in vars(tools).values():
+        if getattr(value, "name", None) == name and hasattr(value, "invoke"):
+            return value
+    raise KeyError(f"Unknown tool '{name}'")
+
+
+def bench_tools(sports: List[str], repeat: int) -> List[Dict[str, Any]]:
+    """Time each tool call of ``sports`` ``repeat`` times against the cassettes."""
+    rows = []
+    for sport, name, arguments in TOOL_CALLS:
+        if sport not in sports and sport != "all":
+            continue
+        tool = find_tool(name)
+        latencies: List[float] = []
+        errors = 0
+        for _ in range(repeat):
+            # Every round replays the same recorded sequence
+            cassettes.cassettes.store.rewind()
+            started = time.perf_counter()
+            try:
+                result = tool.invoke(arguments)
+            except Exception:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+            errors += result_status(result) == "error"
+        summary = summarize(latencies, [], [], errors)
+        rows.append({"tool": name, "p50_s": summary["p50_s"], "p95_s": summary["p95_s"], "errors": errors})
+    return rows
+
+
+async def main() -> None:
+    """Install the cassettes, then time the tools (and graphs) and print tables."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=["record", "replay", "auto"], default="replay")
+    parser.add_argument("--dir", default=None, help="cassette directory (default: HTTP_CASSETTE_DIR)")
+    parser.add_argument("--latency", default="0", help="replay latency: 'recorded' or seconds")
+    parser.add_argument("--sports", nargs="+", default=["nba", "soccer", "mlb"])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--graphs", nargs="*", default=[], help="also run the question suites of these sports")
+    args = parser.parse_args()
+
+    latency = args.latency if args.latency == "recorded" else float(args.latency)
+    cassettes.install(args.mode, args.dir, latency)
+    # Recording needs each request once; replay repeats to measure the spread.
+    repeat = 1 if args.mode == "record" else args.repeat
+
+    print(format_table(bench_tools(args.sports, repeat)))
+    rows = []
+    for sport in args.graphs:
+        cassettes.cassettes.store.rewind()
+        rows.append({"sport": sport, **await run_suite(load_graph(sport), sport, repeat=repeat)})
+    if rows:
+        print()
+        print(format_table(rows))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,143 @@
+"""Report agent prompt sizes and provider prompt-cache hit rates.
+
+The static part needs no API keys: it compares, for every ReAct agent prompt,
+the system prompt tokens sent per hop before the static-first layout (full
+text with inlined examples) and after it (instructions only)::
+
+    python -m benchmarks.prompt_report
+
+With ``--live`` the benchmark questions are also run through the graphs and
+the input and cached input tokens reported by the provider are aggregated per
+agent. OpenAI only caches prompts of 1024+ tokens, so short prompts always
+show a 0% hit rate::
+
+    python -m benchmarks.prompt_report --live --sports nba --repeat 2
+"""
+
+import argparse
+import asyncio
+from collections import defaultdict
+from typing import Any, Dict, List
+from uuid import UUID
+
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from app.react_agent import prompts
+from app.react_agent.prompt_layout import AgentPrompt
+from benchmarks.harness import format_table, load_graph, run_question
+from benchmarks.questions import QUESTIONS
+
+try:
+    import tiktoken
+
+    _ENCODING = tiktoken.get_encoding("o200k_base")
+
+    def count_tokens(text: str) -> int:
+        """Count the tokens of ``text`` in the o200k_base encoding."""
+        return len(_ENCODING.encode(text))
+
+except ImportError:  # rough estimate without tiktoken (~4 characters per token)
+
+    def count_tokens(text: str) -> int:
+        """Estimate the tokens of ``text``."""
+        return (len(text) + 3) // 4
+
+
+# Node names inside create_react_agent graphs; the agent is the enclosing subgraph.
+_REACT_NODES = {"agent", "tools", "call_model"}
+
+
+def prompt_sizes() -> List[Dict[str, Any]]:
+    """System prompt tokens per agent prompt before and after the layout change."""
+    rows = []
+    for variable, value in vars(prompts).items():
+        if not isinstance(value, AgentPrompt):
+            continue
+        before = count_tokens(value.source)
+        after = count_tokens(value.instructions)
+        rows.append({
+            "prompt": variable,
+            "examples": len(value.examples),
+            "before": before,
+            "after": after,
+            "saved": 1 - after / before,
+        })
+    return sorted(rows, key=lambda row: -row["before"])
+
+
+def agent_name(metadata: Dict[str, Any] | None) -> str:
+    """Return the innermost named agent or supervisor from a run's checkpoint namespace."""
+    namespace = (metadata or {}).get("langgraph_checkpoint_ns", "")
+    names = [part.split(":", 1)[0] for part in namespace.split("|") if part]
+    names = [name for name in names if name not in _REACT_NODES]
+    return names[-1] if names else (metadata or {}).get("langgraph_node", "unknown")
+
+
+class PromptCacheUsage(AsyncCallbackHandler):
+    """Collects input and cached input tokens per agent from chat model runs."""
+
+    def __init__(self) -> None:
+        """Start with no runs and no usage."""
+        self.agents: Dict[UUID, str] = {}
+        self.usage: Dict[str, Dict[str, int]] = defaultdict(lambda: {"calls": 0, "input": 0, "cached": 0})
+
+    async def on_chat_model_start(
+        self, serialized: Dict[str, Any], messages: Any, *, run_id: UUID,
+        metadata: Dict[str, Any] | None = None, **kwargs: Any,
+    ) -> None:
+        """Remember which agent the model run belongs to."""
+        self.agents[run_id] = agent_name(metadata)
+
+    async def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        """Add the run's input and cached input tokens to its agent."""
+        message = getattr(response.generations[0][0], "message", None)
+        usage_metadata = getattr(message, "usage_metadata", None) or {}
+        totals = self.usage[self.agents.pop(run_id, "unknown")]
+        totals["calls"] += 1
+        totals["input"] += usage_metadata.get("input_tokens", 0)
+        totals["cached"] += (usage_metadata.get("input_token_details") or {}).get("cache_read", 0) or 0
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """Return the calls, input tokens per call and cache hit rate per agent."""
+        return [
+            {
+                "agent": agent,
+                "calls": totals["calls"],
+                "input/call": totals["input"] / max(totals["calls"], 1),
+                "cache_hit": totals["cached"] / totals["input"] if totals["input"] else 0.0,
+            }
+            for agent, totals in sorted(self.usage.items())
+        ]
+
+
+async def measure_cache(sports: List[str], repeat: int) -> List[Dict[str, Any]]:
+    """Run the benchmark questions and return per-agent cache statistics."""
+    handler = PromptCacheUsage()
+    for sport in sports:
+        graph = load_graph(sport)
+        for _ in range(repeat):
+            for item in QUESTIONS[sport]:
+                try:
+                    await run_question(graph, item["question"], {"callbacks": [handler]})
+                except Exception as e:
+                    print(f"{sport}: {item['question']!r} failed: {e}")
+    return handler.rows()
+
+
+async def main() -> None:
+    """Print the prompt sizes and, with ``--live``, the measured cache hit rates."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--live", action="store_true", help="also measure provider cache hits")
+    parser.add_argument("--sports", nargs="+", default=["nba", "soccer", "mlb"])
+    parser.add_argument("--repeat", type=int, default=2, help="the first pass warms the cache")
+    args = parser.parse_args()
+
+    print(format_table(prompt_sizes()))
+    if args.live:
+        print()
+        print(format_table(await measure_cache(args.sports, args.repeat)))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
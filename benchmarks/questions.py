@@ -0,0 +1,73 @@
+"""Question sets with stable reference answers used by the graph benchmarks.
+
+Each question lists keywords that a correct answer must mention. Facts were
+chosen so they do not change from day to day, which keeps accuracy numbers
+comparable between runs.
+"""
+
+from typing import Dict, List, Set, TypedDict
+
+
+class BenchmarkQuestion(TypedDict):
+    """A question and the keywords a correct answer must mention."""
+
+    question: str
+    expected: List[str]
+
+
+class RoutingQuestion(TypedDict):
+    """A question and the supervisors the split node should route it to."""
+
+    question: str
+    supervisors: Set[str]
+
+
+QUESTIONS: Dict[str, List[BenchmarkQuestion]] = {
+    "nba": [
+        {"question": "What college did Stephen Curry attend?", "expected": ["Davidson"]},
+        {"question": "What jersey number does Giannis Antetokounmpo wear?", "expected": ["34"]},
+        {"question": "Which team drafted LeBron James in 2003?", "expected": ["Cavaliers"]},
+        {"question": "Which team won the 2016 NBA Finals and who did they beat?", "expected": ["Cavaliers", "Warriors"]},
+        {"question": "How many points did Kobe Bryant score in his 81-point game, and against which team?", "expected": ["81", "Raptors"]},
+    ],
+    "soccer": [
+        {"question": "What is the name of Arsenal's home stadium?", "expected": ["Emirates"]},
+        {"question": "Which country does Lionel Messi represent internationally?", "expected": ["Argentin"]},
+        {"question": "Which club won the 2015-16 Premier League?", "expected": ["Leicester"]},
+        {"question": "In which city do Bayern Munich play their home games?", "expected": ["Munich"]},
+    ],
+    "mlb": [
+        {"question": "What is the home ballpark of the Boston Red Sox?", "expected": ["Fenway"]},
+        {"question": "Which team won the 2016 World Series?", "expected": ["Cubs"]},
+        {"question": "What position does Shohei Ohtani play besides designated hitter?", "expected": ["pitch"]},
+    ],
+}
+
+# split_node routing labels: the set of supervisors a good decomposition uses.
+ROUTING_QUESTIONS: Dict[str, List[RoutingQuestion]] = {
+    "nba": [
+        {"question": "What's the score of the Celtics game right now?", "supervisors": {"game_supervisor"}},
+        {"question": "How tall is Victor Wembanyama and what college did he attend?", "supervisors": {"player_supervisor"}},
+        {"question": "Which team leads the Western Conference standings?", "supervisors": {"teams_supervisor"}},
+        {"question": "Who do the Knicks play tonight, and what are Jalen Brunson's career playoff averages?",
+         "supervisors": {"game_supervisor", "player_supervisor"}},
+        {"question": "Compare Nikola Jokic's and Joel Embiid's rebounds per game, and tell me the Nuggets' record this season.",
+         "supervisors": {"player_supervisor", "teams_supervisor"}},
+        {"question": "Show me the play-by-play of the Warriors game in progress.", "supervisors": {"game_supervisor"}},
+    ],
+    "soccer": [
+        {"question": "What's the live score of the Real Madrid match?", "supervisors": {"team_soccer_supervisor"}},
+        {"question": "Who is top of the Serie A table?", "supervisors": {"league_supervisor"}},
+        {"question": "How many goals has Erling Haaland scored this season?", "supervisors": {"player_soccer_supervisor"}},
+        {"question": "Which Premier League matches are on this Saturday, and what were the stats of last weekend's games?",
+         "supervisors": {"fixture_supervisor"}},
+        {"question": "Compare Kylian Mbappe's goals this season with PSG's current league position.",
+         "supervisors": {"player_soccer_supervisor", "league_supervisor"}},
+    ],
+}
+
+
+def score_answer(answer: str, expected: List[str]) -> float:
+    """Fraction of expected keywords found in the answer (case-insensitive)."""
+    answer = answer.lower()
+    return sum(keyword.lower() in answer for keyword in expected) / len(expected)
@@ -0,0 +1,83 @@
+"""Microbenchmark: per-call setup cost of prompts, chains and agents.
+
+Compares rebuilding the runnables on every call, as the nodes used to, with
+the module-level / memoized instances they use now. The split and synthesis
+rebuilds construct a fresh ``ChatOpenAI`` per call, as the old nodes did. Nothing is sent to a
+model, but the chat model clients are still constructed, so a placeholder
+OpenAI key is set when none is configured:
+
+    python -m benchmarks.setup_overhead --number 200
+"""
+
+import argparse
+import os
+import timeit
+from typing import Callable, Dict
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-unused-by-this-benchmark")
+
+from langchain.agents import AgentExecutor  # noqa: E402
+from langchain.agents import create_react_agent as create_text_react_agent  # noqa: E402
+from langchain_core.prompts import PromptTemplate  # noqa: E402
+from langchain_openai import ChatOpenAI  # noqa: E402
+
+from app.react_agent import agents, runner  # noqa: E402
+from app.react_agent.nba import graph as nba_graph  # noqa: E402
+from benchmarks.harness import format_table  # noqa: E402
+
+
+def rebuild_split_chain():
+    """Build the split_node chain the way the node did on every call."""
+    prompt = PromptTemplate(template=nba_graph.SPLIT_PROMPT.template, input_variables=["query", "examples"])
+    return prompt | ChatOpenAI(model="gpt-4o", temperature=0).with_structured_output(nba_graph.ParsedOutput)
+
+
+def rebuild_synthesis_chain():
+    """Build the combine_results chain the way the node did on every call."""
+    prompt = PromptTemplate(template=runner.COMBINE_PROMPT, input_variables=["sport", "original_query", "combined_results"])
+    return prompt | ChatOpenAI(model="gpt-4o", temperature=0)
+
+
+def rebuild_supervisor_chain():
+    """Build the supervisor_node chain the way the node did on every call."""
+    prompt = PromptTemplate(template=agents.SUPERVISOR_PROMPT, input_variables=["query"])
+    return prompt | agents.router_llm.with_structured_output(agents.SupervisorOutput)
+
+
+def rebuild_team_executor():
+    """Build the team_node executor the way the node did on every call."""
+    prompt = PromptTemplate.from_template(agents.TEAM_PROMPT.source + agents.REACT_PROMPT_SUFFIX)
+    react_agent = create_text_react_agent(tools=agents.team_tools, llm=agents.agent_llm, prompt=prompt)
+    return AgentExecutor(agent=react_agent, tools=agents.team_tools, return_intermediate_steps=True, handle_parsing_errors=True)
+
+
+CASES: Dict[str, tuple] = {
+    "split_node chain": (rebuild_split_chain, lambda: nba_graph.split_chain),
+    "combine_results chain": (rebuild_synthesis_chain, lambda: runner.synthesis_chain),
+    "supervisor_node chain": (rebuild_supervisor_chain, agents.supervisor_chain),
+    "team_node executor": (rebuild_team_executor, lambda: agents.react_agent_executor("team")),
+}
+
+
+def per_call_us(build: Callable[[], object], number: int) -> float:
+    """Return the best per-call time of ``build`` in microseconds."""
+    build()  # warm caches and imports
+    return min(timeit.repeat(build, number=number, repeat=3)) / number * 1e6
+
+
+def main() -> None:
+    """Print the per-call cost of rebuilding each runnable against reusing it."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    rows = []
+    for name, (rebuild, cached) in CASES.items():
+        before = per_call_us(rebuild, args.number)
+        after = per_call_us(cached, args.number)
+        rows.append({"runnable": name, "rebuild_us": before, "cached_us": after, "speedup": before / after})
+    print(format_table(rows))
+
+
+if __name__ == "__main__":
+    main()
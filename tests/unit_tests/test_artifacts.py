@@ -0,0 +1,41 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.artifacts import ArtifactWorkers, content_hash
+
+
+def test_render_is_cached_by_content_and_shared_while_running(tmp_path) -> None:
+    calls = []
+
+    def render(output, docx_path, pdf_path):
+        calls.append(output["plan"])
+        time.sleep(0.05)
+        for path in (docx_path, pdf_path):
+            with open(path, "w") as f:
+                f.write(output["plan"])
+
+    workers = ArtifactWorkers(
+        render, render_processes=2, email_threads=1, artifacts_dir=str(tmp_path / "docx"),
+        results_dir=str(tmp_path / "pdf"), executor_factory=lambda n: ThreadPoolExecutor(n),
+    )
+
+    async def run():
+        first = await asyncio.gather(
+            workers.render({"plan": "rome", "days": 3}),
+            workers.render({"days": 3, "plan": "rome"}),
+        )
+        again = await workers.render({"plan": "rome", "days": 3})
+        other = await workers.render({"plan": "paris"})
+        sent = await workers.send_email(lambda **kwargs: kwargs["file_path"], file_path=again[0])
+        return first, again, other, sent
+
+    (first, second), again, other, sent = asyncio.run(run())
+    workers.shutdown()
+
+    assert calls == ["rome", "paris"]
+    assert first == second == again != other
+    assert os.path.basename(first[1]) == content_hash({"days": 3, "plan": "rome"}) + ".pdf"
+    assert sorted(os.listdir(tmp_path / "pdf")) == sorted(os.path.basename(p[1]) for p in (first, other))
+    assert sent == first[0]
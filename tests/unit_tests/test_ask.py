@@ -0,0 +1,99 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from app import ask
+from app.ask import SportLimits, ask_stream
+
+
+class FakeGraph:
+    """astream over scripted (mode, chunk) items; ``block`` waits forever after them."""
+
+    def __init__(self, items, block=False):
+        self.items = items
+        self.block = block
+        self.closed = False
+        self.cancelled = False
+
+    async def astream(self, state, config, stream_mode):
+        try:
+            for item in self.items:
+                yield item
+            if self.block:
+                await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        finally:
+            self.closed = True
+
+
+def ai(content):
+    return SimpleNamespace(type="AIMessageChunk", content=content)
+
+
+def parse(events):
+    return [
+        (event.split("\n")[0][len("event: "):], json.loads(event.split("\n")[1][len("data: "):]))
+        for event in events if event.startswith("event: ")
+    ]
+
+
+async def connected():
+    return False
+
+
+def test_ask_stream_forwards_tokens_progress_and_answer() -> None:
+    graph = FakeGraph([
+        ("updates", {"split_query": {"sub_queries": [{"query": "Lakers score?"}]}}),
+        ("messages", (ai("Lakers "), {"langgraph_node": "combine_results"})),
+        ("messages", (SimpleNamespace(type="tool", content="{}"), {"langgraph_node": "tools"})),
+        ("messages", (ai("lead"), {"langgraph_node": "combine_results"})),
+        ("updates", {"combine_results": {"messages": [ai("question"), ai("Lakers lead 50-48.")]}}),
+    ])
+    closed = []
+
+    async def run():
+        config = {"configurable": {"thread_id": "t1"}}
+        return [event async for event in ask_stream(graph, "Lakers?", config, connected, lambda: closed.append(1))]
+
+    events = parse(asyncio.run(run()))
+
+    assert events == [
+        ("start", {"thread_id": "t1"}),
+        ("progress", {"node": "split_query", "sub_queries": ["Lakers score?"]}),
+        ("token", {"node": "combine_results", "content": "Lakers "}),
+        ("token", {"node": "combine_results", "content": "lead"}),
+        ("progress", {"node": "combine_results"}),
+        ("done", {"answer": "Lakers lead 50-48."}),
+    ]
+    assert graph.closed and closed == [1]
+
+
+def test_ask_stream_cancels_the_run_when_the_client_leaves(monkeypatch) -> None:
+    monkeypatch.setattr(ask, "DISCONNECT_POLL_SECONDS", 0.01)
+    graph = FakeGraph([("messages", (ai("Hi"), {"langgraph_node": "agent"}))], block=True)
+    checks = []
+
+    async def disconnected():
+        checks.append(1)
+        return len(checks) > 1
+
+    async def run():
+        config = {"configurable": {"thread_id": "t2"}}
+        return [event async for event in ask_stream(graph, "Hi?", config, disconnected)]
+
+    events = parse(asyncio.run(run()))
+
+    assert [event for event, _ in events] == ["start", "token"]
+    assert graph.cancelled and graph.closed
+
+
+def test_sport_limits_are_configurable_per_sport(monkeypatch) -> None:
+    monkeypatch.setenv("ASK_CONCURRENCY_NBA", "1")
+    limits = SportLimits(["nba", "mlb"], default=2)
+
+    assert limits.try_acquire("nba") and not limits.try_acquire("nba")
+    assert limits.try_acquire("mlb") and limits.try_acquire("mlb") and not limits.try_acquire("mlb")
+    limits.release("nba")
+    assert limits.try_acquire("nba")
@@ -0,0 +1,158 @@
+import threading
+import time
+
+from app.react_agent.bets import OddsAPI
+
+
+class _Response:
+    def __init__(self, data, remaining):
+        self.data = data
+        self.headers = {"x-requests-remaining": str(remaining), "x-requests-used": "1", "x-requests-last": "1"}
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+class _Session:
+    def __init__(self, delay=0.0):
+        self.calls = []
+        self.delay = delay
+        self.lock = threading.Lock()
+
+    def get(self, url, params, timeout):
+        with self.lock:
+            self.calls.append(url)
+            remaining = 500 - len(self.calls)
+        time.sleep(self.delay)
+        return _Response({"url": url, "markets": params.get("markets")}, remaining)
+
+
+def _api(delay=0.0, **kwargs):
+    api = OddsAPI("key", **kwargs)
+    api.session = _Session(delay)
+    return api
+
+
+def test_responses_are_cached_per_endpoint_ttl() -> None:
+    api = _api(ttls={"odds": 0})
+
+    assert api.get_in_season_sports() == api.get_in_season_sports()
+    api.get_odds("basketball_nba", "us", "h2h")
+    api.get_odds("basketball_nba", "us", "h2h")
+
+    assert len(api.session.calls) == 3  # sports once, odds (not cached) twice
+    assert api.credits["cache_hits"] == 1
+    assert api.credits["remaining"] == 497
+
+
+def test_concurrent_identical_requests_are_coalesced_and_batched() -> None:
+    api = _api(delay=0.05)
+
+    slate = api.get_odds_batch(["basketball_nba", "baseball_mlb", "basketball_nba"], "us", {"basketball_nba": "h2h", "baseball_mlb": "totals"})
+    threads = [threading.Thread(target=api.get_events, args=("soccer_epl",)) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert set(slate) == {"basketball_nba", "baseball_mlb"}
+    assert slate["baseball_mlb"]["markets"] == "totals"
+    assert len(api.session.calls) == 3
+
+
+def test_vectorized_odds_math_matches_scalar() -> None:
+    from app.react_agent.bets import OddsDataProcessor as P
+
+    american = [-250, -110, 100, 150, 0]
+    decimals = P.american_to_decimal_array(american)
+    assert decimals.tolist() == [P.american_to_decimal(a) for a in american]
+    assert P.decimal_to_american_array([1.0, 1.5, 2.0, 3.25]).tolist() == [
+        P.decimal_to_american(d) for d in [1.0, 1.5, 2.0, 3.25]
+    ]
+
+    events = [
+        ([{"point": -3.5, "price": -150}, {"point": -2.5, "price": -110}], [{"point": -3.5, "price": 130}, {"point": -2.5, "price": -110}]),
+        ([{"point": 210.5, "price": 105}, {"point": 211.5, "price": -125}], [{"point": 210.5, "price": -125}, {"point": 212.5, "price": 105}]),
+    ]
+    event_index, points, side_1, side_2 = P.pair_outcomes(events)
+    rows = P.find_most_balanced_array(event_index, side_1, side_2)
+
+    assert points[rows].tolist() == [P.find_most_balanced(pair)[0]["point"] for pair in events] == [-2.5, 210.5]
+
+
+def _book(key, home_price, away_price, total_point=None, over=None, under=None):
+    markets = [{"key": "h2h", "outcomes": [{"name": "Home", "price": home_price}, {"name": "Away", "price": away_price}]}]
+    if total_point is not None:
+        markets.append({"key": "totals", "outcomes": [
+            {"name": "Over", "price": over, "point": total_point}, {"name": "Under", "price": under, "point": total_point},
+        ]})
+    return {"key": key, "markets": markets}
+
+
+def test_scanner_finds_best_lines_and_arbitrage() -> None:
+    from app.react_agent.bets import OddsScanner
+
+    events = [
+        {"id": "e1", "home_team": "Home", "away_team": "Away", "bookmakers": [
+            _book("book_a", 2.10, 1.80, 220.5, 1.91, 1.91),
+            _book("book_b", 1.85, 2.15, 220.5, 1.87, 1.95),
+        ]},
+        {"id": "e2", "home_team": "Home", "away_team": "Away", "bookmakers": [_book("book_a", 1.50, 2.50)]},
+    ]
+
+    lines = OddsScanner.scan(events)
+
+    arbitrage = lines[0]
+    assert (arbitrage["event_id"], arbitrage["market"], arbitrage["arbitrage"]) == ("e1", "h2h", True)
+    assert [(o["name"], o["best_price"], o["bookmaker"]) for o in arbitrage["outcomes"]] == [
+        ("Home", 2.10, "book_a"), ("Away", 2.15, "book_b"),
+    ]
+    assert arbitrage["overround"] == round(1 / 2.10 + 1 / 2.15 - 1, 4)
+    assert arbitrage["arbitrage_profit"] > 0 and abs(sum(arbitrage["stakes"]) - 1) < 1e-3
+
+    totals = next(line for line in lines if line["market"] == "totals")
+    assert totals["point"] == 220.5 and not totals["arbitrage"]
+    assert totals["avg_bookmaker_overround"] == round((2 / 1.91 + 1 / 1.87 + 1 / 1.95) / 2 - 1, 4)
+    assert len(OddsScanner.scan(events, arbitrage_only=True)) == 1
+
+
+def test_scanner_requires_every_outcome_of_a_three_way_market() -> None:
+    from app.react_agent.bets import OddsScanner
+
+    def book(key, home, away, draw=None):
+        outcomes = [{"name": "Home", "price": home}, {"name": "Away", "price": away}]
+        if draw is not None:
+            outcomes.append({"name": "Draw", "price": draw})
+        return {"key": key, "markets": [{"key": "h2h", "outcomes": outcomes}]}
+
+    two_sided = {"id": "e1", "sport_key": "soccer_epl", "home_team": "Home", "away_team": "Away",
+                 "bookmakers": [book("book_a", 2.40, 2.90), book("book_b", 2.20, 3.10)]}
+    priced_draw = {**two_sided, "id": "e2", "bookmakers": [book("book_a", 2.40, 2.90, 3.30)]}
+
+    lines = {line["event_id"]: line for line in OddsScanner.scan([two_sided, priced_draw])}
+
+    # 1/2.40 + 1/3.10 < 1, but the draw is not covered
+    assert lines["e1"]["overround"] < 0 and not lines["e1"]["arbitrage"]
+    assert [o["name"] for o in lines["e2"]["outcomes"]] == ["Home", "Away", "Draw"]
+    assert lines["e2"]["overround"] == round(1 / 2.40 + 1 / 2.90 + 1 / 3.30 - 1, 4)
+
+
+def test_cache_is_bounded_evicts_expired_and_returns_copies() -> None:
+    api = _api(ttls={"events": 60, "odds": 0.01}, max_entries=2)
+
+    api.get_odds("basketball_nba", "us", "h2h")
+    time.sleep(0.02)
+    api.get_events("basketball_nba")  # the expired odds entry goes on this write
+    assert len(api._cache) == 1
+
+    api.get_events("baseball_mlb")
+    api.get_events("basketball_nba")  # most recently used now
+    api.get_events("soccer_epl")
+    assert [key[0] for key in api._cache] == ["sports/basketball_nba/events", "sports/soccer_epl/events"]
+    assert api.ttls["historical"] is not None
+
+    api.get_events("soccer_epl")["url"] = "mutated"
+    assert api.get_events("soccer_epl")["url"].endswith("/soccer_epl/events")
@@ -0,0 +1,81 @@
+import http.server
+import json
+import os
+import threading
+import time
+
+import pytest
+import requests
+
+from app.react_agent import cassettes, metrics
+
+
+def test_scrub_drops_credentials_and_sorts_the_query() -> None:
+    url = "https://api.example.com/v4/odds?regions=us&apiKey=secret&markets=h2h"
+    assert cassettes.scrub_url(url) == "https://api.example.com/v4/odds?markets=h2h&regions=us"
+    assert cassettes.scrub_body(b'{"query": "nba", "api_key": "secret"}') == b'{"query": "nba"}'
+    assert cassettes.scrub_body(None) == b""
+
+
+@pytest.fixture(autouse=True)
+def _own_metrics_label():
+    # requests are instrumented process-wide; keep this traffic off the shared series
+    token = metrics.current_tool.set("test_cassettes")
+    yield
+    metrics.current_tool.reset(token)
+
+
+def test_record_then_replay_offline(tmp_path) -> None:
+    calls = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            calls.append(self.path)
+            body = json.dumps({"version": len(calls)}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/scoreboard"
+    try:
+        cassettes.install("record", str(tmp_path))
+        assert requests.get(url, params={"apiKey": "one"}, timeout=5).json() == {"version": 1}
+        assert requests.get(url, params={"apiKey": "one"}, timeout=5).json() == {"version": 2}
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    stored = [os.path.join(root, name) for root, _, names in os.walk(tmp_path) for name in names]
+    assert len(stored) == 1
+    assert "one" not in open(stored[0]).read()
+
+    try:
+        cassettes.install("replay", str(tmp_path), latency=0.05)
+        started = time.perf_counter()
+        # A different key still matches: credentials are not part of the request key.
+        first = requests.get(url, params={"apiKey": "two"}, timeout=5)
+        assert time.perf_counter() - started >= 0.05
+        assert first.json() == {"version": 1}
+        assert first.headers["Content-Type"] == "application/json"
+        assert requests.get(url, timeout=5).json() == {"version": 2}
+        assert requests.get(url, timeout=5).json() == {"version": 2}  # stays on the last response
+
+        cassettes.cassettes.store.rewind()
+        assert requests.get(url, timeout=5).json() == {"version": 1}
+
+        with pytest.raises(requests.ConnectionError):
+            requests.get(url + "/unrecorded", timeout=5)
+    finally:
+        cassettes.install("off")
+    assert len(calls) == 2
+
+
+def test_unknown_mode_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        cassettes.Cassettes("rewind")
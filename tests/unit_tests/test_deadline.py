@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+
+from app.react_agent.deadline import (
+    MIN_HTTP_TIMEOUT,
+    DeadlineExceeded,
+    http_timeout,
+    remaining,
+    run_within,
+    with_deadline,
+)
+
+
+def test_http_timeout_is_capped_by_the_remaining_budget() -> None:
+    config = with_deadline({"configurable": {"thread_id": "t"}}, 5)
+
+    assert config["configurable"]["thread_id"] == "t"
+    assert 4 < remaining(config) <= 5
+    assert http_timeout(15, config) <= 5
+    assert http_timeout(3, config) == 3
+    assert http_timeout(15, {"configurable": {}}) == 15
+    assert http_timeout(15, with_deadline({}, 0.1)) == MIN_HTTP_TIMEOUT
+
+    with pytest.raises(DeadlineExceeded):
+        http_timeout(15, with_deadline({}, -1))
+
+
+def test_run_within_cancels_work_that_outlives_the_deadline() -> None:
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def run():
+        assert await run_within(asyncio.sleep(0, result="ok"), {}) == "ok"
+        with pytest.raises(DeadlineExceeded):
+            await run_within(slow(), with_deadline({}, 0.02))
+        with pytest.raises(DeadlineExceeded):
+            await run_within(slow(), with_deadline({}, -1))
+
+    asyncio.run(run())
+    assert cancelled == [True]
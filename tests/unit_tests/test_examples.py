@@ -0,0 +1,36 @@
+from langchain_core.messages import AIMessage, HumanMessage
+
+from app.react_agent.examples import ExampleStore, example_question
+from app.react_agent.prompt_layout import AgentPrompt
+
+EXAMPLES = [
+    'User Query: "What\'s the score of the Lakers game?"\nOutput: game_supervisor',
+    'User Query: "How tall is LeBron James?"\nOutput: player_supervisor',
+    'User Query: "Which team has the best record in the West?"\nOutput: teams_supervisor',
+]
+
+
+def test_example_store_returns_top_k_or_everything() -> None:
+    store = ExampleStore(EXAMPLES)
+
+    assert example_question(EXAMPLES[1]) == "How tall is LeBron James?"
+    assert store.search("LeBron James height", 1) == [EXAMPLES[1]]
+    assert store.search("anything", 3) == EXAMPLES
+    assert store.search("anything", 0) == []
+
+
+def test_agent_prompt_attaches_examples_after_the_question() -> None:
+    source = "Instructions.\n\nEXAMPLE WORKFLOWS:\n\n" + "\n\n".join(
+        f"Example {i} — x:\nQuestion: {example.split(chr(10))[0].split(': ', 1)[1]}\nAction: tool_{i}"
+        for i, example in enumerate(EXAMPLES, 1)
+    ) + "\n\n----------------------------------------\nFINAL INSTRUCTIONS:\n- Done."
+    prompt = AgentPrompt("nba", source)
+    history = [HumanMessage(content="How tall is Stephen Curry?"), AIMessage(content="calling a tool")]
+
+    messages = prompt({"messages": history}, {"configurable": {"few_shot_k": 1}})
+
+    assert messages[0] is prompt.system_message
+    assert messages[1] is history[0]
+    assert "tool_2" in messages[2].content and "tool_1" not in messages[2].content
+    assert messages[3] is history[1]
+    assert len(prompt({"messages": history}, {"configurable": {"few_shot_k": 0}})) == 3
@@ -0,0 +1,42 @@
+import asyncio
+import json
+
+from app.graphs import GraphRegistry, langgraph_specs, load_spec, spec_module
+
+
+def test_specs_follow_langgraph_json(tmp_path) -> None:
+    config = tmp_path / "langgraph.json"
+    config.write_text(json.dumps({"graphs": {"app_nba": "./app/react_agent/nba/graph.py:app_nba"}}))
+
+    assert langgraph_specs(str(config)) == {"app_nba": "./app/react_agent/nba/graph.py:app_nba"}
+    assert langgraph_specs(str(tmp_path / "missing.json")) == {}
+    assert spec_module("./app/react_agent/nba/graph.py:app_nba") == "app.react_agent.nba.graph"
+    assert load_spec("./app/graphs.py:spec_module") is spec_module
+
+
+def test_graphs_are_built_once_and_warmed_up(monkeypatch) -> None:
+    builds = []
+
+    def build():
+        builds.append("nba")
+        return object()
+
+    def broken():
+        raise RuntimeError("missing API key")
+
+    registry = GraphRegistry({"app_nba": build, "app_soccer": broken})
+    warmed = []
+    registry.on_warm_up(lambda graphs: warmed.append(sorted(graphs)))
+    monkeypatch.setenv("GRAPH_WARMUP", "all")
+
+    async def run():
+        graphs = await registry.warm_up()
+        shared = await asyncio.gather(*(registry.aget("app_nba") for _ in range(5)))
+        return graphs, shared
+
+    graphs, shared = asyncio.run(run())
+
+    assert builds == ["nba"]
+    assert all(graph is graphs["app_nba"] for graph in shared)
+    assert warmed == [["app_nba"]]
+    assert registry.loaded() == ["app_nba"]
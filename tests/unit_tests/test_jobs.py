@@ -0,0 +1,114 @@
+import asyncio
+
+from app.jobs import JobQueue
+
+
+def test_jobs_retry_from_saved_progress_until_done() -> None:
+    steps = []
+
+    async def handler(job):
+        progress = job["progress"] or {}
+        if "rendered" not in progress:
+            steps.append("render")
+            queue.save_progress(job["id"], {"rendered": "plan.pdf"})
+        steps.append("email")
+        if job["attempts"] < 2:
+            raise ConnectionError("smtp down")
+        return {"sent": job["payload"]["email"]}
+
+    queue = JobQueue({"trip": handler}, path=":memory:", workers=2, max_attempts=3, retry_delay=0.01, poll_interval=0.01)
+
+    async def run():
+        await queue.start()
+        job_id = queue.submit("trip", {"email": "a@b.c"})
+        assert queue.status(job_id)["status"] == "queued"
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if queue.status(job_id)["status"] == "done":
+                break
+        await queue.stop()
+        return queue.status(job_id)
+
+    job = asyncio.run(run())
+
+    assert job["status"] == "done" and job["attempts"] == 2
+    assert job["result"] == {"sent": "a@b.c"}
+    assert steps == ["render", "email", "email"]
+
+
+def test_jobs_fail_after_max_attempts() -> None:
+    async def handler(job):
+        raise RuntimeError("boom")
+
+    queue = JobQueue({"trip": handler}, path=":memory:", workers=1, max_attempts=2, retry_delay=0, poll_interval=0.01)
+
+    async def run():
+        await queue.start()
+        job_id = queue.submit("trip", {})
+        await asyncio.sleep(0.1)
+        await queue.stop()
+        return queue.status(job_id)
+
+    job = asyncio.run(run())
+
+    assert (job["status"], job["attempts"], job["error"]) == ("failed", 2, "boom")
+    assert queue.status("missing") is None
+
+
+def test_jobs_leases_scope_recovery_to_dead_workers(tmp_path) -> None:
+    path = str(tmp_path / "jobs.sqlite")
+    runs = []
+
+    async def handler(job):
+        runs.append(job["payload"]["n"])
+        return {"n": job["payload"]["n"]}
+
+    other = JobQueue({"trip": handler}, path=path, workers=1, retry_delay=0, poll_interval=0.01, lease=60)
+    live_id = other.submit("trip", {"n": 1})
+    dead_id = other.submit("trip", {"n": 2})
+    # Another process claimed both; it is still renewing one lease, the other ran out.
+    assert other._claim()["id"] == live_id
+    assert other._claim()["id"] == dead_id
+    other._update(dead_id, lease_until=0)
+
+    queue = JobQueue({"trip": handler}, path=path, workers=1, retry_delay=0, poll_interval=0.01, lease=60)
+
+    async def run():
+        await queue.start()
+        await asyncio.sleep(0.1)
+        await queue.stop()
+
+    asyncio.run(run())
+
+    assert runs == [2]
+    assert queue.status(dead_id)["status"] == "done"
+    assert queue.status(live_id)["status"] == "running"
+
+
+def test_jobs_worker_survives_errors_and_bad_results() -> None:
+    async def handler(job):
+        return {"when": object()}
+
+    queue = JobQueue({"trip": handler}, path=":memory:", workers=1, retry_delay=0, poll_interval=0.01)
+    claim, failures = queue._claim, []
+
+    def flaky_claim():
+        if not failures:
+            failures.append(1)
+            raise RuntimeError("database is locked")
+        return claim()
+
+    queue._claim = flaky_claim
+
+    async def run():
+        await queue.start()
+        job_id = queue.submit("trip", {})
+        await asyncio.sleep(0.1)
+        await queue.stop()
+        return queue.status(job_id)
+
+    job = asyncio.run(run())
+
+    assert failures == [1]
+    assert (job["status"], job["attempts"]) == ("failed", 1)
+    assert job["error"].startswith("Result is not JSON serializable")
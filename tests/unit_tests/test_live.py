@@ -0,0 +1,96 @@
+import time
+
+import pytest
+
+from app.react_agent.live import (
+    LiveFeedError,
+    LiveFeeds,
+    LivePollSettings,
+    SessionCursors,
+    session_id,
+)
+
+
+class Counter:
+    def __init__(self, fail: bool = False):
+        self.calls = 0
+        self.fail = fail
+
+    def __call__(self) -> dict:
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("upstream down")
+        return {"version": self.calls}
+
+
+def test_readers_share_one_fetch_per_interval() -> None:
+    feeds = LiveFeeds(LivePollSettings(interval=60, idle_timeout=60))
+    fetch = Counter()
+
+    snapshots = [feeds.read(("nba", "scoreboard"), fetch) for _ in range(5)]
+
+    assert fetch.calls == 1
+    assert snapshots == [{"version": 1}] * 5
+    feeds.stop_all()
+
+
+def test_background_refresh_keeps_last_good_snapshot() -> None:
+    feeds = LiveFeeds(LivePollSettings(interval=0.02, idle_timeout=60))
+    fetch = Counter()
+    poller = feeds.poller("feed", fetch)
+
+    assert poller.read() == {"version": 1}
+    time.sleep(0.1)
+    assert fetch.calls > 1
+
+    fetch.fail = True
+    time.sleep(0.05)
+    assert poller.read()["version"] >= 2
+    assert isinstance(poller.error, RuntimeError)
+    feeds.stop_all()
+
+
+def test_final_snapshot_stops_polling_and_errors_without_snapshot() -> None:
+    feeds = LiveFeeds(LivePollSettings(interval=0.01, idle_timeout=60))
+    final = Counter()
+
+    feeds.read("game", final, until=lambda data: True)
+    time.sleep(0.05)
+    assert feeds.read("game", final) == {"version": 1}
+    assert final.calls == 1
+
+    with pytest.raises(LiveFeedError):
+        feeds.read("down", Counter(fail=True))
+    feeds.stop_all()
+
+
+def test_session_cursors_are_per_thread_and_bounded() -> None:
+    cursors = SessionCursors(max_entries=2)
+    config = {"configurable": {"thread_id": "t1"}}
+
+    assert session_id(config) == "t1"
+    assert session_id(None) is None
+    cursors.set("t1", ("nba", "0022300123"), 42)
+    cursors.set(None, ("nba", "0022300123"), 99)
+    assert cursors.get("t1", ("nba", "0022300123")) == 42
+    assert cursors.get("t2", ("nba", "0022300123")) is None
+    assert cursors.get(None, ("nba", "0022300123")) is None
+
+    cursors.set("t2", "feed", 1)
+    cursors.set("t3", "feed", 1)
+    assert cursors.get("t1", ("nba", "0022300123")) is None
+
+
+def test_idle_and_final_pollers_are_dropped_from_the_registry() -> None:
+    feeds = LiveFeeds(LivePollSettings(interval=0.01, idle_timeout=0.05))
+    feeds.read(("mlb", "feed", 1), Counter())
+    feeds.read(("mlb", "feed", 2), Counter(), until=lambda data: True)
+    assert len(feeds) == 2
+
+    time.sleep(0.3)
+    assert len(feeds) == 0
+
+    fetch = Counter()
+    assert feeds.read(("mlb", "feed", 1), fetch) == {"version": 1}
+    assert len(feeds) == 1
+    feeds.stop_all()
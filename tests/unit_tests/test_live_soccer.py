@@ -0,0 +1,60 @@
+from app.react_agent import live_soccer
+from app.react_agent.live import LiveFeeds, LivePollSettings
+from app.react_agent.live_soccer import LiveMatches
+
+
+def _fixture(fixture_id, home_id, away_id, status, minute, goals, events=None):
+    fixture = {
+        "fixture": {"id": fixture_id, "status": {"long": status, "short": status, "elapsed": minute}},
+        "league": {"name": "Premier League", "country": "England", "round": "Regular Season - 10"},
+        "teams": {"home": {"id": home_id, "name": f"Team {home_id}"}, "away": {"id": away_id, "name": f"Team {away_id}"}},
+        "goals": {"home": goals[0], "away": goals[1]},
+    }
+    if events is not None:
+        fixture["events"] = events
+    return fixture
+
+
+def test_live_matches_merge_snapshots_per_fixture(monkeypatch) -> None:
+    goal = {"time": {"elapsed": 12}, "type": "Goal", "team": {"name": "Team 42"}}
+    live = [[_fixture(1, 42, 50, "1H", 12, (1, 0), events=[goal]), _fixture(2, 60, 70, "2H", 80, (0, 0))]]
+    monkeypatch.setattr(live_soccer, "fetch_live_fixtures", lambda api_key: live[0])
+    monkeypatch.setattr(live_soccer.LiveMatches, "events", lambda self, fixture_id: ["fetched"])
+    feeds = LiveFeeds(LivePollSettings(interval=60, idle_timeout=60))
+    matches = LiveMatches(api_key="test", feeds=feeds)
+
+    match = matches.for_team(42, events=True)
+    assert match["fixture_id"] == 1
+    assert match["score"] == {"home": 1, "away": 0}
+    assert match["events"] == [goal]
+    assert "updated_at" not in match
+    # No events in the live feed: fall back to the per-fixture endpoint
+    assert matches.match(2, events=True)["events"] == ["fetched"]
+
+    live[0] = [_fixture(1, 42, 50, "2H", 60, (1, 1))]
+    feeds.poller(live_soccer.LIVE_FIXTURES, None).refresh()
+
+    match = matches.for_team(42, events=True)
+    assert (match["minute"], match["score"]["away"]) == (60, 1)
+    assert match["events"] == [goal]  # kept from the earlier snapshot
+    assert matches.match(2)["phase"] == "finished"
+    assert matches.for_team(99) is None
+    feeds.stop_all()
+
+
+def test_find_team_id_caches_only_found_teams(monkeypatch) -> None:
+    responses = {"Arsenal": [[], [{"team": {"id": 42}}]], "Chelsea": [[{"team": {"id": 49}}]]}
+    calls = []
+
+    def api_get(api_key, path, params):
+        calls.append(params["search"])
+        return {"response": responses[params["search"]].pop(0)}
+
+    monkeypatch.setattr(live_soccer, "api_get", api_get)
+    monkeypatch.setattr(live_soccer, "_team_ids", live_soccer.OrderedDict())
+
+    assert live_soccer.find_team_id("test", "Arsenal") is None  # e.g. a rate-limited empty response
+    assert live_soccer.find_team_id("test", "Arsenal") == 42
+    assert live_soccer.find_team_id("test", "Arsenal") == 42
+    assert live_soccer.find_team_id("test", "Chelsea") == 49
+    assert calls == ["Arsenal", "Arsenal", "Chelsea"]
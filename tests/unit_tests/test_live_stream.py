@@ -0,0 +1,94 @@
+import asyncio
+
+from app.react_agent.live_stream import (
+    GameChannel,
+    GameNotLive,
+    LiveGameHub,
+    mlb_update,
+    soccer_update,
+    valid_game_id,
+)
+
+
+def _scripted(updates):
+    """An update function replaying a fixed list of (state, events, final)."""
+    remaining = list(updates)
+
+    def update(game_id):
+        if not remaining:
+            raise GameNotLive(f"{game_id} is over")
+        return remaining.pop(0)
+
+    return update
+
+
+def test_stream_sends_snapshot_then_deltas_then_end() -> None:
+    event = {"id": 1, "description": "Jump ball"}
+    basket = {"id": 2, "description": "Tatum 3PT"}
+    update = _scripted([
+        ({"clock": "12:00", "home": 0}, [event], False),
+        ({"clock": "12:00", "home": 0}, [event], False),
+        ({"clock": "11:40", "home": 3}, [event, basket], False),
+        ({"clock": "00:00", "home": 3}, [event, basket], True),
+    ])
+    hub = LiveGameHub({"nba": update}, interval=0.001)
+
+    async def collect():
+        return [message async for message in hub.messages("nba", "0022300123")]
+
+    messages = asyncio.run(collect())
+
+    assert [m["type"] for m in messages] == ["snapshot", "delta", "delta", "end"]
+    assert messages[0] == {"type": "snapshot", "state": {"clock": "12:00", "home": 0}, "events": [event]}
+    assert messages[1] == {"type": "delta", "state": {"clock": "11:40", "home": 3}, "events": [basket]}
+    assert messages[2] == {"type": "delta", "state": {"clock": "00:00"}, "events": []}
+    assert hub.channels == {}
+
+
+def test_subscribers_share_one_fetch_loop() -> None:
+    calls = []
+
+    def update(game_id):
+        calls.append(game_id)
+        return {"minute": len(calls)}, [], False
+
+    hub = LiveGameHub({"soccer": update}, interval=0.01)
+
+    async def watch():
+        first = hub.messages("soccer", "42")
+        second = hub.messages("soccer", "42")
+        await first.__anext__()
+        await second.__anext__()
+        assert len(hub.channels) == 1
+        await first.aclose()
+        await second.aclose()
+        await asyncio.sleep(0.02)
+
+    asyncio.run(watch())
+
+    assert hub.channels == {}
+    assert len(calls) <= 3
+
+
+def test_full_queue_still_gets_the_end_message() -> None:
+    channel = GameChannel(("nba", "1"), _scripted([]), 0.001)
+    channel.state = {"home": 3}
+    queue = asyncio.Queue(maxsize=2)
+    channel.subscribers.add(queue)
+
+    channel.publish({"type": "delta", "state": {"home": 1}, "events": []})
+    channel.publish({"type": "delta", "state": {"home": 3}, "events": []})
+    channel.publish({"type": "end", "reason": "final"})
+
+    assert [queue.get_nowait()["type"] for _ in range(queue.qsize())] == ["snapshot", "end"]
+
+
+def test_invalid_game_ids_end_the_stream() -> None:
+    assert valid_game_id("0022300123") and not valid_game_id("abc")
+    hub = LiveGameHub({"mlb": mlb_update, "soccer": soccer_update}, interval=0.001)
+
+    async def collect(sport):
+        return [message async for message in hub.messages(sport, "abc")]
+
+    for sport in ("mlb", "soccer"):
+        assert asyncio.run(collect(sport)) == [{"type": "end", "reason": "'abc' is not a valid game ID."}]
@@ -0,0 +1,103 @@
+import asyncio
+
+from app.react_agent import llm
+
+
+def test_registry_reuses_models_and_http_pool(monkeypatch) -> None:
+    built = []
+
+    def fake_load_chat_model(name, **kwargs):
+        built.append((name, kwargs))
+        return object()
+
+    monkeypatch.setattr(llm, "load_chat_model", fake_load_chat_model)
+    registry = llm.ModelRegistry(llm.ModelSettings(max_concurrency=4))
+
+    first = registry.get("openai/gpt-4o")
+    assert registry.get("openai/gpt-4o") is first
+    assert registry.get("openai/gpt-4o", temperature=0) is not first
+    registry.get("anthropic/claude-3-5-sonnet-20240620")
+
+    assert len(built) == 3
+    assert built[0][1]["http_async_client"] is built[1][1]["http_async_client"]
+    assert "http_async_client" not in built[2][1]
+
+
+def test_registry_closes_both_http_clients(monkeypatch) -> None:
+    monkeypatch.setattr(llm, "load_chat_model", lambda name, **kwargs: kwargs)
+    registry = llm.ModelRegistry(llm.ModelSettings())
+
+    clients = registry.get("openai/gpt-4o")
+    registry.clear()
+    assert clients["http_client"].is_closed and clients["http_async_client"].is_closed
+
+    clients = registry.get("openai/gpt-4o")
+    assert registry.get("openai/gpt-4o") is clients
+    asyncio.run(registry.aclose())
+    assert clients["http_client"].is_closed and clients["http_async_client"].is_closed
+    assert registry.get("openai/gpt-4o") is not clients
+
+
+class _FakeModel:
+    def __init__(self, name):
+        self.name = name
+        self.tools = None
+
+    def bind_tools(self, tools, **kwargs):
+        bound = _FakeModel(self.name)
+        bound.tools = tools
+        return bound
+
+
+def test_tiered_model_resolves_per_config(monkeypatch) -> None:
+    monkeypatch.setattr(llm, "get_chat_model", lambda name, temperature=None: _FakeModel(name))
+    router = llm.tiered_model("router").bind_tools(["handoff"]).bind_tools(["handoff", "search"])
+
+    default = router.resolve({})
+    override = router.resolve({"configurable": {"router_model": "openai/gpt-4o"}})
+
+    assert default.name == "openai/gpt-4o-mini"
+    assert override.name == "openai/gpt-4o"
+    assert override.tools == ["handoff", "search"]
+
+
+def test_tiered_model_resolves_again_after_registry_clear(monkeypatch) -> None:
+    monkeypatch.setattr(llm, "get_chat_model", lambda name, temperature=None: _FakeModel(name))
+    monkeypatch.setattr(llm, "registry", llm.ModelRegistry(llm.ModelSettings()))
+    agent = llm.tiered_model("agent")
+
+    first = agent.resolve({})
+    assert agent.resolve({}) is first
+    llm.registry.clear()
+    assert agent.resolve({}) is not first
+
+
+def test_supervisor_binding_keeps_parallel_tool_calls_disabled(monkeypatch) -> None:
+    from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+    from langchain_core.messages import AIMessage, HumanMessage
+    from langchain_core.tools import tool
+    from langgraph.prebuilt import create_react_agent
+    from langgraph_supervisor import create_supervisor
+
+    bindings = []
+
+    class RecordingModel(GenericFakeChatModel):
+        def bind_tools(self, tools, **kwargs):
+            bindings.append(([getattr(t, "name", None) for t in tools], kwargs))
+            return self
+
+    @tool
+    def lookup(team: str) -> str:
+        """Look up a team."""
+        return team
+
+    monkeypatch.setattr(
+        llm, "get_chat_model",
+        lambda name, temperature=None: RecordingModel(messages=iter([AIMessage("done")] * 4)),
+    )
+    worker = create_react_agent(model=llm.tiered_model("lookup"), tools=[lookup], name="worker")
+    supervisor = create_supervisor([worker], model=llm.tiered_model("router"), prompt="Route.").compile()
+
+    supervisor.invoke({"messages": [HumanMessage("Lakers?")]})
+
+    assert bindings == [(["transfer_to_worker"], {"parallel_tool_calls": False})]
@@ -0,0 +1,89 @@
+import asyncio
+import http.server
+import threading
+
+import requests
+from langchain_core.tools import StructuredTool
+from pydantic import BaseModel
+
+from app.react_agent import metrics
+
+
+class _Input(BaseModel):
+    pass
+
+
+def _value(name: str) -> float:
+    return metrics.snapshot().get(name, 0.0)
+
+
+def test_tools_record_latency_bytes_and_errors() -> None:
+    def lookup(team: str = "LAL"):
+        if team == "XXX":
+            return {"error": "unknown team"}
+        metrics.record_cache("test_cache", hit=team == "LAL")
+        return {"team": team}
+
+    async def alookup(team: str = "LAL"):
+        raise RuntimeError("upstream down")
+
+    tool = metrics.instrument_tool(StructuredTool(
+        name="test_lookup", func=lookup, coroutine=alookup, description="test", args_schema=_Input
+    ))
+    metrics.instrument_tool(tool)  # idempotent
+
+    tool.func("LAL")
+    tool.func("BOS")
+    tool.func("XXX")
+    try:
+        asyncio.run(tool.coroutine("LAL"))
+    except RuntimeError:
+        pass
+
+    assert _value("tool_calls_total{status=ok,tool=test_lookup}") == 2
+    assert _value("tool_calls_total{status=error,tool=test_lookup}") == 2
+    assert _value("tool_result_bytes_count{tool=test_lookup}") == 3
+    assert _value("tool_latency_seconds_count{status=error,tool=test_lookup}") == 2
+    assert _value("cache_requests_total{cache=test_cache,result=hit,tool=test_lookup}") == 1
+    assert _value("cache_requests_total{cache=test_cache,result=miss,tool=test_lookup}") == 1
+
+
+def test_upstream_requests_are_attributed_to_the_running_tool() -> None:
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200 if self.path == "/ok" else 404)
+            self.end_headers()
+            self.wfile.write(b"x" * 100)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    metrics.instrument_requests()
+
+    def fetch(path: str):
+        return {"status": requests.get(base + path, timeout=5).status_code}
+
+    tool = metrics.instrument_tool(StructuredTool(
+        name="test_fetch", func=fetch, description="test", args_schema=_Input
+    ))
+    # Other tests send requests to 127.0.0.1 too: compare against the counts before.
+    before = metrics.snapshot()
+    try:
+        tool.func("/ok")
+        tool.func("/missing")
+        requests.get(base + "/ok", timeout=5)
+    finally:
+        server.shutdown()
+
+    def delta(name: str) -> float:
+        return _value(name) - before.get(name, 0.0)
+
+    assert delta("upstream_requests_total{host=127.0.0.1,status=200,tool=test_fetch}") == 1
+    assert delta("upstream_requests_total{host=127.0.0.1,status=404,tool=test_fetch}") == 1
+    assert delta("upstream_requests_total{host=127.0.0.1,status=200,tool=-}") == 1
+    assert delta("upstream_response_bytes_total{host=127.0.0.1,tool=test_fetch}") == 200
+    body, content_type = metrics.render()
+    assert b"tool_latency_seconds_bucket" in body and content_type.startswith("text/plain")
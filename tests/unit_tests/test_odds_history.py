@@ -0,0 +1,48 @@
+from datetime import UTC, datetime, timedelta
+
+from app.react_agent.odds_history import OddsHistoryStore, recent_timestamps
+
+
+class _FakeOddsAPI:
+    def __init__(self):
+        self.calls = []
+
+    def get_historical_odds(self, sport_key, event_id, date, regions, markets):
+        self.calls.append(date)
+        price = 1.90 + len(self.calls) / 100
+        return {
+            "timestamp": date,
+            "data": {"id": event_id, "bookmakers": [{"key": "book_a", "markets": [{"key": "totals", "outcomes": [
+                {"name": "Over", "price": price, "point": 220.5},
+                {"name": "Under", "price": 1.90, "point": 220.5},
+            ]}]}]},
+        }
+
+
+def test_backfill_fetches_only_missing_snapshots_and_serves_series() -> None:
+    store = OddsHistoryStore(":memory:")
+    api = _FakeOddsAPI()
+    dates = ["2024-03-01T12:00:00Z", "2024-03-01T13:00:00Z"]
+
+    assert store.backfill(api, "basketball_nba", "e1", dates, markets="totals")["rows"] == 4
+    assert store.backfill(api, "basketball_nba", "e1", dates + ["2024-03-01T14:00:00Z"], markets="totals")["fetched"] == 1
+    assert api.calls == dates + ["2024-03-01T14:00:00Z"]
+
+    series = store.line_movement("basketball_nba", "e1", "totals", outcome="Over")
+    assert list(series) == ["book_a|Over|220.5"]
+    assert [point["price"] for point in series["book_a|Over|220.5"]] == [1.91, 1.92, 1.93]
+    assert store.events("basketball_nba")[0]["snapshots"] == 3
+
+
+def test_recent_timestamps_are_aligned_so_later_windows_reuse_fetched_dates() -> None:
+    store = OddsHistoryStore(":memory:")
+    api = _FakeOddsAPI()
+    window, step = timedelta(hours=6), timedelta(hours=3)
+
+    first = recent_timestamps(datetime(2024, 3, 1, 13, 40, tzinfo=UTC), window, step)
+    assert first == ["2024-03-01T06:00:00Z", "2024-03-01T09:00:00Z", "2024-03-01T12:00:00Z"]
+    store.backfill(api, "basketball_nba", "e1", first, markets="totals")
+
+    later = recent_timestamps(datetime(2024, 3, 1, 15, 5, tzinfo=UTC), window, step)
+    assert store.backfill(api, "basketball_nba", "e1", later, markets="totals")["fetched"] == 1
+    assert api.calls == first + ["2024-03-01T15:00:00Z"]
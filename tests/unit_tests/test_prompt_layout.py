@@ -0,0 +1,47 @@
+from langchain_core.messages import HumanMessage
+
+from app.react_agent.prompt_layout import AgentPrompt, split_examples
+
+SOURCE = """You are a helpful assistant.
+
+AVAILABLE TOOLS:
+{tools}
+
+- You have access to the following tools: [{tool_names}]
+
+--------------------------------------------------------------------------------
+EXAMPLE WORKFLOWS:
+
+Example 1 — Team roster:
+Question: "Show me the Dodgers roster."
+Action: mlb_get_team_roster
+
+Example 2 — Player stats:
+Question: "What are Aaron Judge's stats?"
+Action: mlb_get_player_stats
+
+--------------------------------------------------------------------------------
+FINAL INSTRUCTIONS:
+- Be accurate.
+"""
+
+
+def test_split_examples_moves_examples_out_of_the_instructions() -> None:
+    instructions, examples = split_examples(SOURCE)
+
+    assert [example.splitlines()[0] for example in examples] == ["Example 1 — Team roster:", "Example 2 — Player stats:"]
+    assert "Aaron Judge" not in instructions
+    assert "show_examples" in instructions
+    assert instructions.rstrip().endswith("- Be accurate.")
+
+
+def test_agent_prompt_is_static_first() -> None:
+    prompt = AgentPrompt("team", SOURCE)
+    history = [HumanMessage(content="Who plays for the Dodgers?")]
+
+    messages = prompt({"messages": history}, {"configurable": {"few_shot_k": 0}})
+
+    assert "{tools}" not in prompt.instructions and "{tool_names}" not in prompt.instructions
+    assert messages[0] is prompt.system_message
+    assert messages[1:] == history
+    assert prompt.find_examples("Judge stats", 1)[0].startswith("Example 2")
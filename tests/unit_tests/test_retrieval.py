@@ -0,0 +1,17 @@
+from app.react_agent.retrieval import BM25Index, tokenize
+
+
+def test_tokenize_drops_stopwords_and_splits_identifiers() -> None:
+    assert tokenize("What is the NBA_live_scoreboard for today?") == ["nba", "live", "scoreboard", "today"]
+
+
+def test_bm25_ranks_matching_documents_first() -> None:
+    index = BM25Index([
+        "fetch player career stats",
+        "fetch live scoreboard for today's games",
+        "list team roster and coaches",
+    ])
+
+    assert index.top_k("live scoreboard tonight", 2) == [1]
+    assert index.top_k("player career", 3)[0] == 0
+    assert index.top_k("weather forecast", 3) == []
@@ -0,0 +1,118 @@
+import asyncio
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from app.react_agent import runner
+from app.react_agent.deadline import DeadlineExceeded, with_deadline
+
+
+class _SleepySupervisor:
+    def __init__(self, delay: float, answer: str) -> None:
+        self.delay = delay
+        self.answer = answer
+
+    async def ainvoke(self, _input):
+        await asyncio.sleep(self.delay)
+        return {"messages": [AIMessage(content=self.answer)]}
+
+
+def _state():
+    return {
+        "messages": [HumanMessage(content="original question")],
+        "sub_queries": [
+            {"query": "fast", "supervisor": "fast"},
+            {"query": "slow", "supervisor": "slow"},
+        ],
+    }
+
+
+def _supervisors():
+    return {"fast": _SleepySupervisor(0.0, "fast answer"), "slow": _SleepySupervisor(0.5, "slow answer")}
+
+
+def test_incremental_runner_flags_late_results(monkeypatch) -> None:
+    seen = {}
+
+    async def fake_synthesize(original_query, results, sport, config=None):
+        seen["results"] = results
+        return "final"
+
+    monkeypatch.setattr(runner, "synthesize", fake_synthesize)
+    config = {"configurable": {"synthesis_deadline": 0.1, "late_results": "flag"}}
+    out = asyncio.run(runner.incremental_runner(_state(), _supervisors(), "NBA", config))
+
+    assert seen["results"][0] == "fast answer"
+    assert "'slow' did not finish" in seen["results"][1]
+    assert [m.content for m in out["messages"]] == ["original question", "final"]
+
+
+def test_incremental_runner_appends_late_results(monkeypatch) -> None:
+    async def fake_synthesize(original_query, results, sport, config=None):
+        return "final"
+
+    monkeypatch.setattr(runner, "synthesize", fake_synthesize)
+    config = {"configurable": {"synthesis_deadline": 0.1, "late_results": "append", "late_result_timeout": 1.0}}
+    out = asyncio.run(runner.incremental_runner(_state(), _supervisors(), "NBA", config))
+
+    assert out["messages"][1].content == "final"
+    assert out["messages"][2].content == "Late result for 'slow':\nslow answer"
+
+
+class _RecordingSupervisor:
+    def __init__(self, answer: str) -> None:
+        self.answer = answer
+        self.prompts = []
+
+    async def ainvoke(self, _input):
+        self.prompts.append(_input["messages"][-1].content)
+        return {"messages": [AIMessage(content=self.answer)]}
+
+
+def test_parallel_runner_feeds_dependency_answers_forward() -> None:
+    fixtures = _RecordingSupervisor("Chelsea, Spurs")
+    standings = _RecordingSupervisor("Chelsea 4th, Spurs 9th")
+    state = {
+        "messages": [HumanMessage(content="original question")],
+        "sub_queries": [
+            {"id": 0, "query": "Arsenal's next fixtures?", "supervisor": "fixtures", "depends_on": []},
+            {"id": 1, "query": "Standing of [opponents from fixtures]?", "supervisor": "standings", "depends_on": [0]},
+        ],
+    }
+    out = asyncio.run(runner.parallel_runner(state, {"fixtures": fixtures, "standings": standings}))
+
+    assert [m.content for m in out["messages"]] == ["Chelsea, Spurs", "Chelsea 4th, Spurs 9th"]
+    assert "Chelsea, Spurs" in standings.prompts[0]
+    assert "Chelsea, Spurs" not in fixtures.prompts[0]
+
+
+def test_normalize_sub_queries_drops_forward_and_unknown_dependencies() -> None:
+    normalized = runner.normalize_sub_queries([
+        {"query": "a", "supervisor": "x", "depends_on": [1]},
+        {"query": "b", "supervisor": "x", "depends_on": [0, 7]},
+    ])
+
+    assert [q["depends_on"] for q in normalized] == [[], [0]]
+
+
+def test_parallel_runner_cancels_outstanding_supervisors_at_the_deadline() -> None:
+    slow = _SleepySupervisor(5.0, "slow answer")
+    cancelled = []
+
+    async def ainvoke(_input):
+        try:
+            return await _SleepySupervisor.ainvoke(slow, _input)
+        except asyncio.CancelledError:
+            cancelled.append("slow")
+            raise
+
+    slow.ainvoke = ainvoke
+    config = with_deadline({"configurable": {}}, 0.05)
+
+    async def run():
+        try:
+            await runner.parallel_runner(_state(), {"fast": _SleepySupervisor(0.0, "fast answer"), "slow": slow}, config)
+        except DeadlineExceeded:
+            return [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+    assert asyncio.run(run()) == []
+    assert cancelled == ["slow"]
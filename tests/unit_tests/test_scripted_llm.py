@@ -0,0 +1,80 @@
+import asyncio
+import json
+import uuid
+from typing import List
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+from langchain_core.tools import tool
+from pydantic import BaseModel
+
+from app.react_agent import llm, scripted_llm
+
+
+class ParsedOutput(BaseModel):
+    sub_queries: List[str]
+
+
+@tool
+def nba_team_standings(season: str) -> str:
+    """Standings for an NBA season."""
+    return "Celtics first"
+
+
+def _record(recorder, messages, params, message) -> None:
+    run_id = uuid.uuid4()
+    recorder.on_chat_model_start({}, [messages], run_id=run_id, invocation_params=params)
+    recorder.on_llm_end(LLMResult(generations=[[ChatGeneration(message=message)]]), run_id=run_id)
+
+
+def test_recorded_calls_replay_with_tools_and_structured_output(tmp_path) -> None:
+    question = HumanMessage("Who leads the East, and how did the Celtics do?")
+    recorder = scripted_llm.ScriptRecorder()
+    # json_schema structured output arrives as content
+    _record(
+        recorder, [question],
+        {"model": "gpt-4o-mini", "response_format": {"type": "json_schema", "json_schema": {"name": "ParsedOutput"}}},
+        AIMessage(json.dumps({"sub_queries": ["East standings", "Celtics last game"]})),
+    )
+    tools = [{"type": "function", "function": {"name": "nba_team_standings", "parameters": {}}}]
+    call = AIMessage("", tool_calls=[{"name": "nba_team_standings", "args": {"season": "2023-24"}, "id": "call_1"}])
+    _record(recorder, [question], {"model": "gpt-4o", "tools": tools}, call)
+    _record(
+        recorder, [question, call, ToolMessage("Celtics first", tool_call_id="call_1")],
+        {"model": "gpt-4o", "tools": tools},
+        AIMessage("The Celtics lead the East.", usage_metadata={"input_tokens": 120, "output_tokens": 8, "total_tokens": 128}),
+    )
+    path = str(tmp_path / "script.json")
+    recorder.save(path)
+    assert set(scripted_llm.Script.load(path).calls) == {"tools:ParsedOutput#0", "tools:nba_team_standings#0", "tools:nba_team_standings#1"}
+
+    model = scripted_llm.ScriptedChatModel(script=scripted_llm.Script.load(path), latency=0.0)
+    parsed = model.with_structured_output(ParsedOutput).invoke([question])
+    assert parsed.sub_queries == ["East standings", "Celtics last game"]
+
+    agent = model.bind_tools([nba_team_standings])
+    first = asyncio.run(agent.ainvoke([question]))
+    assert first.tool_calls[0]["args"] == {"season": "2023-24"}
+    final = agent.invoke([question, first, ToolMessage("Celtics first", tool_call_id=first.tool_calls[0]["id"])])
+    assert final.content == "The Celtics lead the East."
+    assert final.usage_metadata["input_tokens"] == 120
+
+    # Any other question takes the same path round-robin; unknown slots fail loudly.
+    assert model.bind_tools([nba_team_standings]).invoke([HumanMessage("Knicks?")]).tool_calls
+    try:
+        model.invoke([HumanMessage("no tools bound")])
+    except scripted_llm.ScriptMiss:
+        pass
+    else:
+        raise AssertionError("expected ScriptMiss")
+
+
+def test_registry_hands_out_scripted_models(tmp_path) -> None:
+    path = tmp_path / "script.json"
+    path.write_text(json.dumps({"calls": {"text#0": [{"content": "hi", "seconds": 0.0}]}}))
+    registry = llm.ModelRegistry(llm.ModelSettings(script=str(path)))
+
+    model = registry.get("openai/gpt-4o")
+    assert isinstance(model, scripted_llm.ScriptedChatModel)
+    assert model.model_name == "openai/gpt-4o"
+    assert model.invoke("hello").content == "hi"
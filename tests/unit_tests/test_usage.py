@@ -0,0 +1,62 @@
+import uuid
+from types import SimpleNamespace
+
+from app.react_agent import metrics
+from app.react_agent.usage import UsageTracker, node_path, price_for, sub_agent_scope
+
+
+def _result(input_tokens, output_tokens):
+    message = SimpleNamespace(usage_metadata={"input_tokens": input_tokens, "output_tokens": output_tokens})
+    return SimpleNamespace(generations=[[SimpleNamespace(message=message)]], llm_output=None)
+
+
+def _call(tracker, metadata, result):
+    run_id = uuid.uuid4()
+    tracker.on_chat_model_start({}, [], run_id=run_id, metadata=metadata)
+    if isinstance(result, Exception):
+        tracker.on_llm_error(result, run_id=run_id)
+    else:
+        tracker.on_llm_end(result, run_id=run_id)
+
+
+def test_usage_is_attributed_per_node_and_sub_agent() -> None:
+    tracker = UsageTracker(prices={"gpt-4o-mini": (1.0, 2.0), "gpt-4o": (10.0, 20.0)})
+    split = {"langgraph_checkpoint_ns": "split_query:1f2e", "ls_model_name": "gpt-4o-mini"}
+    hop = {"langgraph_checkpoint_ns": "parallel_supervisors:9a|supervisor:77", "ls_model_name": "gpt-4o-mini"}
+    combine = {"langgraph_node": "combine_results", "ls_model_name": "gpt-4o-2024-08-06"}
+
+    node_run = uuid.uuid4()
+    tracker.on_chain_start({}, {}, run_id=node_run, metadata={"langgraph_node": "split_query"}, name="split_query")
+    _call(tracker, split, _result(1000, 100))
+    tracker.on_chain_end({}, run_id=node_run)
+    with sub_agent_scope("game_supervisor"):
+        _call(tracker, hop, _result(2000, 50))
+        _call(tracker, hop, TimeoutError("slow"))
+    with sub_agent_scope("player_supervisor"):
+        _call(tracker, hop, _result(500, 10))
+    _call(tracker, combine, _result(3000, 400))
+
+    summary = tracker.summary()
+
+    assert summary["llm_calls"] == 5
+    assert summary["input_tokens"] == 6500 and summary["output_tokens"] == 560
+    game = summary["by_node"]["game_supervisor:parallel_supervisors/supervisor"]
+    assert game["calls"] == 2 and game["errors"] == 1 and game["input_tokens"] == 2000
+    assert summary["by_node"]["split_query"]["cost_usd"] == 0.0012
+    assert summary["by_node"]["combine_results"]["cost_usd"] == 0.038
+    assert list(summary["by_node"])[0] == "combine_results"  # most expensive first
+    assert set(summary["node_seconds"]) == {"split_query"}
+    assert metrics.snapshot()[
+        "llm_tokens_total{kind=input,model=gpt-4o-mini,node=parallel_supervisors/supervisor,sub_agent=player_supervisor}"
+    ] >= 500
+
+
+def test_prices_and_node_paths() -> None:
+    prices = {"gpt-4o": (2.5, 10.0), "gpt-4o-mini": (0.15, 0.6)}
+
+    assert price_for("openai/gpt-4o-mini-2024-07-18", prices) == (0.15, 0.6)
+    assert price_for("gpt-4o", prices) == (2.5, 10.0)
+    assert price_for("mystery-model", prices) == (0.0, 0.0)
+    assert node_path({"langgraph_checkpoint_ns": "a:1|b:2|c:3"}) == "a/b/c"
+    assert node_path({"langgraph_node": "agent"}) == "agent"
+    assert node_path(None) == "-"